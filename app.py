@@ -8,13 +8,15 @@ from flask import Flask, jsonify, request, Response
 
 import main as legi_main
 from utils.config import ALLOW_ANONYMOUS_API
-from utils.change_queue import load_queue, build_rss_feed
+from utils.change_queue import build_atom_feed, build_json_feed, build_rss_feed, filtered_changes, queue_version
+from utils.feed_cache import FeedCache, accepts_gzip
 
 app = Flask(__name__)
 logger = logging.getLogger(__name__)
 _run_lock = threading.Lock()
 AUTH_TOKEN = os.environ.get("API_AUTH_TOKEN")
 APP_START_TIME = time.time()
+feed_cache = FeedCache()
 WORKSHEETS = [
     "Anti-LGBTQ Bills",
     "Pro-LGBTQ Bills",
@@ -136,12 +138,57 @@ def health():
     return jsonify({"status": "failing"}), 503
 
 
+def _feed_response(feed, mimetype):
+    gzipped = accepts_gzip(request.headers.get("Accept-Encoding"))
+    headers = {
+        "ETag": feed.gzip_etag if gzipped else feed.etag,
+        "Last-Modified": feed.last_modified_header,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if feed.not_modified(request.headers.get("If-None-Match"), request.headers.get("If-Modified-Since"), gzipped):
+        return Response(status=304, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(feed.gzip_body, mimetype=mimetype, headers=headers)
+    return Response(feed.body, mimetype=mimetype, headers=headers)
+
+
+FEED_FORMATS = {
+    "rss": (build_rss_feed, "application/rss+xml"),
+    "atom": (build_atom_feed, "application/atom+xml"),
+    "json": (build_json_feed, "application/feed+json"),
+}
+FEED_FILTER_VALUES = {
+    "worksheet": {"anti", "pro", "rollover"},
+    "change_type": {"new", "update"},
+}
+
+
 @app.get("/rss")
 def rss_feed():
-    changes = load_queue()
+    feed_format = request.args.get("format", "rss").lower()
+    if feed_format not in FEED_FORMATS:
+        return jsonify({"status": "error", "message": f"format must be one of {', '.join(FEED_FORMATS)}"}), 400
+    filters = {}
+    for name in ("state", "worksheet", "change_type"):
+        value = request.args.get(name, "").strip().lower()
+        if not value:
+            continue
+        allowed = FEED_FILTER_VALUES.get(name)
+        if allowed and value not in allowed:
+            return jsonify({"status": "error", "message": f"{name} must be one of {', '.join(sorted(allowed))}"}), 400
+        filters[name] = value
+    build_feed, mimetype = FEED_FORMATS[feed_format]
     base_url = request.url_root.rstrip("/")
-    feed = build_rss_feed(changes, base_url=base_url)
-    return Response(feed, mimetype="application/rss+xml")
+    version, last_modified = queue_version(filters)
+    feed = feed_cache.get(
+        (feed_format, base_url, tuple(sorted(filters.items()))),
+        version,
+        last_modified,
+        lambda: build_feed(filtered_changes(filters), base_url=base_url),
+    )
+    return _feed_response(feed, mimetype)
 
 
 @app.get("/stats")
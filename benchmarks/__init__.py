@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# main configures a file log handler on import; keep benchmark runs out of the repo's cache/
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.gettempdir(), "legialerts-bench.log"))
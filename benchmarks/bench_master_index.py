@@ -0,0 +1,110 @@
+"""
+Compare the vectorized master index against the original per-row build.
+
+    python -m benchmarks.bench_master_index [bills]
+
+Builds a synthetic master list (default 100,000 bills, with special sessions and
+prefixed numbers mixed in), checks both builds produce the same index and prints timings.
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+import main
+
+
+def legacy_build_master_index(all_lists):
+    fields = ["change_hash", "last_action", "last_action_date", "title", "url", "bill_id", "session_special", "raw_number", "session_id"]
+    master_index = {}
+    for state_name, df in all_lists.items():
+        if df.empty:
+            master_index[state_name] = {}
+            continue
+        if "number" not in df.columns:
+            master_index[state_name] = {}
+            continue
+        state_index = {}
+        def _store_entry(key, entry, prefer_non_special=True):
+            if not key:
+                return
+            existing = state_index.get(key)
+            new_special = entry.get("session_special") or 0
+            if existing is None:
+                state_index[key] = entry
+                return
+            existing_special = existing.get("session_special") or 0
+            if prefer_non_special:
+                if existing_special and not new_special:
+                    state_index[key] = entry
+                    return
+                if not existing_special and new_special:
+                    return
+            state_index[key] = entry
+        for _, row in df.iterrows():
+            number_raw = str(row.get("number", "")).strip()
+            number_norm = main.normalize_bill_number(number_raw)
+            if number_norm:
+                entry = {field: row.get(field) for field in fields if field in row}
+                entry["raw_number"] = number_raw
+                try:
+                    entry["session_special"] = int(entry.get("session_special") or 0)
+                except Exception:
+                    entry["session_special"] = 0
+                entry["session_id"] = row.get("session_id")
+                base_key = main.strip_session_prefix(number_norm) or number_norm
+                _store_entry(number_norm, entry, prefer_non_special=True)
+                if base_key != number_norm:
+                    _store_entry(base_key, entry, prefer_non_special=True)
+                else:
+                    _store_entry(base_key, entry, prefer_non_special=True)
+                if entry["session_special"] and base_key:
+                    special_key = f"X{entry['session_special']}{base_key}"
+                    _store_entry(special_key, entry, prefer_non_special=False)
+        master_index[state_name] = state_index
+    return master_index
+
+
+def synthetic_master_list(bills, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(bills):
+        special = rng.choice([0, 0, 0, 0, 1, 2])
+        number = f"{rng.choice(['HB', 'SB', 'HR', 'SJR'])}{rng.randint(1, bills // 3)}"
+        if special and rng.random() < 0.3:
+            number = f"X{special}{number}"
+        rows.append({
+            "bill_id": i,
+            "number": number,
+            "change_hash": f"{rng.getrandbits(128):032x}",
+            "last_action": "Referred to committee",
+            "last_action_date": "2026-01-15",
+            "title": f"Bill {i}",
+            "url": f"https://legiscan.com/TX/bill/{number}/2026",
+            "session_special": special,
+            "session_id": 2000 + special,
+        })
+    return pd.DataFrame(rows)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(bills=100_000):
+    all_lists = {"Texas": synthetic_master_list(bills)}
+    legacy, legacy_seconds = _timed(legacy_build_master_index, all_lists)
+    vectorized, vectorized_seconds = _timed(main.build_master_index, all_lists)
+    assert list(legacy["Texas"].keys()) == list(vectorized["Texas"].keys()), "key order differs"
+    for key, entry in legacy["Texas"].items():
+        assert entry["bill_id"] == vectorized["Texas"][key]["bill_id"], f"entry differs for {key}"
+    print(f"bills={bills} keys={len(vectorized['Texas'])}")
+    print(f"iterrows build:   {legacy_seconds:.3f}s")
+    print(f"vectorized build: {vectorized_seconds:.3f}s ({legacy_seconds / vectorized_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
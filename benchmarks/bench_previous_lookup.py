@@ -0,0 +1,71 @@
+"""
+Compare the keyed previous-snapshot lookup against the per-row boolean mask.
+
+    python -m benchmarks.bench_previous_lookup [rows]
+
+Builds a synthetic worksheet (default 5,000 rows across every state), treats a copy as the
+previous snapshot and resolves every row against it both ways, checking both find the same row.
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+import main
+
+
+def synthetic_worksheet(rows, seed=11):
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        state = rng.choice(main.STATES)
+        number = f"{rng.choice(['HB', 'SB', 'HR', 'SJR'])}{i}"
+        records.append({
+            "State": state,
+            "Number": f"=HYPERLINK(\"https://legiscan.com/{state}/bill/{number}/2026\",\"{number}\")",
+            "Bill Type": rng.choice(["Healthcare", "Education", "Sports"]),
+            "Change Hash": f"{rng.getrandbits(128):032x}",
+            "Bill ID": str(100000 + i),
+        })
+    return pd.DataFrame(records)
+
+
+def mask_lookup(gsheet, prev_gsheet):
+    found = []
+    for _, row in gsheet.iterrows():
+        prev = prev_gsheet.loc[(prev_gsheet["State"] == row["State"]) & (prev_gsheet["Number"] == row["Number"])]
+        found.append(prev.iloc[0]["Bill ID"] if not prev.empty else None)
+    return found
+
+
+def keyed_lookup(gsheet, prev_gsheet):
+    prev_lookup = main.build_previous_lookup(prev_gsheet)
+    found = []
+    for _, row in gsheet.iterrows():
+        prev_row = main.find_previous_row(
+            prev_lookup, row["State"], main.normalize_bill_number(row["Number"]), row.get("Bill ID")
+        )
+        found.append(prev_row["Bill ID"] if prev_row is not None else None)
+    return found
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows=5_000):
+    gsheet = synthetic_worksheet(rows)
+    prev_gsheet = gsheet.sample(frac=0.9, random_state=3).reset_index(drop=True)
+    masked, mask_seconds = _timed(mask_lookup, gsheet, prev_gsheet)
+    keyed, keyed_seconds = _timed(keyed_lookup, gsheet, prev_gsheet)
+    assert masked == keyed, "lookups disagree"
+    print(f"rows={rows} previous={len(prev_gsheet)} matched={sum(v is not None for v in keyed)}")
+    print(f"boolean mask: {mask_seconds:.3f}s")
+    print(f"keyed lookup: {keyed_seconds:.3f}s ({mask_seconds / keyed_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,327 @@
+"""
+Compare the columnar row diff against the original per-row update_worksheet loop.
+
+    python -m benchmarks.bench_row_diff [rows]
+
+Builds a synthetic worksheet (default 5,000 rows) with new, changed, backfilled, unmatched and
+out-of-session bills plus bills whose details cannot be fetched, checks both diffs queue the
+same cells, change entries and report rows, and prints timings.
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import main
+from main import (
+    _inc_stat,
+    build_change_entry,
+    extract_display_number,
+    find_master_row,
+    find_previous_row,
+    get_meaningful_changes,
+    logger,
+    normalize_bill_number,
+    queue_update,
+    row_missing_details,
+)
+from utils.bill_store import BillStore
+from utils.legiscan_helper import get_calendar, get_history, get_sponsors, get_texts
+
+
+def legacy_diff(gsheet, worksheet, year, master_index, all_lists, prev_lookup, bill_details_for, report):
+    gsheet = gsheet.copy()
+    missing_states = set()
+    cell_updates = []
+    queued_changes = []
+    for index, row in gsheet.iterrows():
+        try:
+            row_updates = {}
+            r_state = row["State"].strip()
+            r_bnum_raw = row["Number"]
+            r_bnum_display = extract_display_number(r_bnum_raw)
+            r_bnum_norm = normalize_bill_number(r_bnum_display)
+            r_btype = row["Bill Type"]
+            change_kind = None
+            prev_row_data = None
+            lscan_row = None
+            queue_update(row_updates, row, 'Youth State Risk', f"=VLOOKUP(A{index+2},'Risk Levels'!$A$4:$E$55,2)")
+            queue_update(row_updates, row, 'Adult State Risk', f"=VLOOKUP(A{index+2},'Risk Levels'!$A$4:$E$55,3)")
+            state_list = all_lists.get(r_state)
+            if state_list is None:
+                missing_states.add(r_state)
+                continue
+            if not state_list.empty:
+                lscan_row = master_index.get(r_state, {}).get(r_bnum_norm)
+                if lscan_row is None:
+                    lscan_row = find_master_row(master_index.get(r_state, {}), r_bnum_norm)
+                if lscan_row is None:
+                    continue
+
+                r_la = lscan_row["last_action"]
+                r_title = lscan_row["title"]
+                r_link = lscan_row["url"]
+                bill_id = lscan_row["bill_id"]
+                change_hash = lscan_row["change_hash"]
+                last_action_date = lscan_row["last_action_date"]
+                prev_row_data = find_previous_row(prev_lookup, r_state, r_bnum_norm, row.get("Bill ID"))
+                bill_details = None
+
+                #checks if the bill is recently added. If not then alert new bill
+                if prev_row_data is None or gsheet.at[index, 'Change Hash'] == "":
+                    logger.info("New bill detected: %s %s", r_state, r_bnum_display.strip())
+                    change_kind = "new"
+                    report.new_rows.append(f"""
+                                                    <tr>
+                                                        <th>{r_state}</th>
+                                                        <th>{r_bnum_display.strip()}</th>
+                                                        <th>{r_title}</th>
+                                                        <th>{r_btype}</th>
+                                                    </tr>
+                                                    """)
+
+                    content = bill_details_for(bill_id, change_hash)
+                    if content is None:
+                        continue
+                    bill_details = content
+
+                    sponsors_value = get_sponsors(content["sponsors"])
+                    calendar_value = get_calendar(content["calendar"])
+                    history_value = get_history(content["history"])
+                    texts_value = get_texts(content["texts"])
+                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
+                    queue_update(row_updates, row, 'Calendar', calendar_value)
+                    queue_update(row_updates, row, 'History', history_value)
+                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
+                    queue_update(row_updates, row, 'PDF', texts_value)
+
+
+                #if not new check change hash to see if the bill has changed. If it has trigger an alert
+                elif lscan_row["change_hash"] != row["Change Hash"]:
+                    logger.info("Bill change found: %s %s", r_state, r_bnum_display.strip())
+                    change_kind = "update"
+                    content = bill_details_for(bill_id, change_hash)
+                    if content is None:
+                        continue
+                    bill_details = content
+
+                    sponsors_value = get_sponsors(content["sponsors"])
+                    calendar_value = get_calendar(content["calendar"])
+                    history_value = get_history(content["history"])
+                    texts_value = get_texts(content["texts"])
+                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
+                    queue_update(row_updates, row, 'Calendar', calendar_value)
+                    if history_value != gsheet.at[index, 'History']:
+                        _inc_stat("history_updates")
+                        report.history_rows.append(f"""
+                            <tr>
+                                <th>{r_state}</th>
+                                <th>{r_bnum_display.strip()}</th>
+                                <th>{history_value.replace(gsheet.at[index, 'History'], "")}</th>
+                            </tr>
+                            """)
+                    queue_update(row_updates, row, 'History', history_value)
+                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
+                    queue_update(row_updates, row, 'PDF', texts_value)
+                elif row_missing_details(row):
+                    logger.debug("Backfilling missing details for %s %s", r_state, r_bnum_display.strip())
+                    content = bill_details_for(bill_id, change_hash)
+                    if content is None:
+                        continue
+                    bill_details = content
+                    sponsors_value = get_sponsors(content["sponsors"])
+                    calendar_value = get_calendar(content["calendar"])
+                    history_value = get_history(content["history"])
+                    texts_value = get_texts(content["texts"])
+                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
+                    queue_update(row_updates, row, 'Calendar', calendar_value)
+                    queue_update(row_updates, row, 'History', history_value)
+                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
+                    queue_update(row_updates, row, 'PDF', texts_value)
+                    change_kind = change_kind or "update"
+
+                if (not r_title) or (not r_la) or (not last_action_date) or (not r_link):
+                    if bill_details is None:
+                        bill_details = bill_details_for(bill_id, change_hash)
+                    if bill_details is None:
+                        logger.error("Bill details unavailable for %s %s", r_state, r_bnum_display.strip())
+                        continue
+                    if not r_title:
+                        r_title = bill_details.get("title") or r_title
+                    if not r_la:
+                        r_la = bill_details.get("last_action") or r_la
+                    if not last_action_date:
+                        last_action_date = bill_details.get("last_action_date") or bill_details.get("status_date")
+                    if not r_link:
+                        r_link = bill_details.get("url") or r_link
+
+                hyperlink = f"=HYPERLINK(\"{r_link}\",\"{r_bnum_display}\")"
+                queue_update(row_updates, row, 'Number', hyperlink)
+                queue_update(row_updates, row, 'Status', r_la)
+                if last_action_date != None and last_action_date != '':
+                    queue_update(row_updates, row, 'Date', last_action_date)
+                else:
+                    queue_update(row_updates, row, 'Date', "Unknown")
+                queue_update(row_updates, row, 'Summary', r_title)
+                queue_update(row_updates, row, 'Change Hash', lscan_row["change_hash"])
+                if r_link:
+                    queue_update(row_updates, row, 'URL', f"=HYPERLINK(\"{r_link}\",\"{r_link}\")")
+                else:
+                    queue_update(row_updates, row, 'URL', "Unknown")
+
+        except Exception as e:
+            logger.exception("Row processing error: %s", e)
+            report.errors.append(str(e.args[0]))
+        if row_updates:
+            meaningful_changes = get_meaningful_changes(row_updates, prev_row_data)
+            if lscan_row is not None and meaningful_changes:
+                change_kind_for_entry = change_kind or ("new" if prev_row_data is None else "update")
+                if change_kind_for_entry == "new":
+                    _inc_stat("new_bills")
+                else:
+                    _inc_stat("changed_bills")
+                change_entry = build_change_entry(
+                    change_kind_for_entry,
+                    worksheet,
+                    year,
+                    r_state,
+                    r_bnum_display.strip(),
+                    r_title,
+                    r_la,
+                    r_btype,
+                    r_link,
+                    meaningful_changes,
+                )
+                queued_changes.append(change_entry)
+            gsheet.loc[index, list(row_updates.keys())] = list(row_updates.values())
+            for col_name, value in row_updates.items():
+                cell_updates.append((index + 2, col_name, value))
+    if missing_states:
+        logger.warning("Missing state sessions for: %s", ", ".join(sorted(missing_states)))
+    return cell_updates, queued_changes, missing_states
+
+
+def synthetic_case(rows, seed=5):
+    rng = random.Random(seed)
+    states = main.STATES[:20]
+    master_rows = {state: [] for state in states}
+    sheet_rows = []
+    details = {}
+    for i in range(rows):
+        state = rng.choice(states)
+        number = f"HB{i}"
+        bill_id = 10_000 + i
+        change_hash = f"{rng.getrandbits(64):016x}"
+        blank_title = rng.random() < 0.03
+        master_rows[state].append({
+            "bill_id": bill_id,
+            "number": number,
+            "change_hash": change_hash,
+            "url": f"https://legiscan.com/{state}/bill/{number}/{year_of(i)}",
+            "last_action": "Referred to committee",
+            "last_action_date": "2026-02-01" if rng.random() > 0.02 else "",
+            "title": "" if blank_title else f"Bill {i}",
+            "session_special": 0,
+            "session_id": 2000,
+        })
+        if rng.random() > 0.01:
+            details[bill_id] = {
+                "title": f"Bill {i}",
+                "last_action": "Referred",
+                "last_action_date": "2026-02-01",
+                "url": f"https://legiscan.com/{state}/bill/{number}",
+                "sponsors": [{"name": f"Rep {i % 50}"}],
+                "calendar": [],
+                "history": [{"chamber": "H", "date": "2026-01-10", "action": "Filed"}],
+                "texts": [{"state_link": f"https://example.org/{number}.pdf"}],
+            }
+        kind = rng.random()
+        sheet_hash = change_hash if kind > 0.15 else ("" if kind < 0.05 else "stale")
+        complete = rng.random() > 0.1
+        sheet_rows.append({
+            "State": f" {state}" if rng.random() < 0.05 else state,
+            "Number": f"=HYPERLINK(\"https://legiscan.com/{number}\",\"{number}\")" if rng.random() < 0.7 else number,
+            "Bill Type": rng.choice(["Healthcare", "Education", "Sports"]),
+            "Youth State Risk": "=VLOOKUP" if rng.random() < 0.5 else "High",
+            "Adult State Risk": "Low",
+            "Sponsors": f"Rep {i % 50}" if complete else "",
+            "Calendar": "None" if complete else "Unknown",
+            "History": "2026-01-10 Filed" if complete else "",
+            "PDF": f"https://example.org/{number}.pdf" if complete else "",
+            "Bill ID": bill_id if complete else "",
+            "Status": "Referred to committee",
+            "Date": "2026-02-01",
+            "Summary": f"Bill {i}",
+            "Change Hash": sheet_hash,
+            "URL": "https://legiscan.com",
+        })
+    for extra in range(rows // 100):
+        sheet_rows.append({**sheet_rows[extra], "State": "Atlantis"})
+        sheet_rows.append({**sheet_rows[extra], "Number": f"SB{900000 + extra}"})
+    all_lists = {state: pd.DataFrame(master_rows[state]) for state in states}
+    all_lists[states[0]] = all_lists[states[0]].iloc[0:0]
+    gsheet = main.fill_missing(pd.DataFrame(sheet_rows), "")
+    prev_gsheet = gsheet.sample(frac=0.9, random_state=seed).sort_index()
+    return gsheet, all_lists, prev_gsheet, details
+
+
+def year_of(i):
+    return 2026 if i % 3 else 2025
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _without_title(new_row):
+    state, number, _, bill_type = re.findall(r"<th>(.*?)</th>", new_row, re.S)
+    return state, number, bill_type
+
+
+def _comparable(result, report):
+    # history deltas come from per-bill cursors now rather than string replace, so History is left out;
+    # blank titles are now filled from getBill before the new-bill row is built, so its title is too
+    cell_updates, queued_changes, missing_states = result
+    return (
+        sorted((row, column, str(value)) for row, column, value in cell_updates),
+        [
+            (change["state"], change["bill_number"], [f for f in change["changed_fields"] if f["field"] != "History"])
+            for change in queued_changes
+        ],
+        sorted(missing_states),
+        [_without_title(row) for row in report.new_rows],
+        report.errors,
+    )
+
+
+def run(rows=5_000):
+    # rendered detail fields are cached in the bill store; keep the benchmark's out of the real one
+    main.bill_store = BillStore(os.path.join(tempfile.mkdtemp(), "bills.sqlite3"))
+    gsheet, all_lists, prev_gsheet, details = synthetic_case(rows)
+    master_index = main.build_master_index(all_lists)
+    prev_lookup = main.build_previous_lookup(prev_gsheet)
+
+    def details_for(bill_id, change_hash):
+        return details.get(int(bill_id))
+
+    legacy_report, columnar_report = main.WorksheetReport(), main.WorksheetReport()
+    legacy, legacy_seconds = _timed(
+        legacy_diff, gsheet, "Anti-LGBTQ Bills", 2026, master_index, all_lists, prev_lookup, details_for, legacy_report
+    )
+    columnar, columnar_seconds = _timed(
+        main.diff_worksheet, gsheet, "Anti-LGBTQ Bills", 2026, master_index, all_lists, prev_lookup, details_for, columnar_report
+    )
+    assert _comparable(legacy, legacy_report) == _comparable(columnar, columnar_report), "diffs disagree"
+    print(f"rows={len(gsheet)} cells={len(columnar[0])} changes={len(columnar[1])} new={len(columnar_report.new_rows)}")
+    print(f"per-row loop: {legacy_seconds:.3f}s")
+    print(f"columnar:     {columnar_seconds:.3f}s ({legacy_seconds / columnar_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -1,6 +1,5 @@
 import os.path
 import requests
-import gspread
 import json
 import hashlib
 import logging
@@ -8,28 +7,42 @@ import threading
 import math
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import numpy as np
 import pandas as pd
 import time
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from gspread.utils import rowcol_to_a1
 
-from utils.get_sessions import get_sessions_dataframe
+from utils.get_sessions import (
+    SESSION_LIST_FILE,
+    get_sessions_dataframe,
+    catalog_entry,
+    load_session_catalog,
+    master_list_refresh_reason,
+    save_session_catalog,
+)
+from utils.datasets import ingest_datasets
+from utils.polling import latest_activity, load_polling_state, plan_state_polling, save_polling_state
 from utils.notify import notify_world, notify_dev_team, notify_legi_team, send_history_report, send_new_report, \
     notify_social
-from utils.legiscan_helper import get_calendar, get_sponsors, get_history, get_texts
+from utils.legiscan_helper import HISTORY_MAX_CHARS, HISTORY_SUFFIX, format_history_event, format_history_events, render_details
+from utils.rate_limit import TokenBucket
+from utils.bill_store import BillStore, project_bill
+from utils.frame_store import MASTER_LIST_SCHEMA, SESSION_SCHEMA, migrate_csv, read_frame, write_frame
+from utils import sheets
 from utils.config import (
     PRODUCTION,
     CACHE_DIR,
+    DATASET_INGEST_ENABLED,
     LOG_FILE,
     LOG_LEVEL,
+    LEGISCAN_MAX_WORKERS,
     LEGISCAN_MIN_INTERVAL,
     REQUEST_TIMEOUT,
-    get_sheet_key,
     get_tracker_years,
-    load_service_account_credentials,
 )
 from utils.change_queue import (
     append_changes,
@@ -65,20 +78,19 @@ STATES = ["Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado",
 
 legi_key = os.environ.get('legiscan_key')
 Master_List_URL = f"https://api.legiscan.com/?key={legi_key}&op=getMasterList&id="
+Master_List_Raw_URL = f"https://api.legiscan.com/?key={legi_key}&op=getMasterListRaw&id="
 Bill_URL = f"https://api.legiscan.com/?key={legi_key}&op=getBill&id="
 
 years = get_tracker_years((2026,))
 
-world_report = ""
-dev_report = ""
-history_report = """
+HISTORY_REPORT_HEADER = """
 <tr>
     <th>State</th>
     <th>Bill</th>
     <th>New History</th>
 </tr>
 """
-new_report = """
+NEW_REPORT_HEADER = """
 <tr>
     <th>State</th>
     <th>Bill</th>
@@ -87,12 +99,54 @@ new_report = """
 </tr>
 """
 
-dev_report_updates, new_report_updates, history_report_updates = 0, 0, 0
+class WorksheetReport:
+    """Report rows and tracked bill ids gathered by one update_worksheet task; merged once all tasks finish."""
+
+    def __init__(self):
+        self.new_rows = []
+        self.history_rows = []
+        self.errors = []
+        self.bill_ids = set()
+
+    def merge(self, other):
+        self.new_rows.extend(other.new_rows)
+        self.history_rows.extend(other.history_rows)
+        self.errors.extend(other.errors)
+        self.bill_ids.update(other.bill_ids)
+        return self
+
+    @property
+    def new_report(self):
+        return NEW_REPORT_HEADER + "".join(self.new_rows)
+
+    @property
+    def history_report(self):
+        return HISTORY_REPORT_HEADER + "".join(self.history_rows)
+
+    @property
+    def dev_report(self):
+        return "".join("\n" + error for error in self.errors)
+
+run_report = WorksheetReport()
+tracked_bill_ids = set()
 BILL_CACHE_DIR = os.path.join(CACHE_DIR, "bills")
+BILL_STORE_PATH = os.path.join(CACHE_DIR, "bills.sqlite3")
+BILL_STORE_MAX_BILLS = int(os.environ.get("BILL_STORE_MAX_BILLS", "20000"))
+bill_store = BillStore(BILL_STORE_PATH)
+# bill_id -> (change_hash, rendered Sponsors/Calendar/History/PDF); one entry per bill
+_detail_fields = {}
+_detail_fields_lock = threading.Lock()
 LEGISCAN_MIN_INTERVAL = float(os.environ.get("LEGISCAN_MIN_INTERVAL", "0"))
 SESSION_LIST_REFRESH_SECONDS = 24 * 60 * 60
 MASTER_LIST_REFRESH_SECONDS = 60 * 60
-_last_legiscan_call = 0.0
+# getBill calls a master list refresh may spend on moved tracked bills; past this one
+# full getMasterList query replaces them
+MASTER_LIST_PATCH_LIMIT = int(os.environ.get("MASTER_LIST_PATCH_LIMIT", "5"))
+# worksheets updated at once, one per tracker worksheet by default; 1 keeps the old one-at-a-time order
+WORKSHEET_MAX_WORKERS = int(os.environ.get("WORKSHEET_MAX_WORKERS", "4"))
+# re-read the whole worksheet for the saved snapshot every this many runs to catch manual edits
+SNAPSHOT_VERIFY_RUNS = int(os.environ.get("SNAPSHOT_VERIFY_RUNS", "10"))
+_legiscan_bucket = TokenBucket.from_min_interval(LEGISCAN_MIN_INTERVAL)
 STATS = {
     "last_run_started": None,
     "last_run_finished": None,
@@ -101,9 +155,15 @@ STATS = {
     "legiscan_calls": 0,
     "bill_cache_hits": 0,
     "bill_cache_misses": 0,
+    "dataset_bills_ingested": 0,
+    "master_lists_fetched": 0,
+    "master_lists_reused": 0,
+    "master_lists_patched": 0,
     "new_bills": 0,
     "changed_bills": 0,
     "history_updates": 0,
+    "detail_field_hits": 0,
+    "polling_plan": {},
 }
 _stats_lock = threading.Lock()
 
@@ -175,14 +235,64 @@ def mark_run_success(worksheet, year):
 def was_last_run_successful(worksheet, year):
     return os.path.exists(_success_flag_path(worksheet, year))
 
+def _snapshot_counter_path(worksheet, year):
+    safe_name = worksheet.replace(" ", "_").replace("/", "_")
+    return os.path.join(CACHE_DIR, f"snapshot-runs-{safe_name}-{year}.txt")
+
+def snapshot_verification_due(worksheet, year):
+    if SNAPSHOT_VERIFY_RUNS <= 1:
+        return True
+    try:
+        with open(_snapshot_counter_path(worksheet, year), "r") as handle:
+            runs = int(handle.read().strip() or 0)
+    except (FileNotFoundError, ValueError):
+        return True
+    except Exception:
+        logger.warning("Unable to read snapshot counter for %s %s", worksheet, year)
+        return True
+    return runs + 1 >= SNAPSHOT_VERIFY_RUNS
+
+def record_snapshot_run(worksheet, year, verified):
+    path = _snapshot_counter_path(worksheet, year)
+    try:
+        runs = 0
+        if not verified and os.path.exists(path):
+            with open(path, "r") as handle:
+                runs = int(handle.read().strip() or 0) + 1
+        with open(path, "w") as handle:
+            handle.write(str(runs))
+    except Exception:
+        logger.warning("Unable to write snapshot counter for %s %s", worksheet, year)
+
+def apply_cell_updates(gsheet, cell_updates):
+    """
+    Return the snapshot a full re-read would give after cell_updates were written: links show
+    their display text and other formulas (the risk VLOOKUPs) keep their last read value.
+    """
+    snapshot = gsheet.copy()
+    for row_num, col_name, value in cell_updates:
+        if col_name not in snapshot.columns:
+            continue
+        value = clean_cell_value(value)
+        if isinstance(value, str) and value.startswith("="):
+            if not value.startswith("=HYPERLINK("):
+                continue
+            value = extract_display_number(value)
+        snapshot.at[row_num - 2, col_name] = value
+    return snapshot
+
+def snapshot_drift(local, remote):
+    """Count the cells where the locally built snapshot disagrees with the sheet."""
+    if list(local.columns) != list(remote.columns) or len(local) != len(remote):
+        return None
+    local_values = local.map(normalize_for_compare).to_numpy()
+    remote_values = remote.reset_index(drop=True).map(normalize_for_compare).to_numpy()
+    return int((local_values != remote_values).sum())
+
 def legiscan_get(url, session):
-    global _last_legiscan_call
-    if LEGISCAN_MIN_INTERVAL > 0:
-        now = time.monotonic()
-        elapsed = now - _last_legiscan_call
-        if elapsed < LEGISCAN_MIN_INTERVAL:
-            logger.debug("Throttling LegiScan call for %.3fs", LEGISCAN_MIN_INTERVAL - elapsed)
-            time.sleep(LEGISCAN_MIN_INTERVAL - elapsed)
+    waited = _legiscan_bucket.acquire()
+    if waited:
+        logger.debug("Throttled LegiScan call for %.3fs", waited)
     logger.debug("LegiScan request: %s", url)
     try:
         response = session.get(url, timeout=REQUEST_TIMEOUT)
@@ -191,7 +301,6 @@ def legiscan_get(url, session):
         _set_stat("last_run_status", "error")
         logger.error("LegiScan request failed: %s", exc)
         raise
-    _last_legiscan_call = time.monotonic()
     _inc_stat("legiscan_calls")
     logger.debug("LegiScan response: %s %s", response.status_code, url)
     return response
@@ -211,32 +320,79 @@ def parse_legiscan_json(response, context):
     return data
 
 def load_bill_cache(bill_id, expected_change_hash):
-    cache_path = os.path.join(BILL_CACHE_DIR, f"{bill_id}.json")
-    if not os.path.exists(cache_path):
+    try:
+        cached = bill_store.get(bill_id, expected_change_hash)
+    except Exception:
+        logger.exception("Bill cache read failed: %s", bill_id)
+        return None
+    if cached is None:
         logger.debug("Bill cache miss: %s", bill_id)
         _inc_stat("bill_cache_misses")
         return None
+    logger.debug("Bill cache hit: %s", bill_id)
+    _inc_stat("bill_cache_hits")
+    return cached
+
+def load_bill_cache_batch(detail_requests):
     try:
-        with open(cache_path, "r") as handle:
-            cached = json.load(handle)
-        if cached.get("change_hash") == expected_change_hash:
-            logger.debug("Bill cache hit: %s", bill_id)
-            _inc_stat("bill_cache_hits")
-            return cached.get("bill")
-        logger.debug("Bill cache stale: %s", bill_id)
-        _inc_stat("bill_cache_misses")
+        cached = bill_store.get_many(detail_requests)
     except Exception:
-        logger.exception("Bill cache read failed: %s", bill_id)
-        return None
-    return None
+        logger.exception("Bill cache batch read failed")
+        return {}
+    _inc_stat("bill_cache_hits", len(cached))
+    return cached
 
 def save_bill_cache(bill_id, change_hash, bill):
-    os.makedirs(BILL_CACHE_DIR, exist_ok=True)
-    cache_path = os.path.join(BILL_CACHE_DIR, f"{bill_id}.json")
-    with open(cache_path, "w") as handle:
-        json.dump({"change_hash": change_hash, "bill": bill}, handle)
+    bill_store.put(bill_id, change_hash, bill)
     logger.debug("Bill cache updated: %s", bill_id)
 
+def save_dataset_bill(bill_id, change_hash, bill, dataset_ts):
+    # a bill fetched with getBill after the archive was built is newer than the archive copy
+    fetched_at = bill_store.fetched_at(bill_id)
+    if fetched_at is not None and fetched_at >= dataset_ts:
+        return False
+    bill_store.put(bill_id, change_hash, bill, fetched_at=dataset_ts)
+    return True
+
+def ingest_bill_datasets(year, session):
+    if not DATASET_INGEST_ENABLED:
+        return 0
+    try:
+        with bill_store.batch():
+            written = ingest_datasets(year, lambda url: legiscan_get(url, session), save_dataset_bill)
+    except Exception:
+        logger.exception("Dataset ingestion failed for %s; falling back to getBill", year)
+        return 0
+    _inc_stat("dataset_bills_ingested", written)
+    return written
+
+def cached_detail_fields(bill_id, change_hash):
+    """Rendered detail fields for a bill at this change_hash from memory or the bill store, else None."""
+    bill_id = int(bill_id)
+    with _detail_fields_lock:
+        cached = _detail_fields.get(bill_id)
+    if cached is not None and cached[0] == change_hash:
+        return cached[1]
+    try:
+        fields = bill_store.get_derived(bill_id, change_hash)
+    except Exception:
+        logger.exception("Derived field cache read failed: %s", bill_id)
+        return None
+    if fields is not None:
+        with _detail_fields_lock:
+            _detail_fields[bill_id] = (change_hash, fields)
+    return fields
+
+def detail_fields(bill_id, change_hash, bill):
+    fields = render_details(bill)
+    with _detail_fields_lock:
+        _detail_fields[int(bill_id)] = (change_hash, fields)
+    try:
+        bill_store.put_derived(bill_id, change_hash, fields)
+    except Exception:
+        logger.exception("Derived field cache write failed: %s", bill_id)
+    return fields
+
 def get_bill_details(bill_id, change_hash, session):
     cached = load_bill_cache(bill_id, change_hash)
     if cached is not None:
@@ -247,13 +403,95 @@ def get_bill_details(bill_id, change_hash, session):
     if not data or "bill" not in data:
         logger.error("Missing bill payload for bill_id=%s", bill_id)
         return None
-    content = data["bill"]
+    content = project_bill(data["bill"])
     save_bill_cache(bill_id, change_hash, content)
     return content
 
+def prefetch_bill_details(detail_requests, session, max_workers=LEGISCAN_MAX_WORKERS):
+    """
+    Return {bill_id: bill} for every (bill_id, change_hash) pair, reading the bill store in one
+    batch and fetching the misses through a worker pool. Workers share the LegiScan token
+    bucket, so the pool only overlaps request latency.
+    """
+    wanted = {int(bill_id): change_hash for bill_id, change_hash in detail_requests}
+    bills = load_bill_cache_batch(wanted.items())
+    pending = {bill_id: change_hash for bill_id, change_hash in wanted.items() if bill_id not in bills}
+    if not pending:
+        return bills
+    logger.info("Prefetching %d bill detail(s) with %d worker(s)", len(pending), max(1, max_workers))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(get_bill_details, bill_id, change_hash, session): bill_id for bill_id, change_hash in pending.items()}
+        for future in as_completed(futures):
+            try:
+                content = future.result()
+            except Exception:
+                logger.exception("Bill detail prefetch failed: %s", futures[future])
+                continue
+            if content is not None:
+                bills[futures[future]] = content
+    return bills
+
+def bill_needs_details(row, lscan_row, in_previous):
+    if not in_previous or row.get("Change Hash") == "":
+        return True
+    if lscan_row["change_hash"] != row.get("Change Hash") or row_missing_details(row):
+        return True
+    return (not lscan_row["title"]) or (not lscan_row["last_action"]) or (not lscan_row["last_action_date"]) or (not lscan_row["url"])
+
+def collect_detail_requests(gsheet, master_index, all_lists, prev_lookup):
+    detail_requests = []
+    for _, row in gsheet.iterrows():
+        r_state = str(row.get("State", "")).strip()
+        state_list = all_lists.get(r_state)
+        if state_list is None or state_list.empty:
+            continue
+        number_norm = normalize_bill_number(row.get("Number", ""))
+        lscan_row = find_master_row(master_index.get(r_state, {}), number_norm)
+        if lscan_row is None or pd.isna(lscan_row["bill_id"]):
+            continue
+        prev_row = find_previous_row(prev_lookup, r_state, number_norm, row.get("Bill ID"))
+        if bill_needs_details(row, lscan_row, prev_row is not None):
+            detail_requests.append((lscan_row["bill_id"], lscan_row["change_hash"]))
+    return detail_requests
+
+def build_previous_lookup(prev_gsheet):
+    """
+    Key the previous snapshot's rows by (state, normalized number) and by Bill ID.
+    The first row wins on duplicate keys, as the old boolean-mask lookup did.
+    """
+    by_number = {}
+    by_bill_id = {}
+    if "State" not in prev_gsheet.columns or "Number" not in prev_gsheet.columns:
+        return by_number, by_bill_id
+    states = prev_gsheet["State"].astype(str).str.strip()
+    numbers = normalize_bill_numbers(prev_gsheet["Number"])
+    bill_ids = prev_gsheet["Bill ID"] if "Bill ID" in prev_gsheet.columns else [""] * len(prev_gsheet)
+    for record, state, number, bill_id in zip(prev_gsheet.to_dict("records"), states, numbers, bill_ids):
+        by_number.setdefault((state, number), record)
+        bill_key = normalize_for_compare(bill_id)
+        if bill_key:
+            by_bill_id.setdefault(bill_key, record)
+    return by_number, by_bill_id
+
+def find_previous_row(prev_lookup, state, number_norm, bill_id=None):
+    by_number, by_bill_id = prev_lookup
+    prev_row = by_number.get((str(state).strip(), number_norm))
+    if prev_row is None:
+        bill_key = normalize_for_compare(bill_id)
+        if bill_key:
+            prev_row = by_bill_id.get(bill_key)
+    return prev_row
+
+def sheet_bill_ids(gsheet):
+    if "Bill ID" not in gsheet.columns:
+        return set()
+    ids = pd.to_numeric(gsheet["Bill ID"], errors="coerce").dropna()
+    return set(ids.astype(int))
+
+DETAIL_FIELDS = ["Sponsors", "Calendar", "History", "PDF", "Bill ID"]
+
 def row_missing_details(row):
-    required_fields = ["Sponsors", "Calendar", "History", "PDF", "Bill ID"]
-    for field in required_fields:
+    for field in DETAIL_FIELDS:
         value = row.get(field)
         try:
             if pd.isna(value):
@@ -266,46 +504,96 @@ def row_missing_details(row):
             return True
     return False
 
+def missing_details_mask(gsheet):
+    """Vectorized row_missing_details over every row of the sheet."""
+    missing = pd.Series(False, index=gsheet.index)
+    for field in DETAIL_FIELDS:
+        if field not in gsheet.columns:
+            return pd.Series(True, index=gsheet.index)
+        values = gsheet[field]
+        missing |= values.isna() | values.astype(str).str.strip().isin(("", "Unknown"))
+    return missing
+
 def sheet_has_missing_details(gsheet):
-    for _, row in gsheet.iterrows():
-        if row_missing_details(row):
-            logger.debug("Missing details detected in sheet")
-            return True
+    if missing_details_mask(gsheet).any():
+        logger.debug("Missing details detected in sheet")
+        return True
     return False
 
-def worksheet_legiscan_digest(gsheet, master_index):
-    rows = []
-    for _, row in gsheet.iterrows():
-        state = str(row.get("State", "")).strip()
-        number = str(row.get("Number", "")).strip()
-        if not state or not number:
-            continue
-        lscan_row = master_index.get(state, {}).get(number)
-        change_hash = ""
-        if lscan_row is not None:
-            change_hash = str(lscan_row.get("change_hash", "")).strip()
-        rows.append((state, number, change_hash))
-    rows.sort()
-    digest = hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
-    return digest
-
-def load_worksheet_digest(worksheet, year):
+def _row_state_path(worksheet, year):
     safe_name = worksheet.replace(" ", "_").replace("/", "_")
-    digest_path = os.path.join(CACHE_DIR, f"digest-{safe_name}-{year}.txt")
-    if not os.path.exists(digest_path):
-        return None
+    return os.path.join(CACHE_DIR, f"rows-{safe_name}-{year}.json")
+
+def load_row_state(worksheet, year):
     try:
-        with open(digest_path, "r") as handle:
-            return handle.read().strip()
+        with open(_row_state_path(worksheet, year), "r") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
     except Exception:
-        return None
+        logger.exception("Unable to read row state for %s %s", worksheet, year)
+        return {}
 
-def save_worksheet_digest(worksheet, year, digest):
-    safe_name = worksheet.replace(" ", "_").replace("/", "_")
-    digest_path = os.path.join(CACHE_DIR, f"digest-{safe_name}-{year}.txt")
-    os.makedirs(os.path.dirname(digest_path), exist_ok=True)
-    with open(digest_path, "w") as handle:
-        handle.write(digest)
+def save_row_state(worksheet, year, row_state):
+    path = _row_state_path(worksheet, year)
+    try:
+        with open(path, "w") as handle:
+            json.dump(row_state, handle)
+    except Exception:
+        logger.exception("Unable to write row state to %s", path)
+
+def row_keys(gsheet):
+    if "State" not in gsheet.columns or "Number" not in gsheet.columns:
+        return pd.Series("", index=gsheet.index, dtype=object)
+    return gsheet["State"].astype(str).str.strip() + "|" + normalize_bill_numbers(gsheet["Number"])
+
+def row_fingerprints(gsheet):
+    """Hash each row's hand-maintained columns (everything the bot does not write) to spot edits."""
+    columns = [column for column in gsheet.columns if column not in DIFF_COLUMNS]
+    if not columns:
+        return pd.Series("", index=gsheet.index, dtype=object)
+    return pd.util.hash_pandas_object(gsheet[columns].astype(str), index=False).astype(str)
+
+def build_row_state(gsheet):
+    """Per-row state after a run: the change_hash applied, whether details are complete, the row's place and fingerprint."""
+    hashes = _sheet_column(gsheet, "Change Hash").astype(str)
+    complete = ~missing_details_mask(gsheet)
+    row_state = {}
+    for key, row_num, change_hash, details_complete, fingerprint in zip(
+        row_keys(gsheet), gsheet.index + 2, hashes, complete, row_fingerprints(gsheet)
+    ):
+        row_state[key] = {
+            "change_hash": change_hash,
+            "details_complete": bool(details_complete),
+            "row": int(row_num),
+            "fingerprint": fingerprint,
+        }
+    return row_state
+
+def dirty_row_mask(gsheet, row_state, master_index):
+    """
+    Rows that need a diff this run: rows new to the sheet, moved or hand-edited, rows whose
+    LegiScan change_hash moved past the one last applied, and rows still missing details.
+    """
+    keys = row_keys(gsheet)
+    stored = [row_state.get(key) for key in keys]
+    states = _sheet_column(gsheet, "State").astype(str).str.strip().tolist()
+    numbers = keys.str.split("|", n=1).str[-1].tolist()
+    dirty = missing_details_mask(gsheet).to_numpy().copy()
+    sheet_hashes = _sheet_column(gsheet, "Change Hash").astype(str).tolist()
+    for i, (entry, row_num, fingerprint) in enumerate(zip(stored, gsheet.index + 2, row_fingerprints(gsheet))):
+        if dirty[i]:
+            continue
+        if entry is None or entry.get("row") != row_num or entry.get("fingerprint") != fingerprint:
+            dirty[i] = True
+            continue
+        if not entry.get("details_complete") or entry.get("change_hash") != sheet_hashes[i]:
+            dirty[i] = True
+            continue
+        lscan_row = find_master_row(master_index.get(states[i], {}), numbers[i])
+        if lscan_row is not None and str(lscan_row.get("change_hash")) != entry.get("change_hash"):
+            dirty[i] = True
+    return pd.Series(dirty, index=gsheet.index)
 
 def parse_special_session_number(session_row):
     """
@@ -342,8 +630,111 @@ def parse_special_session_number(session_row):
     except Exception:
         return 0
 
+def masterlist_rows(content):
+    return [value for attribute, value in content.items() if attribute != "session"]
+
+def fetch_master_list(s_id, session):
+    r = legiscan_get(Master_List_URL + str(s_id), session)
+    logger.debug("Master list url: %s", Master_List_URL + str(s_id))
+    data = parse_legiscan_json(r, f"getMasterList session_id={s_id}")
+    if not data or "masterlist" not in data:
+        return None
+    return pd.DataFrame(masterlist_rows(data["masterlist"]))
+
+def master_row_from_bill(bill):
+    history = bill.get("history") or []
+    last_event = history[-1] if history else {}
+    return {
+        "bill_id": bill.get("bill_id"),
+        "number": bill.get("bill_number"),
+        "change_hash": bill.get("change_hash"),
+        "url": bill.get("url"),
+        "status_date": bill.get("status_date"),
+        "status": bill.get("status"),
+        "last_action_date": last_event.get("date") or bill.get("status_date"),
+        "last_action": last_event.get("action"),
+        "title": bill.get("title"),
+    }
+
+def master_row_from_raw(raw_row, previous=None):
+    """
+    Master-list row for a moved bill no tracker sheet lists, from its getMasterListRaw entry
+    (bill_id, number, change_hash). Title, URL and dates carry over from the previous row;
+    the last action is cleared rather than left stale, so a sheet that later adds the bill
+    fills it from getBill.
+    """
+    row = dict(previous) if previous is not None else {}
+    row.update({
+        "bill_id": int(raw_row["bill_id"]),
+        "number": raw_row.get("number"),
+        "change_hash": str(raw_row["change_hash"]),
+        "status": None,
+        "last_action": None,
+    })
+    return row
+
+def refresh_master_list(cached_df, s_id, session):
+    """
+    Compare a cached master list against getMasterListRaw (ids and hashes only) and patch in
+    the bills whose change_hash moved: from the bill store when it has the new hash, with
+    getBill for bills on a tracker sheet, and from the raw row for the rest. Returns None when
+    a full getMasterList should be pulled instead.
+    """
+    if cached_df.empty or "bill_id" not in cached_df.columns or "change_hash" not in cached_df.columns:
+        return None
+    r = legiscan_get(Master_List_Raw_URL + str(s_id), session)
+    data = parse_legiscan_json(r, f"getMasterListRaw session_id={s_id}")
+    if not data or "masterlist" not in data:
+        return None
+    raw = pd.DataFrame(masterlist_rows(data["masterlist"]))
+    if raw.empty or "bill_id" not in raw.columns or "change_hash" not in raw.columns:
+        return None
+    stored = dict(zip(cached_df["bill_id"].astype(int), cached_df["change_hash"].astype(str)))
+    moved = [
+        (int(bill_id), str(change_hash))
+        for bill_id, change_hash in zip(raw["bill_id"], raw["change_hash"])
+        if stored.get(int(bill_id)) != str(change_hash)
+    ]
+    live_ids = set(raw["bill_id"].astype(int))
+    moved_ids = {bill_id for bill_id, _ in moved}
+    bill_ids = cached_df["bill_id"].astype(int)
+    patched = cached_df.loc[bill_ids.isin(live_ids) & ~bill_ids.isin(moved_ids)]
+    if moved:
+        # bills already in the store under their new hash (e.g. from a dataset) cost nothing;
+        # of the rest only bills on a tracker sheet are worth a getBill
+        bills = load_bill_cache_batch(moved)
+        tracked = [(bill_id, change_hash) for bill_id, change_hash in moved if bill_id not in bills and bill_id in tracked_bill_ids]
+        if len(tracked) > MASTER_LIST_PATCH_LIMIT:
+            logger.info("%d tracked bills moved in session_id=%s; pulling the full master list", len(tracked), s_id)
+            return None
+        if tracked:
+            bills.update(prefetch_bill_details(tracked, session))
+        previous = {int(row["bill_id"]): row for row in cached_df.to_dict("records")}
+        raw_rows = {int(row["bill_id"]): row for row in raw.to_dict("records")}
+        rows = []
+        for bill_id, change_hash in moved:
+            bill = bills.get(bill_id)
+            if bill is None and bill_id in tracked_bill_ids:
+                bill = get_bill_details(bill_id, change_hash, session)
+                if bill is None:
+                    return None
+            if bill is not None:
+                rows.append(master_row_from_bill(bill))
+            else:
+                rows.append(master_row_from_raw(raw_rows[bill_id], previous.get(bill_id)))
+        patched = pd.concat([patched, pd.DataFrame(rows)], ignore_index=True)
+    logger.info("Master list for session_id=%s patched with %d moved bill(s)", s_id, len(moved))
+    _inc_stat("master_lists_patched")
+    return patched.reset_index(drop=True)
+
+def master_list_path(s_name, s_year, s_id):
+    path = os.path.join(CACHE_DIR, f"{s_name}-{s_year}-session-{s_id}.feather")
+    migrate_csv(path[:-len(".feather")] + ".csv", path, MASTER_LIST_SCHEMA)
+    return path
+
 def get_main_lists(year, session):
-    session_list_file = os.path.join(CACHE_DIR, "sessions.csv")
+    session_list_file = SESSION_LIST_FILE
+    migrate_csv(os.path.join(CACHE_DIR, "sessions.csv"), session_list_file, SESSION_SCHEMA)
 
     all_lists = {}
     logger.info("Loading session lists for year %s", year)
@@ -354,13 +745,22 @@ def get_main_lists(year, session):
         df = get_sessions_dataframe(session=session, request_fn=lambda url: legiscan_get(url, session))
     else:
         logger.info("Loading sessions_list from cache")
-        df = pd.read_csv(session_list_file)
+        df = read_frame(session_list_file, SESSION_SCHEMA)
 
     if df.empty or not all(col in df.columns for col in ["year_start", "year_end", "special", "session_id", "state_id"]):
         logger.error("Session list is empty or missing required columns; skipping master list load")
         return {}
 
     SESSIONS = df.loc[((df['year_start'] == year) | (df['year_end'] == year))]
+    catalog = load_session_catalog()
+    polling_state = load_polling_state()
+    year_polling = polling_state.setdefault(str(year), {})
+    plan = plan_state_polling(SESSIONS, STATES, year_polling)
+    with _stats_lock:
+        STATS["polling_plan"] = {**STATS.get("polling_plan", {}), str(year): plan}
+    due_states = sorted(name for name, entry in plan.items() if entry["due"])
+    failed_states = set()
+    logger.info("Polling %d of %d states for %s: %s", len(due_states), len(plan), year, ", ".join(due_states) or "none")
 
     for idx, s in SESSIONS.iterrows():
         # set helpful vars
@@ -374,42 +774,56 @@ def get_main_lists(year, session):
         special_number = parse_special_session_number(s)
         s_name = STATES[state_id - 1]
         s_year = str(s.get("year_start"))
-        s_files = [os.path.join(CACHE_DIR, f"{s_name}-{s_year}-session-{s_id}.csv")]
+        s_files = [master_list_path(s_name, s_year, s_id)]
 
         # if this session extends more than one year we want to make sure we use it for both years
         if s.get("year_start") != s.get("year_end"):
-            s_files.append(os.path.join(CACHE_DIR, f"{s_name}-{str(s.get('year_end'))}-session-{s_id}.csv"))
+            s_files.append(master_list_path(s_name, s.get("year_end"), s_id))
 
+        cataloged = catalog.get(str(s_id))
+        state_plan = plan.get(s_name, {"due": True, "interval": MASTER_LIST_REFRESH_SECONDS})
+        fetched, failed = False, False
+        fresh_df = None
         for s_file in s_files:
-            # checks cache if stale or doesn't exist pull (we can pull new data every hour)
-            if (not os.path.exists(s_file)) or (os.path.getmtime(s_file)) <= time.time() - MASTER_LIST_REFRESH_SECONDS:
-                logger.info("Session master list cache stale; fetching %s %s", s_name, s_year)
-                # Pull session master list from Legiscan
-                r = legiscan_get(Master_List_URL + str(s_id), session)
-                logger.debug("Master list url: %s", Master_List_URL + str(s_id))
-                data = parse_legiscan_json(r, f"getMasterList session_id={s_id}")
-                if not data or "masterlist" not in data:
+            # states the planner did not mark due only fetch lists we have never cached; due states
+            # refetch when the session's dataset_hash moved or it is active and older than its interval
+            cache_age = time.time() - os.path.getmtime(s_file) if os.path.exists(s_file) else None
+            if state_plan["due"]:
+                reason = master_list_refresh_reason(s, cataloged, cache_age, state_plan["interval"])
+            else:
+                reason = "missing" if cache_age is None else None
+            if reason and fresh_df is not None:
+                # both year files of a multi-year session share one master list
+                session_df = fresh_df.copy()
+                write_frame(session_df, s_file, MASTER_LIST_SCHEMA)
+            elif reason:
+                logger.info("Session master list %s; fetching %s %s", reason, s_name, s_year)
+                session_df = None
+                if cache_age is not None:
+                    # cheap tier: ids and hashes only, full rows just for bills that moved
+                    session_df = refresh_master_list(read_frame(s_file, MASTER_LIST_SCHEMA), s_id, session)
+                if session_df is None:
+                    _inc_stat("master_lists_fetched")
+                    session_df = fetch_master_list(s_id, session)
+                if session_df is None:
                     logger.error("Missing master list for session_id=%s", s_id)
                     all_lists[s_name] = pd.DataFrame()
+                    failed = True
+                    failed_states.add(s_name)
                     continue
-                content = data["masterlist"]
-                temp_list = []
-                for attribute, value in content.items():
-                    if attribute != "session":
-                        temp_list.append(value)
-                session_df = pd.DataFrame(temp_list)
                 session_df["session_special"] = special_number
                 session_df["session_id"] = s_id
 
-                # save to csv
-                session_df.to_csv(s_file)
+                write_frame(session_df, s_file, MASTER_LIST_SCHEMA)
+                session_df = read_frame(s_file, MASTER_LIST_SCHEMA)
+                fresh_df = session_df
+                fetched = True
             else:
                 logger.info("Loading master list from cache: %s", s_file)
-                session_df = pd.read_csv(s_file)
-                if "session_special" not in session_df.columns:
-                    session_df["session_special"] = special_number
-                if "session_id" not in session_df.columns:
-                    session_df["session_id"] = s_id
+                _inc_stat("master_lists_reused")
+                session_df = read_frame(s_file, MASTER_LIST_SCHEMA)
+                session_df["session_special"] = session_df["session_special"].fillna(special_number)
+                session_df["session_id"] = session_df["session_id"].fillna(s_id)
 
             existing = all_lists.get(s_name, pd.DataFrame())
             if existing.empty:
@@ -420,57 +834,115 @@ def get_main_lists(year, session):
                     combined = combined.drop_duplicates(subset="bill_id", keep="last")
                 all_lists[s_name] = combined
 
+        if not failed and (fetched or cataloged is None):
+            catalog[str(s_id)] = catalog_entry(s)
+            catalog[str(s_id)]["updated_at"] = time.time()
+
+    save_session_catalog(catalog)
+    now = time.time()
+    for s_name, entry in plan.items():
+        recorded = year_polling.setdefault(s_name, {})
+        if entry["due"] and s_name not in failed_states:
+            recorded["last_refreshed"] = now
+        activity = latest_activity(all_lists.get(s_name))
+        if activity:
+            recorded["last_activity"] = activity
+    save_polling_state(polling_state)
     return all_lists
 
+MASTER_INDEX_FIELDS = ["change_hash", "last_action", "last_action_date", "title", "url", "bill_id", "session_special", "raw_number", "session_id"]
+
+class StateIndex(dict):
+    """
+    One state's master index. by_base maps a number without its X<n> prefix to
+    {session_special: entry}, each the first such entry in key order, with the
+    session_special values themselves in first-seen order.
+    """
+
+    def __init__(self, entries=(), by_base=None):
+        super().__init__(entries)
+        self.by_base = by_base if by_base is not None else index_by_base(self.items())
+
+def index_by_base(items, bases=None):
+    by_base = {}
+    bases = bases if bases is not None else (strip_session_prefix(key) for key, _ in items)
+    for base, (_, entry) in zip(bases, items):
+        group = by_base.setdefault(base, {})
+        group.setdefault(int(entry.get("session_special") or 0), entry)
+    return by_base
+
+def display_bill_numbers(numbers):
+    """Vectorized extract_display_number for a Series of raw bill numbers."""
+    display = numbers.astype(str).str.strip()
+    return display.str.extract(r'^=HYPERLINK\(".*?","(.*)"\)', expand=False).fillna(display)
+
+def normalize_bill_numbers(numbers):
+    """Vectorized normalize_bill_number for a Series of raw bill numbers."""
+    return display_bill_numbers(numbers).str.replace(r"[^A-Za-z0-9]", "", regex=True).str.upper()
+
+def build_state_index(df):
+    """
+    Index one state's master list by normalized number, by number without the X<n> special
+    session prefix, and by X<special><base> for special-session rows.
+    When several bills share a key a regular-session bill wins over a special-session one,
+    except on the X<special><base> keys, where the special bill always wins; otherwise
+    the later row wins. Keys keep the order in which they were first seen.
+    """
+    if df.empty or "number" not in df.columns:
+        return StateIndex()
+    df = df.reset_index(drop=True)
+    raw_numbers = df["number"].where(df["number"].notna(), "").astype(str).str.strip()
+    norm = normalize_bill_numbers(raw_numbers)
+    base = norm.str.replace(r"^X\d+", "", regex=True)
+    base = base.where(base != "", norm)
+    if "session_special" in df.columns:
+        special = pd.to_numeric(df["session_special"], errors="coerce").fillna(0).astype(int)
+    else:
+        special = pd.Series(0, index=df.index)
+    valid = norm != ""
+    positions = pd.Series(df.index, index=df.index)
+    # every (key, row) store as one op: step 0 number, 1 base number, 2 special-session key
+    ops = pd.concat(
+        [
+            pd.DataFrame({"key": norm, "pos": positions, "step": 0, "forced": False})[valid],
+            pd.DataFrame({"key": base, "pos": positions, "step": 1, "forced": False})[valid & (base != norm)],
+            pd.DataFrame({"key": "X" + special.astype(str) + base, "pos": positions, "step": 2, "forced": True})[valid & (special > 0)],
+        ],
+        ignore_index=True,
+    )
+    if ops.empty:
+        return StateIndex()
+    ops["order"] = ops["pos"] * 3 + ops["step"]
+    ops["special"] = special.to_numpy()[ops["pos"].to_numpy()] > 0
+    # a forced op always replaces; after the last one, a regular-session op always replaces
+    # and a special-session op only replaces another special one
+    last_forced = ops[ops["forced"]].groupby("key")["order"].max()
+    ops["last_forced"] = ops["key"].map(last_forced).fillna(-1)
+    regular_after = ops[~ops["special"] & (ops["order"] > ops["last_forced"])].groupby("key")["order"].max()
+    grouped = ops.groupby("key")["order"]
+    winners = regular_after.reindex(grouped.max().index).fillna(grouped.max()).astype(int) // 3
+    first_seen = grouped.min().sort_values()
+    winners = winners.reindex(first_seen.index)
+
+    columns = [field for field in MASTER_INDEX_FIELDS if field in df.columns]
+    winning_rows = sorted(set(winners))
+    subset = df.loc[winning_rows, columns]
+    column_values = [subset[column].tolist() for column in columns]
+    raw_values = raw_numbers.to_numpy()
+    special_values = special.to_numpy()
+    entries = {}
+    for pos, values in zip(winning_rows, zip(*column_values)):
+        record = dict(zip(columns, values))
+        record["raw_number"] = raw_values[pos]
+        record["session_special"] = int(special_values[pos])
+        record["session_id"] = record.get("session_id")
+        entries[pos] = record
+    items = [(key, entries[pos]) for key, pos in zip(winners.index, winners.to_numpy())]
+    key_bases = winners.index.to_series().str.replace(r"^X\d+", "", regex=True)
+    return StateIndex(items, by_base=index_by_base(items, key_bases))
+
 def build_master_index(all_lists):
-    fields = ["change_hash", "last_action", "last_action_date", "title", "url", "bill_id", "session_special", "raw_number", "session_id"]
-    master_index = {}
-    for state_name, df in all_lists.items():
-        if df.empty:
-            master_index[state_name] = {}
-            continue
-        if "number" not in df.columns:
-            master_index[state_name] = {}
-            continue
-        state_index = {}
-        def _store_entry(key, entry, prefer_non_special=True):
-            if not key:
-                return
-            existing = state_index.get(key)
-            new_special = entry.get("session_special") or 0
-            if existing is None:
-                state_index[key] = entry
-                return
-            existing_special = existing.get("session_special") or 0
-            if prefer_non_special:
-                if existing_special and not new_special:
-                    state_index[key] = entry
-                    return
-                if not existing_special and new_special:
-                    return
-            state_index[key] = entry
-        for _, row in df.iterrows():
-            number_raw = str(row.get("number", "")).strip()
-            number_norm = normalize_bill_number(number_raw)
-            if number_norm:
-                entry = {field: row.get(field) for field in fields if field in row}
-                entry["raw_number"] = number_raw
-                try:
-                    entry["session_special"] = int(entry.get("session_special") or 0)
-                except Exception:
-                    entry["session_special"] = 0
-                entry["session_id"] = row.get("session_id")
-                base_key = strip_session_prefix(number_norm) or number_norm
-                _store_entry(number_norm, entry, prefer_non_special=True)
-                if base_key != number_norm:
-                    _store_entry(base_key, entry, prefer_non_special=True)
-                else:
-                    _store_entry(base_key, entry, prefer_non_special=True)
-                if entry["session_special"] and base_key:
-                    special_key = f"X{entry['session_special']}{base_key}"
-                    _store_entry(special_key, entry, prefer_non_special=False)
-        master_index[state_name] = state_index
-    return master_index
+    return {state_name: build_state_index(df) for state_name, df in all_lists.items()}
 
 def clean_cell_value(value):
     try:
@@ -570,32 +1042,40 @@ def find_master_row(state_index, number_norm):
     direct = state_index.get(number_norm)
     if direct:
         return direct
+    by_base = getattr(state_index, "by_base", None)
+    if by_base is None:
+        by_base = index_by_base(list(state_index.items()))
     base = strip_session_prefix(number_norm)
+    same_base = by_base.get(base, {})
     special_number = special_prefix_number(number_norm)
     if special_number is not None:
-        special_key = f"X{special_number}{base}"
-        special_candidate = state_index.get(special_key)
+        special_candidate = state_index.get(f"X{special_number}{base}")
         if special_candidate:
             return special_candidate
-        for key, entry in state_index.items():
-            if strip_session_prefix(key) == base and int(entry.get("session_special") or 0) == special_number:
-                return entry
+        if special_number in same_base:
+            return same_base[special_number]
     candidate = state_index.get(base)
     if candidate and not candidate.get("session_special"):
         return candidate
-    for key, entry in state_index.items():
-        if strip_session_prefix(key) == base and not entry.get("session_special"):
-            return entry
-    for key, entry in state_index.items():
-        if strip_session_prefix(key) == base:
-            return entry
+    if 0 in same_base:
+        return same_base[0]
+    if same_base:
+        return next(iter(same_base.values()))
     return candidate
 
-def get_meaningful_changes(row_updates, prev_row):
+def get_meaningful_changes(row_updates, prev_row, new_history=None):
+    """
+    Tracked fields whose written value differs from the previous snapshot. When new_history
+    is given, a History change lists only those new events, and is left out if there are none.
+    """
     changes = []
     for field in TRACKED_FIELDS:
         if field not in row_updates:
             continue
+        if field == "History" and new_history is not None:
+            if new_history:
+                changes.append({"field": field, "old": "", "new": new_history})
+            continue
         new_value = normalize_for_compare(row_updates.get(field))
         old_value = ""
         if prev_row is not None:
@@ -684,28 +1164,346 @@ def dispatch_change_queue(base_url=None):
     except Exception:
         logger.exception("Unable to refresh RSS feed after dispatch")
 
-def update_worksheet(year, worksheet, new_title, change_title, session, all_lists, rollover = False, rollover_lists = None):
-    global world_report, history_report, dev_report, new_report, new_report_updates, history_report_updates, dev_report_updates
+# every column the diff can write, in the order the old per-row loop queued them
+DIFF_COLUMNS = ["Youth State Risk", "Adult State Risk", "Sponsors", "Calendar", "History", "Bill ID", "PDF", "Number", "Status", "Date", "Summary", "Change Hash", "URL"]
+
+def _sheet_column(gsheet, column, default=""):
+    if column in gsheet.columns:
+        return gsheet[column].astype(object)
+    return pd.Series(default, index=gsheet.index, dtype=object)
+
+def _falsy(values):
+    return values.map(lambda value: value is pd.NA or not value).astype(bool)
+
+def _object_array(items):
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+class CellTargets:
+    """The value each diff column should hold, for the rows that have one."""
+
+    def __init__(self, length):
+        self.values = {column: np.full(length, None, dtype=object) for column in DIFF_COLUMNS}
+        self.proposed = {column: np.zeros(length, dtype=bool) for column in DIFF_COLUMNS}
+
+    def set(self, column, positions, values):
+        self.values[column][positions] = values if isinstance(values, str) else _object_array(list(values))
+        self.proposed[column][positions] = True
+
+def shown_history_events(events, current_history):
+    """
+    How many of a bill's history events the sheet's History cell already shows, found by
+    matching the cell against the rendered events. A truncated or unrecognised cell counts
+    as showing every event, so nothing old is reported as new.
+    """
+    shown = str(current_history or "")
+    if shown.endswith(HISTORY_SUFFIX):
+        shown = shown[:-len(HISTORY_SUFFIX)]
+    if shown.strip() in ("", "Unknown"):
+        return 0
+    if len(shown) >= HISTORY_MAX_CHARS:
+        return len(events)
+    length = 0
+    for count, event in enumerate(events, start=1):
+        length += len(format_history_event(event)) + (2 if count > 1 else 0)
+        if length == len(shown):
+            return count if format_history_events(events[:count]) == shown else len(events)
+        if length > len(shown):
+            break
+    return len(events)
+
+def new_history_events(bill_id, change_hash, current_history, details_for, cursor_updates):
+    """
+    History events added since the bill's cursor last moved. The cursor move is recorded in
+    cursor_updates for the caller to save once the sheet write succeeds. If the cursor is
+    already at this change_hash, another worksheet or an earlier run has reported these
+    events, and the same events are returned again. A missing cursor is seeded from the
+    sheet's History cell; a history that shrank resets it.
+    """
+    try:
+        cursor = bill_store.get_history_cursor(bill_id)
+    except Exception:
+        logger.exception("History cursor read failed: %s", bill_id)
+        return []
+    bill_details = details_for(bill_id, change_hash)
+    if bill_details is None:
+        return []
+    events = bill_details.get("history") or []
+    if cursor is not None and cursor[2] == change_hash:
+        return events[cursor[0]:cursor[1]]
+    seen = cursor[1] if cursor is not None else shown_history_events(events, current_history)
+    if seen > len(events):
+        logger.info("History for bill %s shrank from %d to %d event(s); resetting its cursor", bill_id, seen, len(events))
+        seen = len(events)
+    cursor_updates[int(bill_id)] = (seen, len(events), change_hash)
+    return events[seen:]
+
+def save_history_cursors(cursor_updates):
+    try:
+        with bill_store.batch():
+            for bill_id, (previous_seen, seen, change_hash) in cursor_updates.items():
+                bill_store.set_history_cursor(bill_id, previous_seen, seen, change_hash)
+    except Exception:
+        logger.exception("History cursor write failed")
+
+def resolve_row_details(state, display, bill_type, lscan_row, is_new, hash_changed, missing_details, current_history, details_for, report, history_cursors=None):
+    """
+    Fill blank master-list fields from getBill, then work out the detail columns (sponsors,
+    calendar, history, bill id, PDF) for one bill that is new, changed or missing details.
+    History cursor moves go into history_cursors, to be saved after the sheet write.
+    Returns (updates, new_history, title, last_action, last_action_date, link), where
+    new_history is the rendered history events new since the bill's cursor (None unless the
+    change_hash moved), or None when the bill's details are unavailable and the row should
+    be left alone this run.
+    """
+    r_title = lscan_row["title"]
+    r_la = lscan_row["last_action"]
+    r_link = lscan_row["url"]
+    last_action_date = lscan_row["last_action_date"]
+    bill_id = lscan_row["bill_id"]
+    change_hash = lscan_row["change_hash"]
+    updates = {}
+    new_history = None
+    bill_details = None
+    if (not r_title) or (not r_la) or (not last_action_date) or (not r_link):
+        bill_details = details_for(bill_id, change_hash)
+        if bill_details is None:
+            logger.error("Bill details unavailable for %s %s", state, display.strip())
+            return None
+        if not r_title:
+            r_title = bill_details.get("title") or r_title
+        if not r_la:
+            # a master row patched from getMasterListRaw keeps its old date but not its action
+            r_la = bill_details.get("last_action") or r_la
+            last_action_date = bill_details.get("last_action_date") or last_action_date
+        if not last_action_date:
+            last_action_date = bill_details.get("last_action_date") or bill_details.get("status_date")
+        if not r_link:
+            r_link = bill_details.get("url") or r_link
+    if is_new or hash_changed or missing_details:
+        if is_new:
+            logger.info("New bill detected: %s %s", state, display.strip())
+            report.new_rows.append(f"""
+                                                    <tr>
+                                                        <th>{state}</th>
+                                                        <th>{display.strip()}</th>
+                                                        <th>{r_title}</th>
+                                                        <th>{bill_type}</th>
+                                                    </tr>
+                                                    """)
+        elif hash_changed:
+            logger.info("Bill change found: %s %s", state, display.strip())
+        else:
+            logger.debug("Backfilling missing details for %s %s", state, display.strip())
+        fields = cached_detail_fields(bill_id, change_hash)
+        if fields is not None:
+            _inc_stat("detail_field_hits")
+        else:
+            if bill_details is None:
+                bill_details = details_for(bill_id, change_hash)
+            if bill_details is None:
+                return None
+            fields = detail_fields(bill_id, change_hash, bill_details)
+        history_value = fields["History"]
+        updates["Sponsors"] = fields["Sponsors"]
+        updates["Calendar"] = fields["Calendar"]
+        if not is_new and hash_changed:
+            new_history = format_history_events(new_history_events(
+                bill_id, change_hash, current_history, details_for, {} if history_cursors is None else history_cursors
+            ))
+        if new_history:
+            _inc_stat("history_updates")
+            report.history_rows.append(f"""
+                            <tr>
+                                <th>{state}</th>
+                                <th>{display.strip()}</th>
+                                <th>{new_history}</th>
+                            </tr>
+                            """)
+        updates["History"] = history_value
+        updates["Bill ID"] = str(bill_id)
+        updates["PDF"] = fields["PDF"]
+
+    return updates, new_history, r_title, r_la, last_action_date, r_link
+
+def diff_worksheet(gsheet, worksheet, year, master_index, all_lists, prev_lookup, details_for, report, history_cursors=None):
+    """
+    Compare every sheet row with its master-list entry column by column and return
+    (cell_updates, queued_changes, missing_states), where cell_updates lists only the cells
+    whose value changes as (sheet row, column, value). Rows are matched to the master index
+    and the previous snapshot up front; per-row work is left to bills needing getBill details.
+    History cursor moves are collected in history_cursors for the caller to save after writing.
+    """
+    # gsheet may be a subset of the worksheet; its index still gives each row's place in the sheet
+    sheet_numbers = (gsheet.index.to_numpy() + 2).astype(int)
+    positions = pd.RangeIndex(len(gsheet))
+    sheet = gsheet.reset_index(drop=True)
+    states = _sheet_column(sheet, "State").astype(str).str.strip()
+    raw_numbers = _sheet_column(sheet, "Number")
+    displays = display_bill_numbers(raw_numbers)
+    numbers = displays.str.replace(r"[^A-Za-z0-9]", "", regex=True).str.upper()
+    bill_types = _sheet_column(sheet, "Bill Type")
+    targets = CellTargets(len(sheet))
+    sheet_rows = pd.Index(sheet_numbers).astype(str)
+    targets.set("Youth State Risk", positions, "=VLOOKUP(A" + sheet_rows + ",'Risk Levels'!$A$4:$E$55,2)")
+    targets.set("Adult State Risk", positions, "=VLOOKUP(A" + sheet_rows + ",'Risk Levels'!$A$4:$E$55,3)")
+
+    # rows of states without a session list are skipped; states whose lists are empty only get the risk formulas
+    list_status = {state: ("missing" if all_lists.get(state) is None else "empty" if all_lists[state].empty else "listed") for state in states.unique()}
+    status = states.map(list_status)
+    missing_states = set(states[status == "missing"])
+    dropped = status == "missing"
+
+    state_values = states.tolist()
+    number_values = numbers.tolist()
+    display_values = displays.tolist()
+    bill_type_values = bill_types.tolist()
+    listed = positions[(status == "listed").to_numpy()]
+    entries = {pos: find_master_row(master_index.get(state_values[pos], {}), number_values[pos]) for pos in listed}
+    dropped.iloc[[pos for pos, entry in entries.items() if entry is None]] = True
+    matched = [pos for pos, entry in entries.items() if entry is not None]
+    if not matched:
+        return _emit_cell_updates(sheet, targets, dropped, sheet_numbers), [], missing_states
+
+    field_names = ["title", "last_action", "last_action_date", "url"]
+    lscan = pd.DataFrame.from_records([entries[pos] for pos in matched], index=matched, columns=["change_hash", "bill_id"] + field_names).astype(object)
+    sheet_id_values = _sheet_column(sheet, "Bill ID").tolist()
+    prev_rows = [find_previous_row(prev_lookup, state_values[pos], number_values[pos], sheet_id_values[pos]) for pos in matched]
+    sheet_hashes = _sheet_column(sheet, "Change Hash").iloc[matched].to_numpy()
+    is_new = np.array([prev_row is None for prev_row in prev_rows]) | (sheet_hashes == "")
+    hash_changed = ~is_new & (lscan["change_hash"].to_numpy() != sheet_hashes)
+    missing_details = ~is_new & ~hash_changed & missing_details_mask(sheet).iloc[matched].to_numpy()
+    blank_fields = np.logical_or.reduce([_falsy(lscan[name]).to_numpy() for name in field_names])
+    needs_details = is_new | hash_changed | missing_details | blank_fields
+
+    # title, last action, date and link per matched row; rows needing getBill may fill or drop them
+    fields = lscan[field_names].to_numpy()
+    has_fields = np.ones(len(matched), dtype=bool)
+    history_values = _sheet_column(sheet, "History").tolist()
+    new_histories = {}
+    for i in np.flatnonzero(needs_details):
+        pos = matched[i]
+        try:
+            resolved = resolve_row_details(
+                state_values[pos], display_values[pos], bill_type_values[pos], entries[pos],
+                bool(is_new[i]), bool(hash_changed[i]), bool(missing_details[i]),
+                history_values[pos], details_for, report, history_cursors,
+            )
+        except Exception as e:
+            logger.exception("Row processing error: %s", e)
+            report.errors.append(str(e.args[0]))
+            # like the old loop, a failed row still gets the cells queued before the error
+            has_fields[i] = False
+            continue
+        if resolved is None:
+            dropped.iat[pos] = True
+            has_fields[i] = False
+            continue
+        updates, new_histories[pos], *row_fields = resolved
+        fields[i] = _object_array(row_fields)
+        for column, value in updates.items():
+            targets.set(column, [pos], [value])
+
+    ok = [pos for pos, keep in zip(matched, has_fields) if keep]
+    fields = pd.DataFrame(fields[has_fields], index=ok, columns=field_names)
+    links = fields["url"].astype(str)
+    link_present = ~_falsy(fields["url"])
+    dates = fields["last_action_date"]
+    no_date = dates.map(lambda value: value is None or (isinstance(value, str) and value == "")).astype(bool)
+    targets.set("Number", ok, "=HYPERLINK(\"" + links + "\",\"" + displays.iloc[ok] + "\")")
+    targets.set("Status", ok, fields["last_action"])
+    targets.set("Date", ok, dates.where(~no_date, "Unknown"))
+    targets.set("Summary", ok, fields["title"])
+    targets.set("Change Hash", ok, lscan.loc[ok, "change_hash"])
+    targets.set("URL", ok, ("=HYPERLINK(\"" + links + "\",\"" + links + "\")").where(link_present, "Unknown"))
+
+    cell_updates = _emit_cell_updates(sheet, targets, dropped, sheet_numbers)
+
+    # change entries only for matched rows that got a tracked field written
+    position_of = {int(row_num): pos for pos, row_num in enumerate(sheet_numbers)}
+    row_updates = {}
+    for row_num, column, value in cell_updates:
+        row_updates.setdefault(position_of[row_num], {})[column] = value
+    matched_at = {pos: i for i, pos in enumerate(matched)}
+    queued_changes = []
+    for pos, (title, last_action, _, link) in zip(ok, fields.itertuples(index=False)):
+        updates = row_updates.get(pos)
+        if not updates or not any(field in updates for field in TRACKED_FIELDS):
+            continue
+        i = matched_at[pos]
+        meaningful_changes = get_meaningful_changes(updates, prev_rows[i], new_histories.get(pos))
+        if not meaningful_changes:
+            continue
+        change_kind = "new" if is_new[i] else "update"
+        _inc_stat("new_bills" if change_kind == "new" else "changed_bills")
+        queued_changes.append(build_change_entry(
+            change_kind,
+            worksheet,
+            year,
+            state_values[pos],
+            display_values[pos].strip(),
+            title,
+            last_action,
+            bill_type_values[pos],
+            link,
+            meaningful_changes,
+        ))
+    return cell_updates, queued_changes, missing_states
+
+def _emit_cell_updates(sheet, targets, dropped, sheet_numbers):
+    """Compare target values with the sheet and list the changed cells in row, then column order."""
+    changed = []
+    keep = ~dropped.to_numpy()
+    for order, column in enumerate(DIFF_COLUMNS):
+        proposed = keep & targets.proposed[column]
+        if not proposed.any():
+            continue
+        values = _object_array([clean_cell_value(value) for value in targets.values[column][proposed]])
+        # queue_update's view of the current cell: blanks and "Unknown" both count as empty
+        current = _sheet_column(sheet, column)[proposed]
+        current = current.where(current.notna(), "")
+        unknown = current.map(lambda value: isinstance(value, str) and value.strip().lower() == "unknown").astype(bool)
+        current = current.where(~unknown, "").to_numpy()
+        differs = current != values
+        for pos, value in zip(np.flatnonzero(proposed)[differs], values[differs]):
+            changed.append((int(pos), order, column, value))
+    changed.sort(key=lambda cell: (cell[0], cell[1]))
+    return [(int(sheet_numbers[pos]), column, value) for pos, _, column, value in changed]
+
+def update_worksheet(year, worksheet, new_title, change_title, session, all_lists, rollover = False, rollover_lists = None, master_index = None, sheet_data = None, writer = None, report = None):
+    """
+    Diff one worksheet against LegiScan and queue its cell writes on `writer`.
+    With a writer, returns a function that finishes the worksheet (change queue, formatting,
+    snapshot, success flag) once the caller has flushed the writes, or None if nothing is left
+    to do. Without one, the writes are flushed and the worksheet finished right away.
+    Report rows go to `report`, or straight into run_report when none is given.
+    """
+    if report is None:
+        report = run_report
     logger.info("Starting worksheet update: %s %s", year, worksheet)
     mark_run_failed(worksheet, year)
     if rollover and rollover_lists is not None:
         all_lists = rollover_lists
-    if rollover:
-        all_lists = rollover_lists or get_main_lists(year-1, session)
-    master_index = build_master_index(all_lists)
-
-    #open google sheets api account
-    gc = gspread.service_account_from_dict(load_service_account_credentials())
-
-    #open worksheet
-    wks = gc.open_by_key(get_sheet_key(year)).worksheet(worksheet)
-    expected_headers = wks.row_values(1)
-    header_to_col = {name: idx + 1 for idx, name in enumerate(expected_headers)}
+    # lists and index handed in by main() are used as they are, even when empty; only a
+    # worksheet updated on its own loads the rollover lists itself
+    if master_index is None:
+        if rollover and not rollover_lists:
+            all_lists = get_main_lists(year-1, session)
+        master_index = build_master_index(all_lists)
+
+    #open worksheet through the shared sheets client
+    wks = sheets.open_worksheet(year, worksheet)
+    if sheet_data is None:
+        sheet_data = sheets.read_worksheets(year, [worksheet]).get(worksheet, ([], pd.DataFrame()))
 
     #loads worksheet into dataframe
+    expected_headers, gsheet_raw = sheet_data
+    header_to_col = {name: idx + 1 for idx, name in enumerate(expected_headers)}
     logger.debug("Worksheet headers: %s", expected_headers)
-    gsheet_raw = pd.DataFrame(wks.get_all_records(expected_headers=expected_headers))
     gsheet = fill_missing(gsheet_raw, "")
+    sheet_as_read = gsheet.copy()
+    report.bill_ids.update(sheet_bill_ids(gsheet))
 
     #gets previous sheet from file
     if os.path.exists(os.path.join(CACHE_DIR, f"gsheet-{worksheet}-{year}.csv")):
@@ -718,259 +1516,226 @@ def update_worksheet(year, worksheet, new_title, change_title, session, all_list
     else:
         prev_gsheet = gsheet.copy()
 
-    digest = worksheet_legiscan_digest(gsheet, master_index)
-    previous_digest = load_worksheet_digest(worksheet, year)
-    previous_success = was_last_run_successful(worksheet, year)
-    if digest and previous_success and previous_digest == digest and not sheet_has_missing_details(gsheet):
+    # after a failed run nothing recorded can be trusted, so every row is diffed
+    row_state = load_row_state(worksheet, year) if was_last_run_successful(worksheet, year) else {}
+    dirty = dirty_row_mask(gsheet, row_state, master_index)
+    if not dirty.any():
         logger.info("No LegiScan changes detected; skipping worksheet update")
         mark_run_success(worksheet, year)
-        return
-
-    sheet_changed = False
-    missing_states = set()
-    cell_updates = []
-    queued_changes = []
-    for index, row in gsheet.iterrows():
-        try:
-            row_updates = {}
-            r_state = row["State"].strip()
-            r_bnum_raw = row["Number"]
-            r_bnum_display = extract_display_number(r_bnum_raw)
-            r_bnum_norm = normalize_bill_number(r_bnum_display)
-            r_btype = row["Bill Type"]
-            change_kind = None
-            prev_row_series = None
-            lscan_row = None
-            queue_update(row_updates, row, 'Youth State Risk', f"=VLOOKUP(A{index+2},'Risk Levels'!$A$4:$E$55,2)")
-            queue_update(row_updates, row, 'Adult State Risk', f"=VLOOKUP(A{index+2},'Risk Levels'!$A$4:$E$55,3)")
-            state_list = all_lists.get(r_state)
-            if state_list is None:
-                missing_states.add(r_state)
-                continue
-            if not state_list.empty:
-                lscan_row = master_index.get(r_state, {}).get(r_bnum_norm)
-                if lscan_row is None:
-                    lscan_row = find_master_row(master_index.get(r_state, {}), r_bnum_norm)
-                if lscan_row is None:
-                    continue
+        return None
+    logger.info("Diffing %d of %d row(s) in %s %s", int(dirty.sum()), len(gsheet), year, worksheet)
+    gsheet = gsheet[dirty]
+
+    prev_lookup = build_previous_lookup(prev_gsheet)
+    # bills whose rendered fields are cached only need a payload when the master list has blanks
+    detail_requests = [
+        (bill_id, change_hash)
+        for bill_id, change_hash in collect_detail_requests(gsheet, master_index, all_lists, prev_lookup)
+        if cached_detail_fields(bill_id, change_hash) is None
+    ]
+    worksheet_bills = prefetch_bill_details(detail_requests, session)
 
-                r_la = lscan_row["last_action"]
-                r_title = lscan_row["title"]
-                r_link = lscan_row["url"]
-                bill_id = lscan_row["bill_id"]
-                change_hash = lscan_row["change_hash"]
-                last_action_date = lscan_row["last_action_date"]
-                prev = prev_gsheet.loc[(prev_gsheet["State"] == row["State"]) & (prev_gsheet["Number"] == row["Number"])]
-                prev_row_series = prev.iloc[0] if not prev.empty else None
-                bill_details = None
-
-                #checks if the bill is recently added. If not then alert new bill
-                if prev.empty or gsheet.at[index, 'Change Hash'] == "":
-                    logger.info("New bill detected: %s %s", r_state, r_bnum_display.strip())
-                    change_kind = "new"
-                    new_report_updates += 1
-                    new_report = new_report + f"""
-                                                    <tr>
-                                                        <th>{r_state}</th>
-                                                        <th>{r_bnum_display.strip()}</th>
-                                                        <th>{r_title}</th>
-                                                        <th>{r_btype}</th>
-                                                    </tr>
-                                                    """
-
-                    content = get_bill_details(bill_id, change_hash, session)
-                    if content is None:
-                        continue
-                    bill_details = content
-
-                    sponsors_value = get_sponsors(content["sponsors"])
-                    calendar_value = get_calendar(content["calendar"])
-                    history_value = get_history(content["history"])
-                    texts_value = get_texts(content["texts"])
-                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
-                    queue_update(row_updates, row, 'Calendar', calendar_value)
-                    queue_update(row_updates, row, 'History', history_value)
-                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
-                    queue_update(row_updates, row, 'PDF', texts_value)
-
-
-                #if not new check change hash to see if the bill has changed. If it has trigger an alert
-                elif lscan_row["change_hash"] != row["Change Hash"]:
-                    logger.info("Bill change found: %s %s", r_state, r_bnum_display.strip())
-                    change_kind = "update"
-                    content = get_bill_details(bill_id, change_hash, session)
-                    if content is None:
-                        continue
-                    bill_details = content
-
-                    sponsors_value = get_sponsors(content["sponsors"])
-                    calendar_value = get_calendar(content["calendar"])
-                    history_value = get_history(content["history"])
-                    texts_value = get_texts(content["texts"])
-                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
-                    queue_update(row_updates, row, 'Calendar', calendar_value)
-                    if history_value != gsheet.at[index, 'History']:
-                        history_report_updates += 1
-                        _inc_stat("history_updates")
-                        history_report = history_report + f"""
-                            <tr>
-                                <th>{r_state}</th>
-                                <th>{r_bnum_display.strip()}</th>
-                                <th>{history_value.replace(gsheet.at[index, 'History'], "")}</th>
-                            </tr>
-                            """
-                    queue_update(row_updates, row, 'History', history_value)
-                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
-                    queue_update(row_updates, row, 'PDF', texts_value)
-                elif row_missing_details(row):
-                    logger.debug("Backfilling missing details for %s %s", r_state, r_bnum_display.strip())
-                    content = get_bill_details(bill_id, change_hash, session)
-                    if content is None:
-                        continue
-                    bill_details = content
-                    sponsors_value = get_sponsors(content["sponsors"])
-                    calendar_value = get_calendar(content["calendar"])
-                    history_value = get_history(content["history"])
-                    texts_value = get_texts(content["texts"])
-                    queue_update(row_updates, row, 'Sponsors', sponsors_value)
-                    queue_update(row_updates, row, 'Calendar', calendar_value)
-                    queue_update(row_updates, row, 'History', history_value)
-                    queue_update(row_updates, row, 'Bill ID', str(bill_id))
-                    queue_update(row_updates, row, 'PDF', texts_value)
-                    change_kind = change_kind or "update"
-
-                if (not r_title) or (not r_la) or (not last_action_date) or (not r_link):
-                    if bill_details is None:
-                        bill_details = get_bill_details(bill_id, change_hash, session)
-                    if bill_details is None:
-                        logger.error("Bill details unavailable for %s %s", r_state, r_bnum_display.strip())
-                        continue
-                    if not r_title:
-                        r_title = bill_details.get("title") or r_title
-                    if not r_la:
-                        r_la = bill_details.get("last_action") or r_la
-                    if not last_action_date:
-                        last_action_date = bill_details.get("last_action_date") or bill_details.get("status_date")
-                    if not r_link:
-                        r_link = bill_details.get("url") or r_link
-
-                hyperlink = f"=HYPERLINK(\"{r_link}\",\"{r_bnum_display}\")"
-                queue_update(row_updates, row, 'Number', hyperlink)
-                queue_update(row_updates, row, 'Status', r_la)
-                if last_action_date != None and last_action_date != '':
-                    queue_update(row_updates, row, 'Date', last_action_date)
-                else:
-                    queue_update(row_updates, row, 'Date', "Unknown")
-                queue_update(row_updates, row, 'Summary', r_title)
-                queue_update(row_updates, row, 'Change Hash', lscan_row["change_hash"])
-                if r_link:
-                    queue_update(row_updates, row, 'URL', f"=HYPERLINK(\"{r_link}\",\"{r_link}\")")
-                else:
-                    queue_update(row_updates, row, 'URL', "Unknown")
+    def bill_details_for(bill_id, change_hash):
+        return worksheet_bills.get(int(bill_id)) or get_bill_details(bill_id, change_hash, session)
 
-        except Exception as e:
-            logger.exception("Row processing error: %s", e)
-            dev_report_updates += 1
-            dev_report = dev_report + "\n" + str(e.args[0])
-        if row_updates:
-            prev_row_data = prev_row_series.to_dict() if prev_row_series is not None else None
-            meaningful_changes = get_meaningful_changes(row_updates, prev_row_data)
-            if lscan_row is not None and meaningful_changes:
-                change_kind_for_entry = change_kind or ("new" if prev_row_data is None else "update")
-                if change_kind_for_entry == "new":
-                    _inc_stat("new_bills")
-                else:
-                    _inc_stat("changed_bills")
-                change_entry = build_change_entry(
-                    change_kind_for_entry,
-                    worksheet,
-                    year,
-                    r_state,
-                    r_bnum_display.strip(),
-                    r_title,
-                    r_la,
-                    r_btype,
-                    r_link,
-                    meaningful_changes,
-                )
-                queued_changes.append(change_entry)
-            gsheet.loc[index, list(row_updates.keys())] = list(row_updates.values())
-            sheet_changed = True
-            for col_name, value in row_updates.items():
-                cell_updates.append((index + 2, col_name, value))
+    history_cursors = {}
+    cell_updates, queued_changes, missing_states = diff_worksheet(
+        gsheet, worksheet, year, master_index, all_lists, prev_lookup, bill_details_for, report, history_cursors
+    )
+    sheet_changed = bool(cell_updates)
     if missing_states:
         logger.warning("Missing state sessions for: %s", ", ".join(sorted(missing_states)))
-    gsheet = fill_missing(gsheet, "Unknown")
 
-    #updates the entire google sheet from data frame
+    #queues the changed cells; the writer merges them into ranges across worksheets
     if sheet_changed:
-        logger.info("Updating worksheet data for %s %s (%d cells)", year, worksheet, len(cell_updates))
-        batch_data = []
-        for row_num, col_name, value in cell_updates:
-            col_idx = header_to_col.get(col_name)
-            if col_idx is None:
-                continue
-            cell_ref = rowcol_to_a1(row_num, col_idx)
-            safe_value = clean_cell_value(value)
-            batch_data.append({"range": cell_ref, "values": [[safe_value]]})
-        if batch_data:
-            wks.batch_update(batch_data, value_input_option='USER_ENTERED')
-    if queued_changes:
-        added = append_changes(queued_changes)
-        logger.info("Queued %d change(s) for %s %s", added, worksheet, year)
+        logger.info("Queuing worksheet data for %s %s (%d cells)", year, worksheet, len(cell_updates))
+    flush_now = writer is None
+    if flush_now:
+        writer = sheets.SheetWriter(year)
+    for row_num, col_name, value in cell_updates:
+        col_idx = header_to_col.get(col_name)
+        if col_idx is None:
+            continue
+        writer.add(worksheet, row_num, col_idx, clean_cell_value(value))
+
+    def finalize():
+        # only now are the new history events on the sheet; a failed write leaves them to report next run
+        save_history_cursors(history_cursors)
+        if queued_changes:
+            added = append_changes(queued_changes)
+            logger.info("Queued %d change(s) for %s %s", added, worksheet, year)
+            try:
+                write_rss_feed(load_queue())
+            except Exception:
+                logger.exception("Unable to refresh RSS feed after queuing changes")
+
+        #formats google sheet when headers change or first run
+        if should_format_sheet(worksheet, year, expected_headers):
+            logger.info("Formatting worksheet: %s", worksheet)
+            wks.format("A2:K400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend"}})
+            wks.format("G2:G400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "horizontalAlignment": "CENTER"})
+            wks.format("E2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "DATE"}, "horizontalAlignment": "CENTER"})
+            wks.format("B2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
+            wks.format("J2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
+            wks.format("Q2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
+            mark_sheet_formatted(worksheet, year, expected_headers)
+
+        #saves the sheet as the previous sheet for next run, built from what we just wrote;
+        #every SNAPSHOT_VERIFY_RUNS runs it is re-read instead to pick up manual edits
+        snapshot = apply_cell_updates(sheet_as_read, cell_updates)
+        verify = snapshot_verification_due(worksheet, year)
+        if verify:
+            _, remote = sheets.read_worksheets(year, [worksheet]).get(worksheet, ([], pd.DataFrame()))
+            remote = fill_missing(remote, "")
+            drift = snapshot_drift(snapshot, remote)
+            if drift:
+                logger.warning("Local snapshot of %s %s drifted from the sheet in %d cell(s)", worksheet, year, drift)
+            elif drift is None:
+                logger.warning("Local snapshot of %s %s no longer matches the sheet's shape", worksheet, year)
+            snapshot = remote
+        snapshot.to_csv(os.path.join(CACHE_DIR, f"gsheet-{worksheet}-{year}.csv"))
+        record_snapshot_run(worksheet, year, verify)
+        save_row_state(worksheet, year, build_row_state(snapshot))
+        mark_run_success(worksheet, year)
+
+    if flush_now:
+        writer.flush()
+        finalize()
+        return None
+    return finalize
+
+WORKSHEET_TASKS = [
+    ("Anti-LGBTQ Bills", "🚨ALERT NEW BILL 🚨", "🏛 Status Change 🏛", False),
+    ("Pro-LGBTQ Bills", "🌈NEW GOOD BILL 🏳️‍", "🌈Status Change 🏛", False),
+    ("Rollover Anti-LGBTQ Bills", "🚨ALERT ROLLOVER BILL 🚨", "🏛 Status Change 🏛", True),
+    ("Rollover Pro-LGBTQ Bills", "🌈ROLLOVER GOOD BILL 🏳️", "🏛 Status Change 🏛", True),
+]
+
+def run_worksheet_tasks(tasks, max_workers=WORKSHEET_MAX_WORKERS):
+    """
+    Run update_worksheet for each kwargs dict in tasks, at most max_workers at a time.
+    Returns (report, finalize, error) per task in task order; a failed task has no finalize
+    and its exception as error, and does not stop the others.
+    """
+    def run(task):
+        report = WorksheetReport()
         try:
-            write_rss_feed(load_queue())
-        except Exception:
-            logger.exception("Unable to refresh RSS feed after queuing changes")
-    if digest:
-        save_worksheet_digest(worksheet, year, digest)
-
-    #formats google sheet when headers change or first run
-    if should_format_sheet(worksheet, year, expected_headers):
-        logger.info("Formatting worksheet: %s", worksheet)
-        wks.format("A2:K400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend"}})
-        wks.format("G2:G400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "horizontalAlignment": "CENTER"})
-        wks.format("E2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "DATE"}, "horizontalAlignment": "CENTER"})
-        wks.format("B2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
-        wks.format("J2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
-        wks.format("Q2:E400", {'textFormat': {"fontSize": 12, "fontFamily": "Lexend", }, "numberFormat": {"type": "TEXT"}, "horizontalAlignment": "CENTER"})
-        mark_sheet_formatted(worksheet, year, expected_headers)
-
-
-    #does one more pull of the updated sheet then saves it as the previous sheet for next run
-    expected_headers = wks.row_values(1)
-    gsheet = fill_missing(pd.DataFrame(wks.get_all_records(expected_headers=expected_headers)), "")
-    gsheet.to_csv(os.path.join(CACHE_DIR, f"gsheet-{worksheet}-{year}.csv"))
-    mark_run_success(worksheet, year)
+            return report, update_worksheet(report=report, **task), None
+        except Exception as e:
+            logger.exception("Worksheet update failed: %s %s", task["year"], task["worksheet"])
+            return report, None, e
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [run(task) for task in tasks]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run, task) for task in tasks]
+    return [future.result() for future in futures]
+
+def finish_year(year, writer, year_results):
+    """
+    Flush one year's writes and finalize its worksheets. Returns the exceptions of the tasks
+    that failed, including every task of the year when the flush itself fails.
+    """
+    failures = [error for _, _, error in year_results if error is not None]
+    try:
+        writer.flush()
+    except Exception as e:
+        logger.exception("Unable to write %s worksheet updates", year)
+        return failures + [e]
+    for report, finalize, error in year_results:
+        if error is not None:
+            continue
+        if finalize is not None:
+            try:
+                finalize()
+            except Exception as e:
+                logger.exception("Unable to finish a %s worksheet update", year)
+                failures.append(e)
+                continue
+        run_report.merge(report)
+    return failures
 
 def main():
+    global run_report
     _set_stat("last_run_started", time.time())
     _set_stat("last_run_status", "running")
-    for key in ["legiscan_calls", "bill_cache_hits", "bill_cache_misses", "new_bills", "changed_bills", "history_updates"]:
+    _set_stat("polling_plan", {})
+    for key in ["legiscan_calls", "bill_cache_hits", "bill_cache_misses", "dataset_bills_ingested", "master_lists_fetched", "master_lists_reused", "master_lists_patched", "new_bills", "changed_bills", "history_updates", "detail_field_hits"]:
         _set_stat(key, 0)
     start_time = time.monotonic()
     session = requests.Session()
+    tracked_bill_ids.clear()
+    run_report = WorksheetReport()
+    sheets.reset_handles()
     try:
+        bill_store.migrate_directory(BILL_CACHE_DIR)
+    except Exception:
+        logger.exception("Unable to migrate legacy bill cache from %s", BILL_CACHE_DIR)
+    try:
+        # master lists are loaded one year at a time since they share the polling and catalog
+        # state; the worksheet updates of every year then run together in the worksheet pool
+        tasks = []
+        writers = {}
+        # every tracker worksheet's header and rows in one batchGet per year, read before the
+        # master lists so their refresh knows which moved bills are worth a getBill
+        tracker_sheets = {year: sheets.read_worksheets(year) for year in years}
+        for year_sheets in tracker_sheets.values():
+            for _, frame in year_sheets.values():
+                tracked_bill_ids.update(sheet_bill_ids(frame))
         for year in years:
+            ingest_bill_datasets(year, session)
+            ingest_bill_datasets(year - 1, session)
             all_lists = get_main_lists(year, session)
             rollover_lists = get_main_lists(year - 1, session)
-            update_worksheet(year, "Anti-LGBTQ Bills", "🚨ALERT NEW BILL 🚨", "🏛 Status Change 🏛", session, all_lists)
-            update_worksheet(year, "Pro-LGBTQ Bills", "🌈NEW GOOD BILL 🏳️‍", "🌈Status Change 🏛", session, all_lists)
-            update_worksheet(year, "Rollover Anti-LGBTQ Bills", "🚨ALERT ROLLOVER BILL 🚨", "🏛 Status Change 🏛", session, all_lists, rollover=True, rollover_lists=rollover_lists)
-            update_worksheet(year, "Rollover Pro-LGBTQ Bills", "🌈ROLLOVER GOOD BILL 🏳️", "🏛 Status Change 🏛", session, all_lists, rollover=True, rollover_lists=rollover_lists)
+            # one index per set of lists, shared by the worksheets that read it
+            master_index = build_master_index(all_lists)
+            rollover_index = build_master_index(rollover_lists)
+            # their writes go out in one batchUpdate per year
+            writers[year] = sheets.SheetWriter(year)
+            for worksheet, new_title, change_title, rollover in WORKSHEET_TASKS:
+                tasks.append({
+                    "year": year,
+                    "worksheet": worksheet,
+                    "new_title": new_title,
+                    "change_title": change_title,
+                    "session": session,
+                    "all_lists": all_lists,
+                    "rollover": rollover,
+                    "rollover_lists": rollover_lists if rollover else None,
+                    "master_index": rollover_index if rollover else master_index,
+                    "sheet_data": tracker_sheets[year].get(worksheet),
+                    "writer": writers[year],
+                })
+        results = run_worksheet_tasks(tasks)
+        # each year is written and finished on its own, so one failed worksheet or flush
+        # does not throw away the updates of the others
+        failures = []
+        for year, writer in writers.items():
+            year_results = [result for task, result in zip(tasks, results) if task["year"] == year]
+            failures.extend(finish_year(year, writer, year_results))
+        for report, _, _ in results:
+            tracked_bill_ids.update(report.bill_ids)
     except Exception:
         logger.exception("Run failed")
         _set_stat("last_run_status", "error")
         raise
+    # changes queued by the worksheets that did finish still go out
     dispatch_change_queue()
-
-    # if dev_report_updates > 0:
-    #     notify_dev_team("Error occured with latest bot run!", dev_report)
-    # # notify_world("Latest Changes", world_report)
-    # if history_report_updates > 0:
-    #     send_history_report(history_report)
-    # if new_report_updates > 0:
-    #     send_new_report(new_report)
+    if failures:
+        logger.error("%d worksheet update(s) failed this run", len(failures))
+        _set_stat("last_run_status", "error")
+        raise failures[0]
+    try:
+        bill_store.evict(tracked_bill_ids, BILL_STORE_MAX_BILLS)
+    except Exception:
+        logger.exception("Unable to evict untracked bills from %s", BILL_STORE_PATH)
+
+    # if run_report.errors:
+    #     notify_dev_team("Error occured with latest bot run!", run_report.dev_report)
+    # if run_report.history_rows:
+    #     send_history_report(run_report.history_report)
+    # if run_report.new_rows:
+    #     send_new_report(run_report.new_report)
     _set_stat("last_run_finished", time.time())
     _set_stat("last_run_duration_seconds", round(time.monotonic() - start_time, 3))
     if get_stats().get("last_run_status") != "error":
@@ -0,0 +1,79 @@
+import json
+import sqlite3
+
+from utils.bill_store import BillStore
+
+
+def test_bill_store_only_returns_current_change_hash(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    store.put(1, "a", {"bill_id": 1, "title": "t1"})
+    store.put(2, "b", {"bill_id": 2, "title": "t2"})
+    assert store.get(1, "a")["title"] == "t1"
+    assert store.get(1, "stale") is None
+    assert sorted(store.get_many([(1, "a"), (2, "old"), (3, "c")])) == [1]
+
+
+def test_bill_store_evicts_oldest_untracked_bills(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    with store.batch():
+        for bill_id in range(1, 6):
+            store.put(bill_id, "h", {"bill_id": bill_id}, fetched_at=float(bill_id))
+    removed = store.evict(keep_ids=[1], max_rows=3)
+    assert removed == 2
+    assert store.get(1, "h") is not None
+    assert store.get(2, "h") is None and store.get(3, "h") is None
+    assert store.count() == 3
+
+
+def test_bill_store_migrates_json_directory_once(tmp_path):
+    legacy = tmp_path / "bills"
+    legacy.mkdir()
+    (legacy / "7.json").write_text(json.dumps({"change_hash": "x", "bill": {"bill_id": 7}}))
+    store = BillStore(tmp_path / "bills.sqlite3")
+    assert store.migrate_directory(legacy) == 1
+    assert not legacy.exists()
+    assert store.get(7, "x")["bill_id"] == 7
+    legacy.mkdir()
+    (legacy / "8.json").write_text(json.dumps({"change_hash": "y", "bill": {"bill_id": 8}}))
+    assert store.migrate_directory(legacy) == 0
+
+
+def test_bill_store_keeps_compact_projection(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    bill = {
+        "bill_id": 5,
+        "title": "t",
+        "votes": [{"roll_call_id": 1}],
+        "sponsors": [{"name": "Rep. A", "people_id": 9, "party": "R"}],
+        "history": [{"date": "2026-01-02", "action": "Filed", "chamber": "H", "importance": 1}],
+    }
+    store.put(5, "h", bill)
+    cached = store.get(5, "h")
+    assert "votes" not in cached
+    assert cached["sponsors"] == [{"name": "Rep. A"}]
+    assert cached["last_action"] == "Filed"
+    assert cached["last_action_date"] == "2026-01-02"
+
+
+def test_bill_store_projects_legacy_uncompressed_rows(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    store.count()
+    with sqlite3.connect(tmp_path / "bills.sqlite3") as conn:
+        conn.execute(
+            "INSERT INTO bills (bill_id, change_hash, fetched_at, payload, schema_version) VALUES (?, ?, ?, ?, 0)",
+            (6, "h", 1.0, json.dumps({"bill_id": 6, "title": "old", "votes": []})),
+        )
+    assert store.get(6, "h")["title"] == "old"
+    assert "votes" not in store.get_many([(6, "h")])[6]
+
+
+def test_bill_store_derived_fields_follow_change_hash(tmp_path):
+    store = BillStore(tmp_path / "bills.sqlite3")
+    fields = {"Sponsors": "A, B", "Calendar": "", "History": "H 2026 x", "PDF": "u"}
+    store.put(1, "abc", {"bill_id": 1})
+    store.put_derived(1, "abc", fields)
+    assert store.get_derived(1, "abc") == fields
+    assert store.get_derived(1, "def") is None
+    store.put(2, "x", {"bill_id": 2}, fetched_at=2)
+    store.evict([2], 1)
+    assert store.get_derived(1, "abc") is None
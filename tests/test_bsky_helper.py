@@ -0,0 +1,105 @@
+import base64
+import json
+import time
+
+import httpx
+import pytest
+from atproto import Client
+from atproto_client.request import Request
+
+from utils import bsky_helper
+
+
+def _jwt(subject):
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return ".".join([part({"alg": "none"}), part({"sub": subject, "exp": int(time.time()) + 3600}), "sig"])
+
+
+class FakePds:
+    """Just enough of a PDS: password logins, profile lookups and record creation, with revocable tokens."""
+
+    def __init__(self):
+        self.calls = []
+        self.valid_tokens = set()
+        self.logins = 0
+        self.outage = False
+
+    def handle(self, request):
+        method = request.url.path.rsplit("/", 1)[-1]
+        self.calls.append(method)
+        if self.outage:
+            return httpx.Response(502, json={"error": "BadGateway", "message": "upstream unavailable"})
+        if method == "com.atproto.server.createSession":
+            self.logins += 1
+            access = _jwt(f"login-{self.logins}")
+            self.valid_tokens.add(access)
+            return httpx.Response(200, json={
+                "accessJwt": access, "refreshJwt": _jwt("refresh"), "did": "did:plc:legialerts", "handle": "legialerts.test",
+            })
+        if request.headers.get("authorization", "").removeprefix("Bearer ") not in self.valid_tokens:
+            return httpx.Response(400, json={"error": "ExpiredToken", "message": "Token has expired"})
+        if method == "app.bsky.actor.getProfile":
+            return httpx.Response(200, json={"did": "did:plc:legialerts", "handle": "legialerts.test"})
+        if method == "com.atproto.repo.createRecord":
+            return httpx.Response(200, json={
+                "uri": "at://did:plc:legialerts/app.bsky.feed.post/1",
+                "cid": "bafyreie5737gdxlw5i64vzichcalba3z2v5n6icifvx5xytvske7mr3hpm",
+            })
+        return httpx.Response(404, json={"error": "MethodNotImplemented"})
+
+    def client(self):
+        return Client(request=Request(transport=httpx.MockTransport(self.handle)))
+
+
+def test_posts_reuse_the_saved_session_and_log_in_again_when_it_is_rejected(monkeypatch, tmp_path):
+    monkeypatch.setattr(bsky_helper, "BSKY_POST_MIN_INTERVAL", 0)
+    monkeypatch.setenv("bsky_user", "legialerts.test")
+    monkeypatch.setenv("bsky_pass", "app-password")
+    pds = FakePds()
+    path = str(tmp_path / "bsky-session.txt")
+
+    def post(session, text):
+        session.run(lambda client: bsky_helper.send_skeet(text, client))
+
+    first_run = bsky_helper.BskySession(path, client_factory=pds.client)
+    post(first_run, "first")
+    post(first_run, "second")
+    assert pds.logins == 1
+    assert pds.calls.count("com.atproto.repo.createRecord") == 2
+
+    next_run = bsky_helper.BskySession(path, client_factory=pds.client)
+    post(next_run, "third")
+    assert pds.logins == 1
+    assert pds.calls.count("com.atproto.repo.createRecord") == 3
+
+    # the server drops the token mid-run: the post is retried once after a fresh login
+    pds.valid_tokens.clear()
+    post(next_run, "fourth")
+    assert pds.logins == 2
+    assert pds.calls.count("com.atproto.repo.createRecord") == 5
+    post(next_run, "fifth")
+    assert pds.logins == 2
+    assert pds.calls.count("com.atproto.repo.createRecord") == 6
+
+
+def test_a_failed_resume_only_logs_in_again_when_the_session_is_rejected(monkeypatch, tmp_path):
+    monkeypatch.setenv("bsky_user", "legialerts.test")
+    monkeypatch.setenv("bsky_pass", "app-password")
+    pds = FakePds()
+    path = str(tmp_path / "bsky-session.txt")
+    bsky_helper.BskySession(path, client_factory=pds.client).client()
+    assert pds.logins == 1
+
+    # a server error keeps the saved session and spends no createSession call
+    pds.outage = True
+    with pytest.raises(Exception) as excinfo:
+        bsky_helper.BskySession(path, client_factory=pds.client).client()
+    assert not bsky_helper.is_auth_rejection(excinfo.value)
+    assert pds.calls.count("com.atproto.server.createSession") == 1
+
+    pds.outage = False
+    pds.valid_tokens.clear()
+    bsky_helper.BskySession(path, client_factory=pds.client).client()
+    assert pds.logins == 2
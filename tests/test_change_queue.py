@@ -0,0 +1,110 @@
+import json
+
+from utils import change_queue
+
+
+def _use_tmp_queue(monkeypatch, tmp_path):
+    for name, filename in [
+        ("QUEUE_FILE", "change_queue.json"),
+        ("LOG_FILE", "change_log.jsonl"),
+        ("LEGACY_ARCHIVE_FILE", "change_archive.jsonl"),
+        ("ARCHIVE_DIR", "change_archive"),
+        ("FINGERPRINT_FILE", "change_fingerprints.txt"),
+    ]:
+        monkeypatch.setattr(change_queue, name, str(tmp_path / filename))
+    monkeypatch.setattr(change_queue, "_state", change_queue._LogState())
+
+
+def _change(n, processed_at=None):
+    change = {"id": f"id-{n}", "fingerprint": f"fp-{n}", "created_at": n}
+    if processed_at:
+        change["processed_at"] = processed_at
+    return change
+
+
+def test_legacy_queue_is_migrated_into_log_and_archive(monkeypatch, tmp_path):
+    _use_tmp_queue(monkeypatch, tmp_path)
+    (tmp_path / "change_queue.json").write_text(json.dumps([_change(1, processed_at=5), _change(2)]))
+    assert [c["id"] for c in change_queue.get_pending_changes()] == ["id-2"]
+    assert not (tmp_path / "change_queue.json").exists()
+    assert [c["id"] for c in change_queue.load_queue()] == ["id-2"]
+    assert [c["id"] for c in change_queue.query_archive()] == ["id-1"]
+    assert change_queue.append_changes([_change(2), _change(3)]) == 1
+
+
+def test_log_appends_marks_and_compacts(monkeypatch, tmp_path):
+    _use_tmp_queue(monkeypatch, tmp_path)
+    monkeypatch.setattr(change_queue, "CHANGE_LOG_COMPACT_AFTER", 2)
+    now = change_queue.time.time()
+    recent = [{**_change(n), "created_at": now - 10 + n} for n in (1, 2, 3)]
+    assert change_queue.append_changes([recent[0], recent[1], recent[1]]) == 2
+    change_queue.mark_changes_processed(["id-1"])
+    assert [c["id"] for c in change_queue.get_pending_changes()] == ["id-2"]
+    assert len((tmp_path / "change_log.jsonl").read_text().splitlines()) == 3
+
+    # another writer appending to the log is picked up by a tail read
+    with open(tmp_path / "change_log.jsonl", "a") as handle:
+        handle.write(json.dumps({"op": "add", "change": recent[2]}) + "\n")
+    assert [c["id"] for c in change_queue.get_pending_changes()] == ["id-2", "id-3"]
+
+    # the second marker folds both into their changes; inside the hot window nothing is archived
+    change_queue.mark_changes_processed(["id-2"])
+    records = [json.loads(line) for line in (tmp_path / "change_log.jsonl").read_text().splitlines()]
+    assert [record["op"] for record in records] == ["add", "add", "add"]
+    assert [c["id"] for c in change_queue.load_queue() if c.get("processed_at")] == ["id-1", "id-2"]
+    assert list(change_queue.query_archive()) == []
+
+
+def test_processed_changes_past_the_hot_window_are_archived_without_waiting(monkeypatch, tmp_path):
+    _use_tmp_queue(monkeypatch, tmp_path)
+    monkeypatch.setattr(change_queue, "CHANGE_LOG_COMPACT_AFTER", 500)
+    assert change_queue.append_changes([_change(1), _change(2)]) == 2
+    change_queue.mark_changes_processed(["id-1"])
+    assert len((tmp_path / "change_log.jsonl").read_text().splitlines()) == 1
+    assert [c["id"] for c in change_queue.load_queue()] == ["id-2"]
+    archived = list(change_queue.query_archive())
+    assert [c["id"] for c in archived] == ["id-1"]
+    assert archived[0]["processed_at"]
+    assert list(change_queue.query_archive(since=2)) == []
+
+    # a processed change that ages out while nothing is being marked goes on the next append
+    now = change_queue.time.time()
+    change_queue.append_changes([{**_change(3), "created_at": now}])
+    change_queue.mark_changes_processed(["id-2", "id-3"])
+    assert list(change_queue.query_archive(since=now)) == []
+    monkeypatch.setattr(change_queue, "_hot_cutoff", lambda: now + 1)
+    change_queue.append_changes([{**_change(4), "created_at": now + 2}])
+    assert [c["id"] for c in change_queue.query_archive(since=3)] == ["id-3"]
+    assert [c["id"] for c in change_queue.load_queue()] == ["id-4"]
+
+
+def test_processed_changes_inside_the_hot_window_stay_live(monkeypatch, tmp_path):
+    _use_tmp_queue(monkeypatch, tmp_path)
+    now = change_queue.time.time()
+    change_queue.save_queue([_change(now - 40 * 86400, processed_at=1), _change(now - 86400, processed_at=1), _change(now)])
+    assert [c["created_at"] for c in change_queue.load_queue()] == [now - 86400, now]
+    assert [c["created_at"] for c in change_queue.query_archive()] == [now - 40 * 86400]
+    assert change_queue.append_changes([_change(now - 86400), _change(now - 40 * 86400)]) == 1
+
+
+def test_filtered_changes_use_the_index_and_version_independently(monkeypatch, tmp_path):
+    _use_tmp_queue(monkeypatch, tmp_path)
+    changes = [
+        {**_change(1), "state": "Texas", "worksheet": "Anti-LGBTQ Bills", "change_type": "new"},
+        {**_change(2), "state": "Ohio", "worksheet": "Rollover Anti-LGBTQ Bills", "change_type": "update"},
+        {**_change(3), "state": "New York", "worksheet": "Pro-LGBTQ Bills", "change_type": "update"},
+    ]
+    change_queue.append_changes(changes)
+    assert [c["id"] for c in change_queue.filtered_changes({"worksheet": "anti"})] == ["id-2", "id-1"]
+    assert [c["id"] for c in change_queue.filtered_changes({"worksheet": "rollover", "change_type": "update"})] == ["id-2"]
+    assert [c["id"] for c in change_queue.filtered_changes({"state": "new-york"})] == ["id-3"]
+    assert change_queue.filtered_changes({"state": "Utah"}) == []
+
+    texas, _ = change_queue.queue_version({"state": "Texas"})
+    ohio, _ = change_queue.queue_version({"state": "Ohio"})
+    change_queue.append_changes([{**_change(4), "state": "Ohio", "worksheet": "Pro-LGBTQ Bills", "change_type": "new"}])
+    assert change_queue.queue_version({"state": "Texas"})[0] == texas
+    assert change_queue.queue_version({"state": "Ohio"})[0] != ohio
+    feed = json.loads(change_queue.build_json_feed(change_queue.filtered_changes({"state": "Ohio"})))
+    assert [item["id"] for item in feed["items"]] == ["id-4", "id-2"]
+    assert "<entry>" in change_queue.build_atom_feed(change_queue.filtered_changes({"state": "Ohio"}))
@@ -0,0 +1,83 @@
+import base64
+import io
+import json
+import zipfile
+
+import pytest
+
+from utils import datasets
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def _build_archive(bills):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for bill in bills:
+            zf.writestr(f"TX/2025-2026_Regular_Session/bill/{bill['bill_number']}.json", json.dumps({"bill": bill}))
+        zf.writestr("TX/2025-2026_Regular_Session/people/1.json", json.dumps({"person": {"people_id": 1}}))
+    return buffer.getvalue()
+
+
+def _fake_api(archive, list_hash="abc", dataset_hash="abc"):
+    calls = []
+
+    def request_fn(url):
+        calls.append(url)
+        if "op=getDatasetList" in url:
+            return FakeResponse({"status": "OK", "datasetlist": [
+                {"session_id": 10, "dataset_hash": list_hash, "dataset_date": "2026-01-04", "access_key": "k"},
+            ]})
+        return FakeResponse({"status": "OK", "dataset": {
+            "session_id": 10,
+            "dataset_hash": dataset_hash,
+            "dataset_date": "2026-01-04",
+            "dataset_size": len(archive),
+            "zip": base64.b64encode(archive).decode("ascii"),
+        }})
+
+    return request_fn, calls
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(datasets, "DATASET_STATE_FILE", str(tmp_path / "datasets.json"))
+
+
+def test_ingest_datasets_loads_bills_once_per_hash():
+    archive = _build_archive([
+        {"bill_id": 1, "bill_number": "HB1", "change_hash": "h1"},
+        {"bill_id": 2, "bill_number": "HB2", "change_hash": "h2"},
+    ])
+    request_fn, calls = _fake_api(archive)
+    saved = {}
+
+    def save_fn(bill_id, change_hash, bill, dataset_ts):
+        saved[bill_id] = change_hash
+        return True
+
+    assert datasets.ingest_datasets(2026, request_fn, save_fn) == 2
+    assert saved == {1: "h1", 2: "h2"}
+    assert datasets.ingest_datasets(2026, request_fn, save_fn) == 0
+    assert len([c for c in calls if "op=getDataset&" in c]) == 1
+
+
+def test_decode_dataset_rejects_hash_mismatch():
+    archive = _build_archive([{"bill_id": 1, "bill_number": "HB1", "change_hash": "h1"}])
+    payload = {"dataset_hash": "new", "zip": base64.b64encode(archive).decode("ascii")}
+    with pytest.raises(datasets.DatasetError):
+        datasets.decode_dataset(payload, "old")
+
+
+def test_decode_dataset_rejects_truncated_archive():
+    archive = _build_archive([{"bill_id": 1, "bill_number": "HB1", "change_hash": "h1"}])[:-10]
+    payload = {"dataset_hash": "abc", "zip": base64.b64encode(archive).decode("ascii")}
+    with pytest.raises(datasets.DatasetError):
+        datasets.decode_dataset(payload, "abc")
@@ -0,0 +1,62 @@
+import gzip
+
+import app as app_module
+from utils.feed_cache import FeedCache, accepts_gzip
+
+
+def test_feed_cache_renders_once_per_version():
+    cache = FeedCache(max_entries=1)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return "<rss/>"
+
+    first = cache.get("rss", "v1", 1700000000.5, render)
+    assert cache.get("rss", "v1", 1700000000.5, render) is first
+    assert gzip.decompress(first.gzip_body) == b"<rss/>"
+    cache.get("rss", "v2", 1700000001, render)
+    cache.get("other", "v2", 1700000001, render)
+    cache.get("rss", "v2", 1700000001, render)
+    assert len(renders) == 4
+    assert first.not_modified(first.etag, None)
+    assert first.not_modified(None, first.last_modified_header)
+    assert not first.not_modified('"stale"', first.last_modified_header)
+    assert accepts_gzip("br, gzip;q=0.8") and not accepts_gzip("gzip;q=0") and not accepts_gzip(None)
+
+
+def test_rss_endpoint_serves_cached_conditional_responses(monkeypatch):
+    loads = []
+    version = ["v1"]
+    monkeypatch.setattr(app_module, "feed_cache", FeedCache())
+    monkeypatch.setattr(app_module, "queue_version", lambda filters: (version[0], 1700000000.0))
+    monkeypatch.setattr(
+        app_module, "filtered_changes", lambda filters: loads.append(1) or [{"id": "a", "state": "Texas", "bill_number": "HB1", "created_at": 1}]
+    )
+    client = app_module.app.test_client()
+
+    first = client.get("/rss")
+    assert first.status_code == 200 and b"Texas HB1" in first.data
+    etag = first.headers["ETag"]
+    assert client.get("/rss", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/rss", headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+    zipped = client.get("/rss", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.data) == first.data
+    # each encoding validates only against its own ETag
+    zipped_etag = zipped.headers["ETag"]
+    assert zipped_etag != etag
+    assert client.get("/rss", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped_etag}).status_code == 304
+    assert client.get("/rss", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}).status_code == 200
+    assert client.get("/rss", headers={"If-None-Match": zipped_etag}).status_code == 200
+    assert len(loads) == 1
+
+    version[0] = "v2"
+    assert client.get("/rss", headers={"If-None-Match": etag}).status_code == 304
+    assert len(loads) == 2
+
+
+def test_rss_endpoint_rejects_unknown_filters():
+    client = app_module.app.test_client()
+    assert client.get("/rss?worksheet=neutral").status_code == 400
+    assert client.get("/rss?format=csv").status_code == 400
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from utils.frame_store import MASTER_LIST_SCHEMA, migrate_csv, read_frame, write_frame
+
+
+def _master_list():
+    return pd.DataFrame(
+        [
+            {"bill_id": 1, "number": "HB0012", "change_hash": "1234e567", "title": "t1", "status": "1"},
+            {"bill_id": 2, "number": "SB2", "change_hash": "00ab", "title": None, "status": None},
+        ]
+    )
+
+
+def test_write_frame_round_trips_typed_columns(tmp_path):
+    path = tmp_path / "Texas-2026-session-1.feather"
+    write_frame(_master_list(), path, MASTER_LIST_SCHEMA)
+    frame = read_frame(path, MASTER_LIST_SCHEMA)
+    assert list(frame.columns) == MASTER_LIST_SCHEMA.names
+    assert list(frame["change_hash"]) == ["1234e567", "00ab"]
+    assert list(frame["number"]) == ["HB0012", "SB2"]
+    assert str(frame["bill_id"].dtype) == "Int64"
+    assert frame["status"].isna().tolist() == [False, True]
+
+
+def test_migrate_csv_drops_stray_index_and_keeps_mtime(tmp_path):
+    csv_path = tmp_path / "Texas-2026-session-1.csv"
+    path = tmp_path / "Texas-2026-session-1.feather"
+    _master_list().to_csv(csv_path)
+    mtime = csv_path.stat().st_mtime
+    assert migrate_csv(csv_path, path, MASTER_LIST_SCHEMA)
+    assert not csv_path.exists()
+    assert path.stat().st_mtime == mtime
+    frame = read_frame(path, MASTER_LIST_SCHEMA)
+    assert "Unnamed: 0" not in frame.columns
+    assert frame.loc[0, "change_hash"] == "1234e567"
@@ -0,0 +1,14 @@
+from utils.get_sessions import master_list_refresh_reason
+
+
+def test_master_list_refresh_reason_freezes_finished_sessions():
+    active = {"dataset_hash": "h1", "sine_die": 0, "prior": 0}
+    adjourned = {"dataset_hash": "h1", "sine_die": 1, "prior": 0}
+    archived = {"dataset_hash": "h2", "sine_die": 1, "prior": 1}
+    cataloged = {"dataset_hash": "h1"}
+    assert master_list_refresh_reason(active, cataloged, None, 3600) == "missing"
+    assert master_list_refresh_reason(active, cataloged, 7200, 3600) == "stale"
+    assert master_list_refresh_reason(active, cataloged, 60, 3600) is None
+    assert master_list_refresh_reason(adjourned, cataloged, 10 ** 7, 3600) is None
+    assert master_list_refresh_reason(adjourned, {"dataset_hash": "h0"}, 60, 3600) == "dataset_hash changed"
+    assert master_list_refresh_reason(archived, cataloged, 10 ** 7, 3600) is None
@@ -0,0 +1,23 @@
+from utils.legiscan_helper import get_history, get_sponsors, render_details
+
+
+def test_formatters_join_like_the_original_loops():
+    assert get_sponsors([{"name": ""}, {"name": "A"}, {"name": ""}, {"name": "B"}]) == "A, , B"
+    assert get_history([]) == ".... see more on LegiScan"
+    long_history = [{"chamber": "H", "date": "2026-01-01", "action": "x" * 100}] * 1000
+    assert len(get_history(long_history)) == 49000 + len(".... see more on LegiScan")
+
+
+def test_render_details_fills_every_detail_column():
+    bill = {
+        "sponsors": [{"name": "A"}],
+        "calendar": [{"type": "Hearing", "date": "2026-01-02", "time": "10:00", "location": "Room 1"}],
+        "history": [{"chamber": "H", "date": "2026-01-01", "action": "Filed"}],
+        "texts": [{"state_link": "https://example.com/hb1.pdf"}],
+    }
+    assert render_details(bill) == {
+        "Sponsors": "A",
+        "Calendar": "Hearing 2026-01-02 10:00 Room 1",
+        "History": "H 2026-01-01 Filed.... see more on LegiScan",
+        "PDF": "https://example.com/hb1.pdf",
+    }
@@ -1,6 +1,8 @@
 import pandas as pd
 
 import main
+from utils.bill_store import BillStore
+from utils.legiscan_helper import get_history
 
 
 def test_row_missing_details_detects_blanks():
@@ -25,10 +27,297 @@ def test_build_master_index_handles_multiple_states():
     assert index["Example"]["HB2"]["change_hash"] == "b"
 
 
-def test_worksheet_legiscan_digest_changes_on_change_hash():
-    gsheet = pd.DataFrame([{"State": "X", "Number": "HB1", "Change Hash": "hash1"}])
-    master_index = {"X": {"HB1": {"change_hash": "hash1"}}}
-    digest1 = main.worksheet_legiscan_digest(gsheet, master_index)
-    master_index["X"]["HB1"]["change_hash"] = "hash2"
-    digest2 = main.worksheet_legiscan_digest(gsheet, master_index)
-    assert digest1 != digest2
+def test_build_master_index_prefers_regular_session_on_shared_keys():
+    df = pd.DataFrame(
+        [
+            {"number": "HB1", "change_hash": "a", "bill_id": 1, "session_special": 0},
+            {"number": "X1HB1", "change_hash": "b", "bill_id": 2, "session_special": 1},
+        ]
+    )
+    index = main.build_master_index({"Example": df})["Example"]
+    assert list(index) == ["HB1", "X1HB1"]
+    assert index["HB1"]["bill_id"] == 1
+    assert index["X1HB1"]["bill_id"] == 2
+    assert index["X1HB1"]["raw_number"] == "X1HB1"
+
+
+def test_find_master_row_resolves_prefixed_numbers_by_session():
+    df = pd.DataFrame(
+        [
+            {"number": "X2SB5", "change_hash": "a", "bill_id": 1, "session_special": 2},
+            {"number": "SB5", "change_hash": "b", "bill_id": 2, "session_special": 0},
+            {"number": "X1HB9", "change_hash": "c", "bill_id": 3, "session_special": 1},
+        ]
+    )
+    index = main.build_master_index({"Example": df})["Example"]
+    for state_index in (index, dict(index)):
+        assert main.find_master_row(state_index, "X2SB5")["bill_id"] == 1
+        assert main.find_master_row(state_index, "X3SB5")["bill_id"] == 2
+        assert main.find_master_row(state_index, "X4HB9")["bill_id"] == 3
+        assert main.find_master_row(state_index, "HB10") is None
+
+
+def test_find_previous_row_matches_number_then_bill_id():
+    prev_gsheet = pd.DataFrame(
+        [
+            {"State": "Texas", "Number": '=HYPERLINK("u","HB 1")', "Bill ID": "10"},
+            {"State": "Texas", "Number": "SB2", "Bill ID": "20"},
+        ]
+    )
+    prev_lookup = main.build_previous_lookup(prev_gsheet)
+    assert main.find_previous_row(prev_lookup, "Texas ", "HB1")["Bill ID"] == "10"
+    assert main.find_previous_row(prev_lookup, "Texas", "SB0002", 20)["Bill ID"] == "20"
+    assert main.find_previous_row(prev_lookup, "Ohio", "HB1") is None
+
+
+def test_dirty_row_mask_flags_only_rows_that_moved():
+    gsheet = pd.DataFrame(
+        [
+            {"State": "X", "Number": "HB1", "Bill Type": "Sports", "Change Hash": "hash1", "Sponsors": "A", "Calendar": "B", "History": "C", "PDF": "D", "Bill ID": "1"},
+            {"State": "X", "Number": "HB2", "Bill Type": "Sports", "Change Hash": "hash2", "Sponsors": "A", "Calendar": "B", "History": "C", "PDF": "D", "Bill ID": "2"},
+            {"State": "X", "Number": "HB3", "Bill Type": "Sports", "Change Hash": "hash3", "Sponsors": "", "Calendar": "B", "History": "C", "PDF": "D", "Bill ID": "3"},
+        ]
+    )
+    master_index = {"X": {"HB1": {"change_hash": "hash1"}, "HB2": {"change_hash": "hash2"}, "HB3": {"change_hash": "hash3"}}}
+    row_state = main.build_row_state(gsheet)
+    assert main.dirty_row_mask(gsheet, {}, master_index).tolist() == [True, True, True]
+    assert main.dirty_row_mask(gsheet, row_state, master_index).tolist() == [False, False, True]
+
+    master_index["X"]["HB1"]["change_hash"] = "hash1b"
+    gsheet.at[1, "Bill Type"] = "Education"
+    assert main.dirty_row_mask(gsheet, row_state, master_index).tolist() == [True, True, True]
+
+
+def test_apply_cell_updates_matches_what_the_sheet_would_show():
+    gsheet = pd.DataFrame([{"Number": "HB1", "Status": "", "Youth State Risk": "High"}])
+    updates = [
+        (2, "Number", '=HYPERLINK("https://legiscan.com/x","HB1")'),
+        (2, "Status", "Passed"),
+        (2, "Youth State Risk", "=VLOOKUP(A2,'Risk Levels'!$A$4:$E$55,2)"),
+    ]
+    snapshot = main.apply_cell_updates(gsheet, updates)
+    assert snapshot.iloc[0].to_dict() == {"Number": "HB1", "Status": "Passed", "Youth State Risk": "High"}
+    assert gsheet.at[0, "Status"] == ""
+    assert main.snapshot_drift(snapshot, snapshot.copy()) == 0
+
+
+def test_snapshot_verification_runs_every_n_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "SNAPSHOT_VERIFY_RUNS", 3)
+    due = []
+    for _ in range(6):
+        verify = main.snapshot_verification_due("Anti", 2026)
+        due.append(verify)
+        main.record_snapshot_run("Anti", 2026, verify)
+    assert due == [True, False, False, True, False, False]
+
+
+def test_prefetch_bill_details_fetches_each_miss_once(monkeypatch):
+    fetched = []
+
+    def fake_details(bill_id, change_hash, session):
+        fetched.append(bill_id)
+        return {"bill_id": bill_id}
+
+    monkeypatch.setattr(main, "load_bill_cache_batch", lambda pairs: {1: {"bill_id": 1}})
+    monkeypatch.setattr(main, "get_bill_details", fake_details)
+    bills = main.prefetch_bill_details([(1, "a"), (2, "b"), (2, "b"), (3, "c")], session=None, max_workers=2)
+    assert sorted(fetched) == [2, 3]
+    assert sorted(bills) == [1, 2, 3]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+def test_refresh_master_list_fetches_only_tracked_moved_bills(monkeypatch):
+    cached = pd.DataFrame(
+        [
+            {"bill_id": 1, "number": "HB1", "change_hash": "a", "title": "t1"},
+            {"bill_id": 2, "number": "HB2", "change_hash": "b", "title": "t2"},
+            {"bill_id": 3, "number": "HB3", "change_hash": "c", "title": "gone"},
+            {"bill_id": 4, "number": "HB4", "change_hash": "d", "title": "t4", "url": "u4",
+             "last_action": "Filed", "last_action_date": "2026-01-01"},
+            {"bill_id": 5, "number": "HB5", "change_hash": "e", "title": "t5"},
+        ]
+    )
+    raw = {"status": "OK", "masterlist": {
+        "session": {"session_id": 9},
+        "0": {"bill_id": 1, "number": "HB1", "change_hash": "a"},
+        "1": {"bill_id": 2, "number": "HB2", "change_hash": "b2"},
+        "2": {"bill_id": 4, "number": "HB4", "change_hash": "d2"},
+        "3": {"bill_id": 5, "number": "HB5", "change_hash": "e2"},
+        "4": {"bill_id": 6, "number": "HB6", "change_hash": "f"},
+    }}
+    fetched = []
+
+    def fake_details(bill_id, change_hash, session):
+        fetched.append(bill_id)
+        return {"bill_id": bill_id, "bill_number": "HB2", "change_hash": change_hash, "title": "t2 amended",
+                "history": [{"date": "2026-02-01", "action": "Passed"}]}
+
+    stored = {5: {"bill_id": 5, "bill_number": "HB5", "change_hash": "e2", "title": "t5",
+                  "history": [{"date": "2026-02-02", "action": "Signed"}]}}
+    monkeypatch.setattr(main, "tracked_bill_ids", {2})
+    monkeypatch.setattr(main, "legiscan_get", lambda url, session: FakeResponse(raw))
+    monkeypatch.setattr(main, "load_bill_cache_batch", lambda pairs: {i: stored[i] for i, _ in pairs if i in stored})
+    monkeypatch.setattr(main, "prefetch_bill_details", lambda pairs, session: {})
+    monkeypatch.setattr(main, "get_bill_details", fake_details)
+    patched = main.refresh_master_list(cached, 9, session=None)
+    assert fetched == [2]
+    assert sorted(patched["bill_id"]) == [1, 2, 4, 5, 6]
+    rows = patched.set_index("bill_id")
+    assert rows.loc[2, "change_hash"] == "b2" and rows.loc[2, "last_action"] == "Passed"
+    assert rows.loc[5, "last_action"] == "Signed"
+    assert rows.loc[4, "change_hash"] == "d2" and rows.loc[4, "title"] == "t4" and rows.loc[4, "url"] == "u4"
+    assert pd.isna(rows.loc[4, "last_action"])
+    assert rows.loc[6, "number"] == "HB6" and rows.loc[6, "change_hash"] == "f"
+
+
+def test_refresh_master_list_pulls_full_list_past_the_patch_limit(monkeypatch):
+    cached = pd.DataFrame([{"bill_id": i, "number": f"HB{i}", "change_hash": "a"} for i in range(1, 4)])
+    raw = {"status": "OK", "masterlist": {
+        str(i): {"bill_id": i, "number": f"HB{i}", "change_hash": "b"} for i in range(1, 4)
+    }}
+    monkeypatch.setattr(main, "MASTER_LIST_PATCH_LIMIT", 1)
+    monkeypatch.setattr(main, "legiscan_get", lambda url, session: FakeResponse(raw))
+    monkeypatch.setattr(main, "load_bill_cache_batch", lambda pairs: {})
+    monkeypatch.setattr(main, "prefetch_bill_details", lambda pairs, session: {
+        bill_id: {"bill_id": bill_id, "bill_number": f"HB{bill_id}", "change_hash": change_hash} for bill_id, change_hash in pairs
+    })
+    monkeypatch.setattr(main, "tracked_bill_ids", {1})
+    assert main.refresh_master_list(cached, 9, session=None) is not None
+    monkeypatch.setattr(main, "tracked_bill_ids", {1, 2})
+    assert main.refresh_master_list(cached, 9, session=None) is None
+
+
+def test_run_worksheet_tasks_keeps_task_order_and_separate_reports(monkeypatch):
+    def fake_update_worksheet(worksheet, report, **kwargs):
+        report.new_rows.append(worksheet)
+        report.bill_ids.add(len(worksheet))
+        return worksheet.upper
+
+    monkeypatch.setattr(main, "update_worksheet", fake_update_worksheet)
+    results = main.run_worksheet_tasks([{"worksheet": "anti"}, {"worksheet": "pro"}], max_workers=2)
+    assert [finalize() for _, finalize, _ in results] == ["ANTI", "PRO"]
+    merged = main.WorksheetReport()
+    for report, _, _ in results:
+        merged.merge(report)
+    assert merged.new_rows == ["anti", "pro"]
+    assert merged.bill_ids == {3, 4}
+    assert merged.new_report.startswith(main.NEW_REPORT_HEADER)
+
+
+def test_diff_worksheet_emits_only_changed_cells(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "_inc_stat", lambda *args, **kwargs: None)
+    monkeypatch.setattr(main, "bill_store", BillStore(str(tmp_path / "bills.sqlite3")))
+    monkeypatch.setattr(main, "_detail_fields", {})
+    master = pd.DataFrame(
+        [
+            {"number": "HB1", "change_hash": "same", "last_action": "Passed", "last_action_date": "2026-01-02", "title": "One", "url": "u1", "bill_id": 1},
+            {"number": "HB2", "change_hash": "moved", "last_action": "Signed", "last_action_date": "2026-01-03", "title": "Two", "url": "u2", "bill_id": 2},
+        ]
+    )
+    base = {"Bill Type": "Sports", "Sponsors": "A", "Calendar": "B", "History": "C", "PDF": "D", "Youth State Risk": "", "Adult State Risk": ""}
+    gsheet = pd.DataFrame(
+        [
+            {**base, "State": "Texas", "Number": '=HYPERLINK("u1","HB1")', "Bill ID": 1, "Status": "Passed", "Date": "2026-01-02", "Summary": "One", "Change Hash": "same", "URL": '=HYPERLINK("u1","u1")'},
+            {**base, "State": "Texas", "Number": "HB2", "Bill ID": 2, "Status": "Filed", "Date": "2026-01-01", "Summary": "Two", "Change Hash": "old", "URL": "u2"},
+            {**base, "State": "Atlantis", "Number": "HB3", "Bill ID": 3, "Status": "", "Date": "", "Summary": "", "Change Hash": "", "URL": ""},
+        ]
+    )
+    all_lists = {"Texas": master}
+    details = {"sponsors": [], "calendar": [], "history": [], "texts": []}
+    report = main.WorksheetReport()
+    cells, changes, missing = main.diff_worksheet(
+        gsheet, "Anti-LGBTQ Bills", 2026, main.build_master_index(all_lists), all_lists,
+        main.build_previous_lookup(gsheet), lambda bill_id, change_hash: details, report,
+    )
+    changed = {(row, column) for row, column, _ in cells}
+    assert missing == {"Atlantis"}
+    assert not any(row == 4 for row, _ in changed)
+    assert {(3, "Status"), (3, "Date"), (3, "Change Hash")} <= changed
+    assert (2, "Status") not in changed
+    assert [change["bill_number"] for change in changes] == ["HB2"]
+
+
+def test_new_history_events_reports_only_events_past_the_cursor(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "bill_store", BillStore(str(tmp_path / "bills.sqlite3")))
+    events = [{"chamber": "H", "date": f"2026-01-0{day}", "action": f"Step, {day}"} for day in range(1, 5)]
+    bills = {"b": {"history": events[:3]}, "c": {"history": events}, "d": {"history": events[:1]}}
+
+    def details_for(bill_id, change_hash):
+        return bills[change_hash]
+
+    shown = get_history(events[:2])
+    updates = {}
+    assert main.new_history_events(7, "b", shown, details_for, updates) == events[2:3]
+    # nothing is saved until the write succeeds, so a failed run reports the same events again
+    assert main.bill_store.get_history_cursor(7) is None
+    assert main.new_history_events(7, "b", shown, details_for, updates) == events[2:3]
+    main.save_history_cursors(updates)
+    # another worksheet still at the old hash sees the events that moved the cursor
+    assert main.new_history_events(7, "b", shown, details_for, {}) == events[2:3]
+
+    updates = {}
+    assert main.new_history_events(7, "c", "", details_for, updates) == events[3:]
+    main.save_history_cursors(updates)
+    updates = {}
+    assert main.new_history_events(7, "d", "", details_for, updates) == []
+    main.save_history_cursors(updates)
+    assert main.bill_store.get_history_cursor(7) == (1, 1, "d")
+
+
+def test_a_failed_worksheet_does_not_discard_the_others(monkeypatch):
+    finished = []
+
+    def fake_update_worksheet(year, worksheet, report, **kwargs):
+        if worksheet == "bad":
+            raise ValueError("broken tab")
+        report.new_rows.append(worksheet)
+        return lambda: finished.append((year, worksheet))
+
+    class FakeWriter:
+        def __init__(self, fail=False):
+            self.fail = fail
+
+        def flush(self):
+            if self.fail:
+                raise RuntimeError("quota")
+
+    monkeypatch.setattr(main, "update_worksheet", fake_update_worksheet)
+    monkeypatch.setattr(main, "run_report", main.WorksheetReport())
+    tasks = [{"year": 2025, "worksheet": "bad"}, {"year": 2025, "worksheet": "good"}, {"year": 2026, "worksheet": "good"}]
+    results = main.run_worksheet_tasks(tasks, max_workers=2)
+    assert isinstance(results[0][2], ValueError)
+    failures = main.finish_year(2025, FakeWriter(), results[:2])
+    assert [type(e) for e in failures] == [ValueError]
+    assert finished == [(2025, "good")]
+    assert main.run_report.new_rows == ["good"]
+    assert [type(e) for e in main.finish_year(2026, FakeWriter(fail=True), results[2:])] == [RuntimeError]
+    assert finished == [(2025, "good")]
+
+
+def test_update_worksheet_uses_the_rollover_lists_it_is_given(monkeypatch):
+    class Opened(Exception):
+        pass
+
+    def fail_get_main_lists(year, session):
+        raise AssertionError("rollover lists reloaded inside the worksheet pool")
+
+    def open_worksheet(year, worksheet):
+        raise Opened()
+
+    monkeypatch.setattr(main, "mark_run_failed", lambda worksheet, year: None)
+    monkeypatch.setattr(main, "get_main_lists", fail_get_main_lists)
+    monkeypatch.setattr(main.sheets, "open_worksheet", open_worksheet)
+    try:
+        main.update_worksheet(2026, "Anti", "new", "change", None, {}, rollover=True, rollover_lists={},
+                              master_index={}, report=main.WorksheetReport())
+    except Opened:
+        pass
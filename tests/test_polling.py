@@ -0,0 +1,41 @@
+from datetime import date
+
+import pandas as pd
+
+from utils import polling
+
+STATE_NAMES = ["Alabama", "Alaska", "Arizona"]
+TODAY = date(2026, 3, 1)
+
+
+def _sessions():
+    return pd.DataFrame(
+        [
+            {"state_id": 1, "year_start": 2026, "year_end": 2026, "sine_die": 0, "prior": 0, "special": 0},
+            {"state_id": 2, "year_start": 2025, "year_end": 2026, "sine_die": 0, "prior": 0, "special": 0},
+            {"state_id": 3, "year_start": 2026, "year_end": 2026, "sine_die": 1, "prior": 0, "special": 0},
+        ]
+    )
+
+
+def test_plan_state_polling_assigns_tiers():
+    recorded = {
+        "Alabama": {"last_activity": "2026-02-27", "last_refreshed": 1000.0},
+        "Alaska": {"last_activity": "2026-01-02", "last_refreshed": 1000.0},
+        "Arizona": {"last_activity": "2026-02-28", "last_refreshed": 1000.0},
+    }
+    plan = polling.plan_state_polling(_sessions(), STATE_NAMES, recorded, now=1000.0 + 1800, today=TODAY)
+    assert plan["Alabama"]["tier"] == "hot" and plan["Alabama"]["due"]
+    assert plan["Alaska"]["tier"] == "warm" and not plan["Alaska"]["due"]
+    assert plan["Arizona"]["tier"] == "dormant" and not plan["Arizona"]["due"]
+    assert "adjourned" in plan["Arizona"]["reason"]
+
+
+def test_plan_state_polling_marks_unseen_states_due():
+    plan = polling.plan_state_polling(_sessions(), STATE_NAMES, {}, now=0.0, today=TODAY)
+    assert all(entry["due"] for entry in plan.values())
+
+
+def test_latest_activity_ignores_blank_dates():
+    df = pd.DataFrame({"last_action_date": ["2026-01-05", None, "", "2026-02-10"]})
+    assert polling.latest_activity(df) == "2026-02-10"
@@ -0,0 +1,26 @@
+from utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_spaces_calls_by_min_interval():
+    clock = FakeClock()
+    bucket = TokenBucket.from_min_interval(0.5, clock=clock, sleep=clock.sleep)
+    waits = [bucket.acquire() for _ in range(3)]
+    assert waits[0] == 0.0
+    assert waits[1:] == [0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_token_bucket_disabled_without_interval():
+    bucket = TokenBucket.from_min_interval(0)
+    assert bucket.acquire() == 0.0
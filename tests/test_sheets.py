@@ -0,0 +1,105 @@
+from utils import sheets
+
+
+class FakeCredentials:
+    def __init__(self):
+        self.token = "token"
+        self.valid = True
+        self.refreshed = 0
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.valid = True
+
+
+class FakeClient:
+    def __init__(self):
+        self.http_client = type("HTTP", (), {"auth": FakeCredentials()})()
+        self.opened = []
+
+    def open_by_key(self, key):
+        self.opened.append(key)
+        return type("Spreadsheet", (), {"worksheet": lambda _self, name: f"{key}/{name}"})()
+
+
+def test_client_and_spreadsheet_are_reused(monkeypatch):
+    created = []
+
+    def fake_service_account(info):
+        created.append(FakeClient())
+        return created[-1]
+
+    monkeypatch.setattr(sheets, "_client", None)
+    monkeypatch.setattr(sheets.gspread, "service_account_from_dict", fake_service_account)
+    monkeypatch.setattr(sheets, "load_service_account_credentials", lambda: {})
+    monkeypatch.setattr(sheets, "get_sheet_key", lambda year: f"key-{year}")
+    sheets.reset_handles()
+
+    assert sheets.open_worksheet(2026, "Anti-LGBTQ Bills") == "key-2026/Anti-LGBTQ Bills"
+    assert sheets.open_worksheet(2026, "Pro-LGBTQ Bills") == "key-2026/Pro-LGBTQ Bills"
+    client = sheets.get_client()
+    assert len(created) == 1
+    assert client.opened == ["key-2026"]
+    assert client.http_client.auth.refreshed == 0
+
+    client.http_client.auth.valid = False
+    sheets.reset_handles()
+    sheets.open_worksheet(2026, "Anti-LGBTQ Bills")
+    assert len(created) == 1
+    assert client.http_client.auth.refreshed == 1
+    assert client.opened == ["key-2026", "key-2026"]
+    sheets.reset_handles()
+
+
+def test_read_worksheets_uses_one_batch_get(monkeypatch):
+    calls = []
+
+    class FakeSpreadsheet:
+        def worksheets(self):
+            return [type("Worksheet", (), {"title": title})() for title in ("Anti-LGBTQ Bills", "Risk Levels")]
+
+        def values_batch_get(self, ranges, params=None):
+            calls.append(ranges)
+            return {"valueRanges": [{"values": [["State", "Number", "Bill ID"], ["Texas", "HB1", "123"], ["Ohio"]]}]}
+
+    sheets.reset_handles()
+    monkeypatch.setattr(sheets, "open_spreadsheet", lambda year: FakeSpreadsheet())
+    loaded = sheets.read_worksheets(2026, ["Anti-LGBTQ Bills", "Pro-LGBTQ Bills"])
+    assert calls == [["'Anti-LGBTQ Bills'"]]
+    headers, frame = loaded["Anti-LGBTQ Bills"]
+    assert headers == ["State", "Number", "Bill ID"]
+    assert frame.to_dict("records") == [
+        {"State": "Texas", "Number": "HB1", "Bill ID": 123},
+        {"State": "Ohio", "Number": "", "Bill ID": ""},
+    ]
+    assert "Pro-LGBTQ Bills" not in loaded
+    sheets.reset_handles()
+
+
+def test_sheet_writer_merges_cells_and_splits_by_size(monkeypatch):
+    sent = []
+
+    class FakeSpreadsheet:
+        def values_batch_update(self, body):
+            sent.append(body)
+
+    monkeypatch.setattr(sheets, "open_spreadsheet", lambda year: FakeSpreadsheet())
+    writer = sheets.SheetWriter(2026)
+    for row in (2, 3):
+        for col in (3, 4):
+            writer.add("Anti-LGBTQ Bills", row, col, f"r{row}c{col}")
+    writer.add("Anti-LGBTQ Bills", 5, 3, "lone")
+    writer.add("Pro-LGBTQ Bills", 2, 1, "pro")
+    assert writer.ranges() == [
+        {"range": "'Anti-LGBTQ Bills'!C2:D3", "values": [["r2c3", "r2c4"], ["r3c3", "r3c4"]]},
+        {"range": "'Anti-LGBTQ Bills'!C5:C5", "values": [["lone"]]},
+        {"range": "'Pro-LGBTQ Bills'!A2:A2", "values": [["pro"]]},
+    ]
+    assert writer.flush() == 1
+    assert sent[0]["valueInputOption"] == "USER_ENTERED"
+    assert writer.flush() == 0
+
+    small = sheets.SheetWriter(2026, max_bytes=60)
+    small.add("Anti-LGBTQ Bills", 2, 1, "a")
+    small.add("Anti-LGBTQ Bills", 9, 9, "b")
+    assert len(small.requests()) == 2
@@ -0,0 +1,298 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LOOKUP_CHUNK = 500
+
+# Bump when BILL_FIELDS or the nested field lists widen; rows written under another
+# version are refetched. Version 0 rows are uncompressed full getBill payloads.
+SCHEMA_VERSION = 1
+BILL_FIELDS = [
+    "bill_id",
+    "change_hash",
+    "bill_number",
+    "status",
+    "title",
+    "last_action",
+    "last_action_date",
+    "status_date",
+    "url",
+]
+NESTED_FIELDS = {
+    "sponsors": ["name"],
+    "calendar": ["type", "date", "time", "location"],
+    "history": ["chamber", "date", "action"],
+    "texts": ["state_link"],
+}
+# Bump when the legiscan_helper formatters change their output; older rendered rows are recomputed.
+DERIVED_VERSION = 1
+
+
+def project_bill(bill: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the getBill fields the tracker reads. Safe to apply to an already projected bill."""
+    projected = {field: bill.get(field) for field in BILL_FIELDS}
+    for field, keys in NESTED_FIELDS.items():
+        projected[field] = [{key: item.get(key, "") for key in keys} for item in bill.get(field) or []]
+    # getBill has no last_action fields of its own; they are the newest history step
+    if projected["history"]:
+        last_event = projected["history"][-1]
+        if not projected["last_action"]:
+            projected["last_action"] = last_event["action"]
+        if not projected["last_action_date"]:
+            projected["last_action_date"] = last_event["date"]
+    return projected
+
+
+def _encode(bill):
+    return zlib.compress(json.dumps(project_bill(bill), separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(payload, schema_version):
+    if schema_version == SCHEMA_VERSION:
+        return json.loads(zlib.decompress(payload))
+    if schema_version == 0:
+        return project_bill(json.loads(payload))
+    return None
+
+
+class BillStore:
+    """
+    Projected getBill payloads keyed by bill_id in a single SQLite database (WAL mode),
+    stored as zlib-compressed JSON. A cached bill is only returned when its change_hash
+    matches the one asked for. A second table keeps the sheet fields rendered from each
+    bill under the same change_hash rule, and a third how many history events were reported.
+    One connection is shared by every thread and guarded by a lock.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._batch_depth = 0
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS bills ("
+                "bill_id INTEGER PRIMARY KEY, "
+                "change_hash TEXT, "
+                "fetched_at REAL NOT NULL, "
+                "payload BLOB NOT NULL, "
+                "schema_version INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(bills)")}
+            if "schema_version" not in columns:
+                conn.execute("ALTER TABLE bills ADD COLUMN schema_version INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS bills_fetched_at ON bills (fetched_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS derived ("
+                "bill_id INTEGER PRIMARY KEY, "
+                "change_hash TEXT, "
+                "version INTEGER NOT NULL, "
+                "fields TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_cursor ("
+                "bill_id INTEGER PRIMARY KEY, "
+                "seen INTEGER NOT NULL, "
+                "change_hash TEXT, "
+                "previous_seen INTEGER NOT NULL DEFAULT 0)"
+            )
+            cursor_columns = {row[1] for row in conn.execute("PRAGMA table_info(history_cursor)")}
+            if "previous_seen" not in cursor_columns:
+                conn.execute("ALTER TABLE history_cursor ADD COLUMN previous_seen INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def batch(self):
+        """Group many put() calls into one commit; other threads wait until it finishes."""
+        with self._lock:
+            conn = self._connect()
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    conn.commit()
+
+    def get(self, bill_id, change_hash) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT change_hash, payload, schema_version FROM bills WHERE bill_id = ?", (int(bill_id),)
+            ).fetchone()
+        if row is None or row[0] != change_hash:
+            return None
+        return _decode(row[1], row[2])
+
+    def has(self, bill_id, change_hash) -> bool:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT change_hash FROM bills WHERE bill_id = ?", (int(bill_id),)
+            ).fetchone()
+        return row is not None and row[0] == change_hash
+
+    def get_many(self, pairs: Iterable[Tuple[Any, str]]) -> Dict[int, Dict[str, Any]]:
+        """Batch lookup of (bill_id, change_hash) pairs; returns {bill_id: bill} for the current ones."""
+        wanted = {int(bill_id): change_hash for bill_id, change_hash in pairs}
+        found = {}
+        ids = list(wanted)
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(ids), _LOOKUP_CHUNK):
+                chunk = ids[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT bill_id, change_hash, payload, schema_version FROM bills WHERE bill_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for bill_id, change_hash, payload, schema_version in rows:
+                    if wanted.get(bill_id) != change_hash:
+                        continue
+                    bill = _decode(payload, schema_version)
+                    if bill is not None:
+                        found[bill_id] = bill
+        return found
+
+    def fetched_at(self, bill_id) -> Optional[float]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT fetched_at FROM bills WHERE bill_id = ?", (int(bill_id),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, bill_id, change_hash, bill, fetched_at=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO bills (bill_id, change_hash, fetched_at, payload, schema_version) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (int(bill_id), change_hash, fetched_at or time.time(), _encode(bill), SCHEMA_VERSION),
+            )
+            if not self._batch_depth:
+                conn.commit()
+
+    def get_derived(self, bill_id, change_hash) -> Optional[Dict[str, str]]:
+        """Rendered sheet fields for a bill, if they were rendered from this change_hash."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT change_hash, version, fields FROM derived WHERE bill_id = ?", (int(bill_id),)
+            ).fetchone()
+        if row is None or row[0] != change_hash or row[1] != DERIVED_VERSION:
+            return None
+        return json.loads(row[2])
+
+    def put_derived(self, bill_id, change_hash, fields):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO derived (bill_id, change_hash, version, fields) VALUES (?, ?, ?, ?)",
+                (int(bill_id), change_hash, DERIVED_VERSION, json.dumps(fields, separators=(",", ":"))),
+            )
+            if not self._batch_depth:
+                conn.commit()
+
+    def get_history_cursor(self, bill_id) -> Optional[Tuple[int, int, str]]:
+        """
+        (previous_seen, seen, change_hash) for a bill: the history events reported when the
+        cursor moved to change_hash are previous_seen up to seen. None if it never moved.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT previous_seen, seen, change_hash FROM history_cursor WHERE bill_id = ?", (int(bill_id),)
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else None
+
+    def set_history_cursor(self, bill_id, previous_seen, seen, change_hash):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO history_cursor (bill_id, previous_seen, seen, change_hash) VALUES (?, ?, ?, ?)",
+                (int(bill_id), int(previous_seen), int(seen), change_hash),
+            )
+            if not self._batch_depth:
+                conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM bills").fetchone()[0]
+
+    def evict(self, keep_ids: Iterable[Any], max_rows: int) -> int:
+        """Delete the oldest bills outside keep_ids until at most max_rows remain."""
+        keep = {int(bill_id) for bill_id in keep_ids}
+        with self._lock:
+            conn = self._connect()
+            excess = self.count() - max_rows
+            if excess <= 0:
+                return 0
+            with conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (bill_id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM keep_ids")
+                conn.executemany("INSERT OR IGNORE INTO keep_ids (bill_id) VALUES (?)", [(i,) for i in keep])
+                cursor = conn.execute(
+                    "DELETE FROM bills WHERE bill_id IN ("
+                    "SELECT bill_id FROM bills WHERE bill_id NOT IN (SELECT bill_id FROM keep_ids) "
+                    "ORDER BY fetched_at LIMIT ?)",
+                    (excess,),
+                )
+                removed = cursor.rowcount
+                conn.execute("DELETE FROM derived WHERE bill_id NOT IN (SELECT bill_id FROM bills)")
+                conn.execute("DELETE FROM history_cursor WHERE bill_id NOT IN (SELECT bill_id FROM bills)")
+        logger.info("Evicted %d untracked bill(s) from %s", removed, self.path)
+        return removed
+
+    def migrate_directory(self, directory) -> int:
+        """One-time import of the legacy cache/bills/<bill_id>.json files, removing the directory after."""
+        with self._lock:
+            conn = self._connect()
+            if conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone():
+                return 0
+            imported = 0
+            if os.path.isdir(directory):
+                with conn:
+                    for name in os.listdir(directory):
+                        if not name.endswith(".json"):
+                            continue
+                        path = os.path.join(directory, name)
+                        try:
+                            with open(path, "r") as handle:
+                                cached = json.load(handle)
+                            bill_id = int(name[:-len(".json")])
+                        except Exception:
+                            logger.warning("Skipping unreadable bill cache file %s", path)
+                            continue
+                        conn.execute(
+                            "INSERT OR IGNORE INTO bills (bill_id, change_hash, fetched_at, payload, schema_version) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (bill_id, cached.get("change_hash"), os.path.getmtime(path), _encode(cached.get("bill") or {}),
+                             SCHEMA_VERSION),
+                        )
+                        imported += 1
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(time.time()),))
+        if os.path.isdir(directory):
+            shutil.rmtree(directory, ignore_errors=True)
+        logger.info("Migrated %d bill cache file(s) from %s into %s", imported, directory, self.path)
+        return imported
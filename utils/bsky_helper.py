@@ -1,10 +1,13 @@
 import logging
 import os
 import re
+import threading
 import time
 from textwrap import wrap
 
+from atproto import Client, SessionEvent
 from atproto_client import models
+from atproto_client.exceptions import BadRequestError, LoginRequiredError, UnauthorizedError
 
 from utils.config import CACHE_DIR
 
@@ -13,6 +16,9 @@ logger = logging.getLogger(__name__)
 BSKY_POST_MIN_INTERVAL = float(os.environ.get("BSKY_POST_MIN_INTERVAL", "60"))
 _last_bsky_post_ts = None
 _bsky_marker_path = os.path.join(CACHE_DIR, "bsky-last-post.txt")
+BSKY_SESSION_FILE = os.path.join(CACHE_DIR, "bsky-session.txt")
+# XRPC errors that mean the stored tokens are no good, rather than the request itself
+AUTH_ERRORS = {"ExpiredToken", "InvalidToken", "AuthenticationRequired", "AuthMissing"}
 
 
 def _load_last_post_time():
@@ -50,6 +56,107 @@ def throttle_before_post():
             time.sleep(wait)
     _save_last_post_time(time.time())
 
+def is_auth_rejection(error):
+    if isinstance(error, (UnauthorizedError, LoginRequiredError)):
+        return True
+    if isinstance(error, BadRequestError) and error.response is not None:
+        content = error.response.content
+        code = content.get("error") if isinstance(content, dict) else getattr(content, "error", None)
+        return code in AUTH_ERRORS
+    return False
+
+
+class BskySession:
+    """
+    One logged-in atproto Client shared by every post. Its session string is saved to
+    CACHE_DIR whenever it is created or refreshed, so later runs resume it with a single
+    profile lookup instead of logging in; a password login only happens when there is no
+    session or the server rejects it.
+    """
+
+    def __init__(self, path=BSKY_SESSION_FILE, client_factory=Client):
+        self.path = path
+        self.client_factory = client_factory
+        self._lock = threading.RLock()
+        self._client = None
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._resume() or self._login()
+            return self._client
+
+    def run(self, action):
+        """Call action(client), logging in again and retrying once if the session is rejected."""
+        with self._lock:
+            try:
+                return action(self.client())
+            except Exception as e:
+                if not is_auth_rejection(e):
+                    raise
+                logger.info("Bluesky session rejected (%s); logging in again", e)
+                self.invalidate()
+                return action(self.client())
+
+    def invalidate(self):
+        with self._lock:
+            self._client = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _new_client(self):
+        client = self.client_factory()
+        client.on_session_change(self._on_session_change)
+        return client
+
+    def _resume(self):
+        try:
+            with open(self.path, "r") as handle:
+                session_string = handle.read().strip()
+        except FileNotFoundError:
+            return None
+        if not session_string:
+            return None
+        client = self._new_client()
+        try:
+            # the profile lookup sets client.me, which send_post needs, and proves the session still works;
+            # the client refreshes the tokens before they expire
+            client.login(session_string=session_string)
+        except Exception as e:
+            # a garbled session file or rejected tokens need a new login; a timeout or server
+            # error does not, and a password login would spend the tightly limited createSession
+            if not (is_auth_rejection(e) or isinstance(e, ValueError)):
+                raise
+            logger.warning("Stored Bluesky session is unusable; logging in again", exc_info=True)
+            return None
+        logger.debug("Resumed Bluesky session from %s", self.path)
+        return client
+
+    def _login(self):
+        client = self._new_client()
+        client.login(os.environ.get("bsky_user"), os.environ.get("bsky_pass"))
+        logger.info("Logged in to Bluesky")
+        return client
+
+    def _on_session_change(self, event, session):
+        if event not in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as handle:
+                handle.write(session.export())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            logger.warning("Unable to persist Bluesky session to %s", self.path, exc_info=True)
+
+
+bsky_session = BskySession()
+
+
 def parse_links(text):
     facets = []
     url_regex = r"[$|\W](https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*[-a-zA-Z0-9@%_\+~#//=])?)"
@@ -81,9 +188,9 @@ def send_skeet(text, bsky):
     lines = setup_skeets(0, lines)
 
     # send tweets. thread where needed
+    response = None
     try:
         print("trying to send skeet")
-        response = None
         for l in lines:
             facets = parse_links(l)
             if response is not None:
@@ -97,6 +204,9 @@ def send_skeet(text, bsky):
                 throttle_before_post()
                 response = bsky.send_post(text=l, facets=facets)
     except Exception as e:
+        # a rejected session before anything was posted is retried after logging in again
+        if response is None and is_auth_rejection(e):
+            raise
         print("error sending skeet", e)
 
 # recursive function for spliting up tweets
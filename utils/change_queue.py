@@ -1,88 +1,382 @@
+import gzip
+import heapq
 import json
 import logging
 import os
+import threading
 import time
-import uuid
 import hashlib
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from utils.config import CACHE_DIR
+from utils.config import CACHE_DIR, CHANGE_HOT_DAYS, CHANGE_LOG_COMPACT_AFTER
 
 logger = logging.getLogger(__name__)
 
+# legacy single-array queue and single archive segment; both are migrated on first use
 QUEUE_FILE = os.path.join(CACHE_DIR, "change_queue.json")
+LEGACY_ARCHIVE_FILE = os.path.join(CACHE_DIR, "change_archive.jsonl")
+LOG_FILE = os.path.join(CACHE_DIR, "change_log.jsonl")
+ARCHIVE_DIR = os.path.join(CACHE_DIR, "change_archive")
+FINGERPRINT_FILE = os.path.join(CACHE_DIR, "change_fingerprints.txt")
 RSS_FILE = os.path.join(CACHE_DIR, "changes.rss")
+# serializes appends, compaction and tail reads between worksheet workers
+_queue_lock = threading.RLock()
+
+
+class _LogState:
+    """
+    What has been read of the live log so far: the byte offset, the changes it holds (every
+    pending change plus processed ones inside the hot window), how many were marked
+    processed since the last compaction, when the oldest processed one was created and the
+    feed filter index over them.
+    """
+
+    def __init__(self):
+        self.fingerprints = None
+        self.reset(None)
+
+    def reset(self, file_id):
+        self.file_id = file_id
+        self.offset = 0
+        self.changes = {}
+        self.marked = 0
+        self.oldest_processed = None
+        # (filter, value) -> keys of the changes that match, in log order
+        self.index = {}
+
+
+_state = _LogState()
 
 
 def _ensure_dir(path: str) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
 
-def load_queue() -> List[Dict[str, Any]]:
+def _change_key(change: Dict[str, Any]) -> str:
+    return change.get("id") or change.get("fingerprint") or json.dumps(change, sort_keys=True)
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _append_lines(path: str, lines: List[str]) -> None:
+    _ensure_dir(path)
+    with open(path, "a") as handle:
+        handle.write("".join(lines))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _hot_cutoff() -> float:
+    return time.time() - CHANGE_HOT_DAYS * 24 * 60 * 60
+
+
+def _archive_path(created_at: float) -> str:
+    return os.path.join(ARCHIVE_DIR, time.strftime("changes-%Y-%m.jsonl.gz", time.gmtime(created_at)))
+
+
+def _archive(changes: List[Dict[str, Any]]) -> None:
+    """Append changes to the gzip archive of the month they were created in, one gzip member per call."""
+    by_path = {}
+    for change in changes:
+        by_path.setdefault(_archive_path(change.get("created_at", 0)), []).append(change)
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    for path, batch in by_path.items():
+        with gzip.open(path, "at") as handle:
+            handle.write("".join(_dumps(change) for change in batch))
+
+
+def query_archive(since: Optional[float] = None, until: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Archived changes created in [since, until), read on demand from only the months that overlap."""
     try:
-        with open(QUEUE_FILE, "r") as handle:
-            return json.load(handle)
+        names = sorted(os.listdir(ARCHIVE_DIR))
     except FileNotFoundError:
-        return []
-    except Exception:
-        logger.exception("Unable to read change queue from %s", QUEUE_FILE)
-        return []
+        return
+    first = _archive_path(since) if since is not None else None
+    last = _archive_path(until) if until is not None else None
+    for name in names:
+        path = os.path.join(ARCHIVE_DIR, name)
+        if (first and path < first) or (last and path > last):
+            continue
+        try:
+            with gzip.open(path, "rt") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    change = json.loads(line)
+                    created_at = change.get("created_at", 0)
+                    if (since is None or created_at >= since) and (until is None or created_at < until):
+                        yield change
+        except Exception:
+            logger.exception("Unable to read change archive %s", path)
 
 
-def save_queue(queue: List[Dict[str, Any]]) -> None:
-    _ensure_dir(QUEUE_FILE)
+def _note_processed(change: Dict[str, Any]) -> None:
+    created_at = change.get("created_at", 0)
+    if _state.oldest_processed is None or created_at < _state.oldest_processed:
+        _state.oldest_processed = created_at
+
+
+def _apply(record: Dict[str, Any]) -> None:
+    if record.get("op") == "processed":
+        for change_id in record.get("ids", []):
+            change = _state.changes.get(change_id)
+            if change is not None and not change.get("processed_at"):
+                change["processed_at"] = record.get("processed_at")
+                _state.marked += 1
+                _note_processed(change)
+    elif record.get("op") == "add":
+        change = record["change"]
+        key = _change_key(change)
+        if key in _state.changes:
+            return
+        _state.changes[key] = change
+        if change.get("processed_at"):
+            _note_processed(change)
+        for index_key in _index_keys(change):
+            _state.index.setdefault(index_key, []).append(key)
+
+
+def _normalize_filter(value: Any) -> str:
+    return " ".join(str(value or "").replace("-", " ").replace("_", " ").lower().split())
+
+
+def worksheet_tags(worksheet: Any) -> List[str]:
+    """Feed filter values for a worksheet name: its stance (anti or pro) and rollover for rollover tabs."""
+    name = str(worksheet or "").lower()
+    tags = ["rollover"] if "rollover" in name else []
+    if "anti" in name:
+        tags.append("anti")
+    elif "pro" in name:
+        tags.append("pro")
+    return tags
+
+
+def _index_keys(change: Dict[str, Any]) -> List[Tuple[str, str]]:
+    keys = [("state", _normalize_filter(change.get("state"))), ("change_type", _normalize_filter(change.get("change_type")))]
+    keys.extend(("worksheet", tag) for tag in worksheet_tags(change.get("worksheet")))
+    return keys
+
+
+def _filter_buckets(filters: Dict[str, str]) -> List[List[str]]:
+    return [_state.index.get((name, _normalize_filter(value)), []) for name, value in sorted(filters.items()) if value]
+
+
+def _refresh() -> None:
+    """Read whatever was appended to the live log since the last call; start over if it was replaced."""
+    _migrate_legacy_files()
     try:
-        with open(QUEUE_FILE, "w") as handle:
-            json.dump(queue, handle, indent=2)
+        stat = os.stat(LOG_FILE)
+    except FileNotFoundError:
+        _state.reset(None)
+        return
+    file_id = (stat.st_dev, stat.st_ino)
+    if file_id != _state.file_id or stat.st_size < _state.offset:
+        _state.reset(file_id)
+    if stat.st_size == _state.offset:
+        return
+    with open(LOG_FILE, "rb") as handle:
+        handle.seek(_state.offset)
+        data = handle.read()
+    # a line still being written has no newline yet; leave it for the next read
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            _apply(json.loads(line))
+        except Exception:
+            logger.exception("Skipping unreadable change log record")
+    _state.offset += end
+
+
+def _fingerprints() -> set:
+    """Fingerprints of the hot tier; older changes are archived and no longer deduplicated against."""
+    if _state.fingerprints is None:
+        try:
+            with open(FINGERPRINT_FILE, "r") as handle:
+                _state.fingerprints = {line.strip() for line in handle if line.strip()}
+        except FileNotFoundError:
+            _state.fingerprints = {c.get("fingerprint") for c in _state.changes.values()} - {None}
+    return _state.fingerprints
+
+
+def _migrate_legacy_files() -> None:
+    if os.path.exists(LEGACY_ARCHIVE_FILE):
+        try:
+            with open(LEGACY_ARCHIVE_FILE, "r") as handle:
+                _archive([json.loads(line) for line in handle if line.strip()])
+            os.remove(LEGACY_ARCHIVE_FILE)
+        except Exception:
+            logger.exception("Unable to migrate %s to %s", LEGACY_ARCHIVE_FILE, ARCHIVE_DIR)
+    if not os.path.exists(QUEUE_FILE) or os.path.exists(LOG_FILE):
+        return
+    try:
+        with open(QUEUE_FILE, "r") as handle:
+            legacy = json.load(handle)
+        _write_segments(legacy)
+        os.remove(QUEUE_FILE)
     except Exception:
-        logger.exception("Unable to write change queue to %s", QUEUE_FILE)
+        logger.exception("Unable to migrate %s to %s", QUEUE_FILE, LOG_FILE)
+        return
+    logger.info("Migrated %d queued change(s) from %s to %s", len(legacy), QUEUE_FILE, LOG_FILE)
+
+
+def _write_segments(queue: List[Dict[str, Any]]) -> int:
+    """
+    Archive processed changes older than the hot window and replace the live log and the
+    fingerprint index with everything else. Returns how many changes were archived.
+    """
+    cutoff = _hot_cutoff()
+    cold = [c for c in queue if c.get("processed_at") and c.get("created_at", 0) < cutoff]
+    hot = [c for c in queue if not (c.get("processed_at") and c.get("created_at", 0) < cutoff)]
+    if cold:
+        _archive(cold)
+    for path, lines in (
+        (LOG_FILE, [_dumps({"op": "add", "change": change}) for change in hot]),
+        (FINGERPRINT_FILE, [f"{change['fingerprint']}\n" for change in hot if change.get("fingerprint")]),
+    ):
+        _ensure_dir(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as handle:
+            handle.write("".join(lines))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    _state.fingerprints = None
+    return len(cold)
+
+
+def _compaction_due() -> bool:
+    """Enough processed markers have built up, or a processed change has aged out of the hot window."""
+    if _state.marked >= CHANGE_LOG_COMPACT_AFTER:
+        return True
+    return _state.oldest_processed is not None and _state.oldest_processed < _hot_cutoff()
+
+
+def compact() -> int:
+    """
+    Fold processed markers into the changes they mark and roll processed changes older than
+    CHANGE_HOT_DAYS into the dated archives. Returns how many changes were archived.
+    """
+    with _queue_lock:
+        _refresh()
+        try:
+            moved = _write_segments(list(_state.changes.values()))
+        except Exception:
+            logger.exception("Unable to compact change log %s", LOG_FILE)
+            return 0
+        _refresh()
+    logger.info("Compacted %s; archived %d processed change(s) into %s", LOG_FILE, moved, ARCHIVE_DIR)
+    return moved
+
+
+def load_queue() -> List[Dict[str, Any]]:
+    """The hot tier: every pending change and processed changes inside CHANGE_HOT_DAYS, oldest first."""
+    with _queue_lock:
+        _refresh()
+        return [dict(change) for change in _state.changes.values()]
+
+
+def queue_version(filters: Optional[Dict[str, str]] = None) -> Tuple[str, float]:
+    """
+    A token that changes whenever changes matching the filters (state, worksheet,
+    change_type) are added or the log is compacted, and the log's modification time.
+    """
+    with _queue_lock:
+        _refresh()
+        buckets = _filter_buckets(filters or {}) or [_state.changes]
+        sizes = "-".join(f"{len(bucket):x}" for bucket in buckets)
+        try:
+            stat = os.stat(LOG_FILE)
+        except FileNotFoundError:
+            return "empty", 0.0
+    return f"{stat.st_ino:x}-{sizes}", stat.st_mtime
+
+
+def filtered_changes(filters: Optional[Dict[str, str]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    """The newest hot-tier changes matching every filter given, read from the filter index."""
+    with _queue_lock:
+        _refresh()
+        buckets = _filter_buckets(filters or {})
+        if buckets:
+            smallest = min(buckets, key=len)
+            others = [set(bucket) for bucket in buckets if bucket is not smallest]
+            candidates = [_state.changes[key] for key in smallest if all(key in other for other in others)]
+        else:
+            candidates = _state.changes.values()
+        return [dict(change) for change in heapq.nlargest(limit, candidates, key=lambda c: c.get("created_at", 0))]
+
+
+def save_queue(queue: List[Dict[str, Any]]) -> None:
+    """Replace the hot tier; prefer append_changes and mark_changes_processed."""
+    with _queue_lock:
+        try:
+            _write_segments(queue)
+        except Exception:
+            logger.exception("Unable to write change queue to %s", LOG_FILE)
+        _refresh()
 
 
 def append_changes(changes: List[Dict[str, Any]]) -> int:
     if not changes:
         return 0
-    queue = load_queue()
-    fingerprints = {c.get("fingerprint") for c in queue}
-    added = 0
-    for change in changes:
-        fp = change.get("fingerprint")
-        if fp in fingerprints:
-            continue
-        queue.append(change)
-        fingerprints.add(fp)
-        added += 1
-    save_queue(queue)
-    return added
+    with _queue_lock:
+        _refresh()
+        fingerprints = _fingerprints()
+        fresh = []
+        for change in changes:
+            fp = change.get("fingerprint")
+            if fp in fingerprints:
+                continue
+            fresh.append(change)
+            fingerprints.add(fp)
+        if fresh:
+            try:
+                _append_lines(LOG_FILE, [_dumps({"op": "add", "change": change}) for change in fresh])
+                _append_lines(FINGERPRINT_FILE, [f"{change['fingerprint']}\n" for change in fresh if change.get("fingerprint")])
+            except Exception:
+                logger.exception("Unable to append to change log %s", LOG_FILE)
+            _refresh()
+        due = _compaction_due()
+    if due:
+        compact()
+    return len(fresh)
 
 
 def get_pending_changes() -> List[Dict[str, Any]]:
-    return [c for c in load_queue() if not c.get("processed_at")]
+    with _queue_lock:
+        _refresh()
+        return [dict(c) for c in _state.changes.values() if not c.get("processed_at")]
 
 
 def mark_changes_processed(change_ids: List[str]) -> None:
     if not change_ids:
         return
-    queue = load_queue()
-    now = time.time()
-    updated = False
-    for change in queue:
-        if change.get("id") in change_ids and not change.get("processed_at"):
-            change["processed_at"] = now
-            updated = True
-    if updated:
-        save_queue(queue)
+    with _queue_lock:
+        _refresh()
+        ids = [cid for cid in dict.fromkeys(change_ids) if cid in _state.changes and not _state.changes[cid].get("processed_at")]
+        if not ids:
+            return
+        try:
+            _append_lines(LOG_FILE, [_dumps({"op": "processed", "ids": ids, "processed_at": time.time()})])
+        except Exception:
+            logger.exception("Unable to append to change log %s", LOG_FILE)
+            return
+        _refresh()
+        due = _compaction_due()
+    if due:
+        compact()
 
 
 def _format_rss_date(ts: float) -> str:
     return time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime(ts))
 
 
-def build_rss_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None, limit: int = 100) -> str:
+def _feed_items(changes: List[Dict[str, Any]], base_url: Optional[str], limit: int) -> List[Dict[str, Any]]:
     items = []
-    sorted_changes = sorted(changes, key=lambda c: c.get("created_at", 0), reverse=True)[:limit]
-    for change in sorted_changes:
-        title = f"{change.get('change_type', 'update').title()}: {change.get('state')} {change.get('bill_number')}"
-        link = change.get("url") or (base_url or "").rstrip("/") or "#"
+    for change in heapq.nlargest(limit, changes, key=lambda c: c.get("created_at", 0)):
         description_lines = []
         if change.get("title"):
             description_lines.append(change["title"])
@@ -92,15 +386,25 @@ def build_rss_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None
             description_lines.append(f"Bill Type: {change['bill_type']}")
         for f in change.get("changed_fields", []):
             description_lines.append(f"{f.get('field')}: {f.get('old', '')} -> {f.get('new', '')}")
-        description = "\n".join(description_lines)
-        pub_date = _format_rss_date(change.get("created_at", time.time()))
-        guid = change.get("id") or hashlib.sha256(json.dumps(change, sort_keys=True).encode("utf-8")).hexdigest()
+        items.append({
+            "title": f"{change.get('change_type', 'update').title()}: {change.get('state')} {change.get('bill_number')}",
+            "link": change.get("url") or (base_url or "").rstrip("/") or "#",
+            "description": "\n".join(description_lines),
+            "created_at": change.get("created_at", time.time()),
+            "guid": change.get("id") or hashlib.sha256(json.dumps(change, sort_keys=True).encode("utf-8")).hexdigest(),
+        })
+    return items
+
+
+def build_rss_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None, limit: int = 100) -> str:
+    items = []
+    for item in _feed_items(changes, base_url, limit):
         items.append(
-            f"<item><title>{_escape_xml(title)}</title>"
-            f"<link>{_escape_xml(link)}</link>"
-            f"<guid isPermaLink=\"false\">{guid}</guid>"
-            f"<pubDate>{pub_date}</pubDate>"
-            f"<description>{_escape_xml(description)}</description></item>"
+            f"<item><title>{_escape_xml(item['title'])}</title>"
+            f"<link>{_escape_xml(item['link'])}</link>"
+            f"<guid isPermaLink=\"false\">{item['guid']}</guid>"
+            f"<pubDate>{_format_rss_date(item['created_at'])}</pubDate>"
+            f"<description>{_escape_xml(item['description'])}</description></item>"
         )
     channel_title = "LegiAlerts Changes"
     channel_link = (base_url or "").rstrip("/") or "#"
@@ -116,6 +420,57 @@ def build_rss_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None
     return rss
 
 
+def _format_iso_date(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def build_atom_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None, limit: int = 100) -> str:
+    items = _feed_items(changes, base_url, limit)
+    channel_link = (base_url or "").rstrip("/") or "#"
+    updated = _format_iso_date(max((item["created_at"] for item in items), default=0))
+    entries = []
+    for item in items:
+        entries.append(
+            f"<entry><title>{_escape_xml(item['title'])}</title>"
+            f"<link href=\"{_escape_xml(item['link'])}\"/>"
+            f"<id>urn:legialerts:{_escape_xml(item['guid'])}</id>"
+            f"<updated>{_format_iso_date(item['created_at'])}</updated>"
+            f"<summary>{_escape_xml(item['description'])}</summary></entry>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>{_escape_xml('LegiAlerts Changes')}</title>"
+        f"<link href=\"{_escape_xml(channel_link)}\"/>"
+        "<id>urn:legialerts:changes</id>"
+        f"<updated>{updated}</updated>"
+        + "".join(entries) +
+        "</feed>"
+    )
+
+
+def build_json_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None, limit: int = 100) -> str:
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": "LegiAlerts Changes",
+        "home_page_url": (base_url or "").rstrip("/") or None,
+        "description": "Recent tracked bill changes",
+        "items": [
+            {
+                "id": item["guid"],
+                "url": item["link"],
+                "title": item["title"],
+                "content_text": item["description"],
+                "date_published": _format_iso_date(item["created_at"]),
+            }
+            for item in _feed_items(changes, base_url, limit)
+        ],
+    }
+    if feed["home_page_url"] is None:
+        del feed["home_page_url"]
+    return json.dumps(feed)
+
+
 def write_rss_feed(changes: List[Dict[str, Any]], base_url: Optional[str] = None) -> None:
     content = build_rss_feed(changes, base_url=base_url)
     _ensure_dir(RSS_FILE)
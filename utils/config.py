@@ -20,11 +20,19 @@ LOG_FILE = os.environ.get("LOG_FILE", str(CACHE_DIR / "legialerts.log"))
 Path(LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
 
 LEGISCAN_MIN_INTERVAL = float(os.environ.get("LEGISCAN_MIN_INTERVAL", "0"))
+LEGISCAN_MAX_WORKERS = int(os.environ.get("LEGISCAN_MAX_WORKERS", "4"))
 REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", "30"))
 SEARCH_CACHE_TTL = int(os.environ.get("SEARCH_CACHE_TTL", "3600"))
 SOCIAL_ENABLED = _as_bool(os.environ.get("SOCIAL_ENABLED"), default=True)
 EMAIL_ENABLED = _as_bool(os.environ.get("EMAIL_ENABLED"), default=False)
 ALLOW_ANONYMOUS_API = _as_bool(os.environ.get("API_ALLOW_ANONYMOUS"), default=False)
+DATASET_INGEST_ENABLED = _as_bool(os.environ.get("DATASET_INGEST_ENABLED"), default=False)
+POLL_HOT_INTERVAL = int(os.environ.get("POLL_HOT_INTERVAL", "0"))
+POLL_WARM_INTERVAL = int(os.environ.get("POLL_WARM_INTERVAL", "3600"))
+POLL_DORMANT_INTERVAL = int(os.environ.get("POLL_DORMANT_INTERVAL", "86400"))
+POLL_HOT_DAYS = int(os.environ.get("POLL_HOT_DAYS", "7"))
+CHANGE_LOG_COMPACT_AFTER = int(os.environ.get("CHANGE_LOG_COMPACT_AFTER", "500"))
+CHANGE_HOT_DAYS = int(os.environ.get("CHANGE_HOT_DAYS", "30"))
 
 
 def load_service_account_credentials() -> Dict:
@@ -0,0 +1,182 @@
+import base64
+import binascii
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List
+
+from dotenv import load_dotenv
+
+from utils.config import CACHE_DIR
+
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
+legi_key = os.environ.get('legiscan_key')
+Dataset_List_URL = f"https://api.legiscan.com/?key={legi_key}&op=getDatasetList&year="
+Dataset_URL = f"https://api.legiscan.com/?key={legi_key}&op=getDataset&id="
+logger = logging.getLogger(__name__)
+
+DATASET_LIST_REFRESH_SECONDS = 24 * 60 * 60
+DATASET_STATE_FILE = os.path.join(CACHE_DIR, "datasets.json")
+
+
+class DatasetError(Exception):
+    """Raised when a dataset archive fails verification."""
+
+
+def _dataset_list_path(year):
+    return os.path.join(CACHE_DIR, f"datasets-{year}.json")
+
+
+def _parse_response(response, context):
+    try:
+        data = response.json()
+    except Exception:
+        logger.exception("Failed to parse LegiScan JSON for %s", context)
+        return None
+    status = data.get("status")
+    if status and status != "OK":
+        logger.error("LegiScan error for %s: %s", context, data.get("alert", {}).get("message", data))
+        return None
+    return data
+
+
+def load_dataset_state() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(DATASET_STATE_FILE, "r") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.exception("Unable to read dataset state from %s", DATASET_STATE_FILE)
+        return {}
+
+
+def save_dataset_state(state: Dict[str, Dict[str, Any]]) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        with open(DATASET_STATE_FILE, "w") as handle:
+            json.dump(state, handle)
+    except Exception:
+        logger.exception("Unable to write dataset state to %s", DATASET_STATE_FILE)
+
+
+def get_dataset_list(year, request_fn) -> List[Dict[str, Any]]:
+    """Return the getDatasetList entries for a year, cached for a day."""
+    list_path = _dataset_list_path(year)
+    if os.path.exists(list_path) and os.path.getmtime(list_path) > time.time() - DATASET_LIST_REFRESH_SECONDS:
+        try:
+            with open(list_path, "r") as handle:
+                return json.load(handle)
+        except Exception:
+            logger.warning("Dataset list cache unreadable; refetching %s", list_path)
+    data = _parse_response(request_fn(Dataset_List_URL + str(year)), f"getDatasetList year={year}")
+    if not data or "datasetlist" not in data:
+        logger.error("Missing dataset list for year=%s", year)
+        return []
+    datasets = data["datasetlist"]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(list_path, "w") as handle:
+        json.dump(datasets, handle)
+    return datasets
+
+
+def decode_dataset(dataset: Dict[str, Any], expected_hash: str) -> bytes:
+    """
+    Decode a getDataset payload and verify it is the archive version we asked for.
+    Checks the dataset_hash against getDatasetList, the decoded size and every member CRC.
+    """
+    if expected_hash and dataset.get("dataset_hash") != expected_hash:
+        raise DatasetError(
+            f"dataset_hash mismatch for session {dataset.get('session_id')}: "
+            f"expected {expected_hash}, got {dataset.get('dataset_hash')}"
+        )
+    try:
+        archive = base64.b64decode(dataset.get("zip") or "", validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise DatasetError(f"Dataset zip is not valid base64: {exc}") from exc
+    expected_size = dataset.get("dataset_size")
+    if expected_size and int(expected_size) != len(archive):
+        raise DatasetError(f"Dataset size mismatch: expected {expected_size}, got {len(archive)}")
+    try:
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            bad_member = zf.testzip()
+    except zipfile.BadZipFile as exc:
+        raise DatasetError(f"Dataset is not a valid zip archive: {exc}") from exc
+    if bad_member is not None:
+        raise DatasetError(f"Dataset member failed CRC check: {bad_member}")
+    return archive
+
+
+def iter_dataset_bills(archive: bytes) -> Iterator[Dict[str, Any]]:
+    """Yield every getBill payload stored under <STATE>/<session>/bill/ in a dataset archive."""
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        for name in zf.namelist():
+            parts = name.split("/")
+            if len(parts) < 2 or parts[-2] != "bill" or not name.endswith(".json"):
+                continue
+            try:
+                payload = json.loads(zf.read(name))
+            except Exception:
+                logger.warning("Skipping unreadable dataset member %s", name)
+                continue
+            bill = payload.get("bill") if isinstance(payload, dict) else None
+            if bill and bill.get("bill_id") is not None:
+                yield bill
+
+
+def _dataset_timestamp(dataset: Dict[str, Any]) -> float:
+    try:
+        return datetime.strptime(str(dataset.get("dataset_date")), "%Y-%m-%d").timestamp()
+    except ValueError:
+        return 0.0
+
+
+def ingest_datasets(
+    year,
+    request_fn,
+    save_fn: Callable[[Any, str, Dict[str, Any], float], bool],
+) -> int:
+    """
+    Bulk load bills from every dataset archive for a year whose dataset_hash we have not ingested yet.
+    save_fn(bill_id, change_hash, bill, dataset_ts) stores one bill and returns True if it was written.
+    Returns the number of bills written.
+    """
+    state = load_dataset_state()
+    written = 0
+    for entry in get_dataset_list(year, request_fn):
+        s_id = entry.get("session_id")
+        dataset_hash = entry.get("dataset_hash")
+        if s_id is None or not entry.get("access_key"):
+            continue
+        if state.get(str(s_id), {}).get("dataset_hash") == dataset_hash:
+            logger.debug("Dataset already ingested for session_id=%s", s_id)
+            continue
+        logger.info("Fetching dataset for session_id=%s (%s)", s_id, entry.get("session_name"))
+        url = f"{Dataset_URL}{s_id}&access_key={entry['access_key']}"
+        data = _parse_response(request_fn(url), f"getDataset session_id={s_id}")
+        if not data or "dataset" not in data:
+            logger.error("Missing dataset payload for session_id=%s", s_id)
+            continue
+        try:
+            archive = decode_dataset(data["dataset"], dataset_hash)
+        except DatasetError as exc:
+            logger.error("Rejecting dataset for session_id=%s: %s", s_id, exc)
+            continue
+        dataset_ts = _dataset_timestamp(data["dataset"])
+        session_written = 0
+        for bill in iter_dataset_bills(archive):
+            if save_fn(bill["bill_id"], bill.get("change_hash"), bill, dataset_ts):
+                session_written += 1
+        logger.info("Ingested %d bill(s) from dataset session_id=%s", session_written, s_id)
+        written += session_written
+        state[str(s_id)] = {
+            "dataset_hash": dataset_hash,
+            "dataset_date": entry.get("dataset_date"),
+            "ingested_at": time.time(),
+        }
+        save_dataset_state(state)
+    return written
@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Hashable, Optional
+
+FEED_CACHE_MAX_ENTRIES = 128
+
+
+class CachedFeed:
+    """One rendered feed: the body, its gzip copy and the validators sent with it."""
+
+    def __init__(self, version: str, body: bytes, last_modified: float):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip.compress(body, mtime=0)
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        # each encoding is its own representation, so a cache never validates one against the other
+        self.gzip_etag = self.etag[:-1] + '-gzip"'
+        # HTTP dates have one-second resolution
+        self.last_modified = int(last_modified)
+        self.last_modified_header = formatdate(self.last_modified, usegmt=True)
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str], gzipped: bool = False) -> bool:
+        """
+        Whether a conditional GET for the identity or gzip body can be answered with 304;
+        If-None-Match wins when both are sent.
+        """
+        if if_none_match:
+            etag = self.gzip_etag if gzipped else self.etag
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if if_modified_since:
+            try:
+                return self.last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class FeedCache:
+    """
+    Rendered feeds keyed by variant (format, filters, base URL). An entry is rebuilt only
+    when the change queue's version moves; the least recently used entries are dropped.
+    """
+
+    def __init__(self, max_entries: int = FEED_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable, version: str, last_modified: float, render: Callable[[], str]) -> CachedFeed:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                return entry
+        entry = CachedFeed(version, render().encode("utf-8"), last_modified)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
@@ -0,0 +1,101 @@
+import logging
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+MASTER_LIST_SCHEMA = pa.schema(
+    [
+        ("bill_id", pa.int64()),
+        ("number", pa.string()),
+        ("change_hash", pa.string()),
+        ("url", pa.string()),
+        ("status_date", pa.string()),
+        ("status", pa.int64()),
+        ("last_action_date", pa.string()),
+        ("last_action", pa.string()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("session_special", pa.int64()),
+        ("session_id", pa.int64()),
+    ]
+)
+
+SESSION_SCHEMA = pa.schema(
+    [
+        ("session_id", pa.int64()),
+        ("state_id", pa.int64()),
+        ("year_start", pa.int64()),
+        ("year_end", pa.int64()),
+        ("prefile", pa.int64()),
+        ("sine_die", pa.int64()),
+        ("prior", pa.int64()),
+        ("special", pa.int64()),
+        ("session_tag", pa.string()),
+        ("session_title", pa.string()),
+        ("session_name", pa.string()),
+        ("dataset_hash", pa.string()),
+    ]
+)
+
+_PANDAS_TYPES = {pa.int64(): pd.Int64Dtype()}
+
+
+def conform_frame(df, schema):
+    """
+    Return df with exactly the schema's columns and dtypes: nullable Int64 for integers and
+    strings kept verbatim, so hashes and bill numbers never get reinterpreted as numbers.
+    Missing columns are filled with nulls and unknown ones (like a stray CSV index) dropped.
+    """
+    table = _to_table(df, schema)
+    return table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def _to_table(df, schema):
+    columns = {}
+    for field in schema:
+        if field.name in df.columns:
+            values = df[field.name]
+        else:
+            values = pd.Series([None] * len(df), index=df.index, dtype=object)
+        if pa.types.is_integer(field.type):
+            values = pd.to_numeric(values, errors="coerce").astype("Int64")
+        else:
+            values = values.astype(object).where(values.notna(), None).map(lambda v: v if v is None else str(v))
+        columns[field.name] = pa.array(values, type=field.type, from_pandas=True)
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_frame(df, path, schema):
+    # uncompressed so readers can memory-map the file; write then rename so readers never see half a file
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(_to_table(df, schema), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def read_frame(path, schema):
+    table = feather.read_table(path, memory_map=True)
+    frame = table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+    if list(frame.columns) != schema.names:
+        frame = conform_frame(frame, schema)
+    return frame
+
+
+def migrate_csv(csv_path, path, schema):
+    """Convert a legacy CSV cache file to the typed format once, keeping its mtime for age checks."""
+    if os.path.exists(path) or not os.path.exists(csv_path):
+        return False
+    try:
+        legacy = pd.read_csv(csv_path, dtype=object)
+        write_frame(legacy, path, schema)
+        mtime = os.path.getmtime(csv_path)
+        os.utime(path, (mtime, mtime))
+        os.remove(csv_path)
+    except Exception:
+        logger.exception("Unable to migrate %s to %s", csv_path, path)
+        return False
+    logger.info("Migrated %s to %s", csv_path, path)
+    return True
@@ -1,3 +1,4 @@
+import json
 import logging
 import os.path
 
@@ -6,11 +7,14 @@ import requests
 from dotenv import load_dotenv
 
 from utils.config import CACHE_DIR, REQUEST_TIMEOUT
+from utils.frame_store import SESSION_SCHEMA, conform_frame, write_frame
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
 legi_key = os.environ.get('legiscan_key')
 Session_List_URL = f"https://api.legiscan.com/?key={legi_key}&op=getSessionList"
 logger = logging.getLogger(__name__)
+SESSION_CATALOG_FILE = os.path.join(CACHE_DIR, "session_catalog.json")
+SESSION_LIST_FILE = os.path.join(CACHE_DIR, "sessions.feather")
 
 def get_sessions_dataframe(session=None, request_fn=None):
     session = session or requests.Session()
@@ -31,7 +35,70 @@ def get_sessions_dataframe(session=None, request_fn=None):
     if sessions is None:
         logger.error("LegiScan session list missing 'sessions' key. Response: %s", data)
         return pd.DataFrame()
-    df = pd.DataFrame(sessions)
+    df = conform_frame(pd.DataFrame(sessions), SESSION_SCHEMA)
     os.makedirs(CACHE_DIR, exist_ok=True)
-    df.to_csv(os.path.join(CACHE_DIR, "sessions.csv"))
+    write_frame(df, SESSION_LIST_FILE, SESSION_SCHEMA)
     return df
+
+
+def load_session_catalog():
+    try:
+        with open(SESSION_CATALOG_FILE, "r") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.exception("Unable to read session catalog from %s", SESSION_CATALOG_FILE)
+        return {}
+
+
+def save_session_catalog(catalog):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        with open(SESSION_CATALOG_FILE, "w") as handle:
+            json.dump(catalog, handle)
+    except Exception:
+        logger.exception("Unable to write session catalog to %s", SESSION_CATALOG_FILE)
+
+
+def _flag(value):
+    try:
+        return int(value or 0) == 1
+    except (TypeError, ValueError):
+        return False
+
+
+def _session_hash(session_row):
+    value = session_row.get("dataset_hash")
+    if value is None or pd.isna(value):
+        return ""
+    return str(value)
+
+
+def session_is_active(session_row):
+    return not (_flag(session_row.get("sine_die")) or _flag(session_row.get("prior")))
+
+
+def catalog_entry(session_row):
+    return {
+        "dataset_hash": _session_hash(session_row),
+        "sine_die": int(_flag(session_row.get("sine_die"))),
+        "prior": int(_flag(session_row.get("prior"))),
+    }
+
+
+def master_list_refresh_reason(session_row, cataloged, cache_age, refresh_seconds):
+    """
+    Return why a session's master list has to be refetched, or None to reuse the cached copy.
+    Sessions archived out of production (prior) are frozen once cached, sessions adjourned
+    sine die only refresh when their dataset_hash moves, and active sessions refresh on age.
+    """
+    if cache_age is None:
+        return "missing"
+    if _flag(session_row.get("prior")):
+        return None
+    if cataloged is None or cataloged.get("dataset_hash") != _session_hash(session_row):
+        return "dataset_hash changed"
+    if session_is_active(session_row) and cache_age >= refresh_seconds:
+        return "stale"
+    return None
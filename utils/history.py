@@ -1,11 +1,11 @@
 import os
 from datetime import datetime
 
-import gspread
 import pandas as pd
 from dotenv import load_dotenv
 
-from utils.config import get_sheet_key, get_tracker_years, load_service_account_credentials
+from utils import sheets
+from utils.config import get_tracker_years
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
 
@@ -38,10 +38,9 @@ def update_sheet(wks, df):
     )
 
 
-def process_worksheet(gc, year, worksheet_name, needle):
+def process_worksheet(year, worksheet_name, needle):
     try:
-        doc = gc.open_by_key(get_sheet_key(year))
-        wks = doc.worksheet(worksheet_name)
+        wks = sheets.open_worksheet(year, worksheet_name)
     except Exception as exc:
         print(f"Unable to open worksheet {worksheet_name} for {year}: {exc}")
         return
@@ -59,10 +58,9 @@ def main(needle=None, years=None):
         print("No search term provided. Exiting.")
         return
     target_years = years or get_tracker_years((2026,))
-    gc = gspread.service_account_from_dict(load_service_account_credentials())
     for year in target_years:
         for worksheet in ("Anti-LGBTQ Bills", "Pro-LGBTQ Bills", "Rollover Anti-LGBTQ Bills"):
-            process_worksheet(gc, year, worksheet, needle)
+            process_worksheet(year, worksheet, needle)
 
 
 if __name__ == "__main__":
@@ -1,31 +1,38 @@
+HISTORY_MAX_CHARS = 49000
+HISTORY_SUFFIX = ".... see more on LegiScan"
+
+
+def _join(parts):
+    # a separator only follows something already written, so leading blanks add none
+    parts = list(parts)
+    start = 0
+    while start < len(parts) and parts[start] == "":
+        start += 1
+    return ", ".join(parts[start:])
+
 def get_sponsors(list):
-    sponsors = ""
-    for s in list:
-        if sponsors != "":
-            sponsors = sponsors + ", "
-        sponsors = sponsors + s["name"]
-    return sponsors
+    return _join(s["name"] for s in list)
 
 def get_texts(list):
-    texts = ""
-    for t in list:
-        if texts != "":
-            texts = texts + ", "
-        texts = texts + t["state_link"]
-    return texts
+    return _join(t["state_link"] for t in list)
 
 def get_calendar(list):
-    calendar = ""
-    for event in list:
-        if calendar != "":
-            calendar = calendar + ", "
-        calendar = calendar + event["type"] + " " + event["date"] + " " + event["time"] + " " + event["location"]
-    return calendar
+    return _join(event["type"] + " " + event["date"] + " " + event["time"] + " " + event["location"] for event in list)
+
+def format_history_event(event):
+    return event["chamber"] + " " + event["date"] + " " + event["action"]
+
+def format_history_events(list):
+    return _join(format_history_event(event) for event in list)
 
 def get_history(list):
-    history = ""
-    for event in list:
-        if history != "":
-            history = history + ", "
-        history = history + event["chamber"] + " " + event["date"] + " " + event["action"]
-    return history[0:49000] + ".... see more on LegiScan"
+    return format_history_events(list)[0:HISTORY_MAX_CHARS] + HISTORY_SUFFIX
+
+def render_details(bill):
+    """The Sponsors, Calendar, History and PDF cell values for a getBill payload."""
+    return {
+        "Sponsors": get_sponsors(bill["sponsors"]),
+        "Calendar": get_calendar(bill["calendar"]),
+        "History": get_history(bill["history"]),
+        "PDF": get_texts(bill["texts"]),
+    }
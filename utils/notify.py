@@ -4,9 +4,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from atproto import Client as BSKYClient
-
-from utils.bsky_helper import send_skeet
+from utils.bsky_helper import bsky_session, send_skeet
 from utils.config import SOCIAL_ENABLED, EMAIL_ENABLED
 
 curr_path = os.path.dirname(__file__)
@@ -19,10 +17,8 @@ def notify_social(msg):
     if not SOCIAL_ENABLED:
         logger.info("Social notifications disabled via SOCIAL_ENABLED")
         return
-    bsky = BSKYClient()
-    bsky.login(os.environ.get('bsky_user'), os.environ.get('bsky_pass'))
     try:
-        send_skeet(msg, bsky)
+        bsky_session.run(lambda bsky: send_skeet(msg, bsky))
     except Exception as e:
         logger.exception("Unable to send social notifications: %s", e)
 
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import time
+from datetime import date, datetime
+
+import pandas as pd
+
+from utils.config import (
+    CACHE_DIR,
+    POLL_DORMANT_INTERVAL,
+    POLL_HOT_DAYS,
+    POLL_HOT_INTERVAL,
+    POLL_WARM_INTERVAL,
+)
+from utils.get_sessions import session_is_active
+
+logger = logging.getLogger(__name__)
+
+POLLING_STATE_FILE = os.path.join(CACHE_DIR, "polling_state.json")
+POLL_INTERVALS = {
+    "hot": POLL_HOT_INTERVAL,
+    "warm": POLL_WARM_INTERVAL,
+    "dormant": POLL_DORMANT_INTERVAL,
+}
+
+
+def load_polling_state():
+    try:
+        with open(POLLING_STATE_FILE, "r") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        logger.exception("Unable to read polling state from %s", POLLING_STATE_FILE)
+        return {}
+
+
+def save_polling_state(state):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        with open(POLLING_STATE_FILE, "w") as handle:
+            json.dump(state, handle)
+    except Exception:
+        logger.exception("Unable to write polling state to %s", POLLING_STATE_FILE)
+
+
+def _days_since(value, today):
+    if not value:
+        return None
+    try:
+        return (today - datetime.strptime(str(value)[:10], "%Y-%m-%d").date()).days
+    except ValueError:
+        return None
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def classify_state(session_rows, last_activity, today):
+    """Return (tier, reason) for one state's sessions and its most recent last_action_date."""
+    active = [row for row in session_rows if session_is_active(row)]
+    if not active:
+        return "dormant", "all sessions adjourned"
+    current = [row for row in active if _as_int(row.get("year_start")) <= today.year <= _as_int(row.get("year_end"))]
+    if not current:
+        return "dormant", f"no active session covers {today.year}"
+    if any(_as_int(row.get("special")) for row in current):
+        return "hot", "special session in progress"
+    days = _days_since(last_activity, today)
+    if days is None:
+        return "warm", "in session, no recorded activity"
+    if days <= POLL_HOT_DAYS:
+        return "hot", f"last action {days} day(s) ago"
+    return "warm", f"in session, last action {days} day(s) ago"
+
+
+def plan_state_polling(sessions, state_names, polling_state, now=None, today=None):
+    """
+    Give every state with a session in `sessions` a refresh tier and interval, and mark it
+    due when that interval has passed since its master lists were last refreshed.
+    """
+    now = time.time() if now is None else now
+    today = today or date.today()
+    plan = {}
+    if sessions.empty or "state_id" not in sessions.columns:
+        return plan
+    for state_id, rows in sessions.groupby("state_id"):
+        if pd.isna(state_id) or not 0 < int(state_id) <= len(state_names):
+            continue
+        name = state_names[int(state_id) - 1]
+        recorded = polling_state.get(name, {})
+        tier, reason = classify_state(rows.to_dict("records"), recorded.get("last_activity"), today)
+        interval = POLL_INTERVALS[tier]
+        last_refreshed = recorded.get("last_refreshed")
+        due = last_refreshed is None or now - last_refreshed >= interval
+        plan[name] = {
+            "tier": tier,
+            "interval": interval,
+            "due": due,
+            "reason": reason,
+            "last_refreshed": last_refreshed,
+            "last_activity": recorded.get("last_activity"),
+            "next_due": None if last_refreshed is None else last_refreshed + interval,
+        }
+    return plan
+
+
+def latest_activity(df):
+    if df is None or df.empty or "last_action_date" not in df.columns:
+        return None
+    dates = df["last_action_date"].dropna().astype(str)
+    dates = dates[dates.str.match(r"^\d{4}-\d{2}-\d{2}")]
+    if dates.empty:
+        return None
+    return dates.max()[:10]
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to one API.
+    A rate of 0 disables throttling. Callers that find the bucket empty reserve
+    the next token before sleeping, so concurrent workers queue up in order
+    instead of all waking at once.
+    """
+
+    def __init__(self, rate, capacity=1.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last = clock()
+
+    @classmethod
+    def from_min_interval(cls, min_interval, capacity=1.0, **kwargs):
+        rate = 1.0 / min_interval if min_interval and min_interval > 0 else 0.0
+        return cls(rate, capacity=capacity, **kwargs)
+
+    def acquire(self):
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -7,7 +7,6 @@ import re
 from datetime import datetime
 from typing import Iterable, List
 
-import gspread
 import pandas as pd
 import requests
 from dotenv import load_dotenv
@@ -19,10 +18,9 @@ from utils.config import (
     LEGISCAN_MIN_INTERVAL,
     REQUEST_TIMEOUT,
     SEARCH_CACHE_TTL,
-    get_sheet_key,
     get_tracker_years,
-    load_service_account_credentials,
 )
+from utils import sheets
 from utils.us_state_abbrv import abbrev_to_us_state
 
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
@@ -111,22 +109,15 @@ def legiscan_fetch(url, session):
     return data
 
 
-def load_existing_sheets(gc, years: Iterable[int]) -> List[pd.DataFrame]:
-    worksheets = ["Anti-LGBTQ Bills", "Pro-LGBTQ Bills", "Rollover Anti-LGBTQ Bills", "Rollover Pro-LGBTQ Bills"]
+def load_existing_sheets(years: Iterable[int]) -> List[pd.DataFrame]:
     frames = []
     for year in years:
         try:
-            doc = gc.open_by_key(get_sheet_key(year))
+            worksheets = sheets.read_worksheets(year)
         except Exception as exc:
             logger.warning("Unable to open sheet for year %s: %s", year, exc)
             continue
-        for worksheet in worksheets:
-            try:
-                wks = doc.worksheet(worksheet)
-            except Exception:
-                continue
-            expected_headers = wks.row_values(1)
-            frames.append(pd.DataFrame(wks.get_all_records(expected_headers=expected_headers)))
+        frames.extend(frame for _, frame in worksheets.values())
     return frames
 
 
@@ -242,8 +233,7 @@ def render_results(bills):
 def main(search_terms: List[str] = None, years: Iterable[int] = None):
     terms = search_terms or default_search_terms()
     target_years = list(years) if years is not None else get_tracker_years((2026,))
-    gc = gspread.service_account_from_dict(load_service_account_credentials())
-    existing_frames = load_existing_sheets(gc, target_years)
+    existing_frames = load_existing_sheets(target_years)
     ignore_list = load_ignore_list()
     session = create_session()
     bills = []
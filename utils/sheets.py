@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import threading
+
+import gspread
+import pandas as pd
+from google.auth.transport.requests import Request
+from gspread.utils import absolute_range_name, fill_gaps, numericise_all, rowcol_to_a1, to_records
+
+from utils.config import get_sheet_key, load_service_account_credentials
+
+logger = logging.getLogger(__name__)
+
+# the Sheets API rejects request bodies much past 2MB; stay under it with some headroom
+SHEETS_WRITE_MAX_BYTES = int(os.environ.get("SHEETS_WRITE_MAX_BYTES", str(1_500_000)))
+TRACKER_WORKSHEETS = ["Anti-LGBTQ Bills", "Pro-LGBTQ Bills", "Rollover Anti-LGBTQ Bills", "Rollover Pro-LGBTQ Bills"]
+
+_lock = threading.RLock()
+_client = None
+_spreadsheets = {}
+_worksheets = {}
+_titles = {}
+
+
+def get_client():
+    """
+    Return the authorized gspread client, created once per process.
+    The token is refreshed up front only when it has expired; otherwise the cached one is reused.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            _client = gspread.service_account_from_dict(load_service_account_credentials())
+            logger.debug("Authorized Google Sheets client")
+        credentials = _client.http_client.auth
+        if credentials.token and not credentials.valid:
+            logger.debug("Refreshing expired Google Sheets token")
+            credentials.refresh(Request())
+        return _client
+
+
+def open_spreadsheet(year):
+    """Open a tracker year's spreadsheet once per run."""
+    with _lock:
+        if year not in _spreadsheets:
+            _spreadsheets[year] = get_client().open_by_key(get_sheet_key(year))
+        return _spreadsheets[year]
+
+
+def open_worksheet(year, name):
+    with _lock:
+        key = (year, name)
+        if key not in _worksheets:
+            _worksheets[key] = open_spreadsheet(year).worksheet(name)
+        return _worksheets[key]
+
+
+def worksheet_titles(year):
+    """List a spreadsheet's worksheet titles, caching a handle for each from the same metadata call."""
+    with _lock:
+        if year not in _titles:
+            titles = []
+            for wks in open_spreadsheet(year).worksheets():
+                _worksheets.setdefault((year, wks.title), wks)
+                titles.append(wks.title)
+            _titles[year] = titles
+        return _titles[year]
+
+
+def values_to_frame(values):
+    """
+    Turn a worksheet's cell values into (headers, frame) exactly as row_values(1) and
+    get_all_records() would: rows padded to the widest one and numeric strings numericised.
+    """
+    rows = fill_gaps(values) if values else []
+    if not rows:
+        return [], pd.DataFrame()
+    headers = rows[0]
+    records = to_records(headers, [numericise_all(row) for row in rows[1:]])
+    return headers, pd.DataFrame(records)
+
+
+def read_worksheets(year, names=TRACKER_WORKSHEETS):
+    """
+    Read the header and data of several worksheets in one values.batchGet call.
+    Returns {name: (headers, frame)}; worksheets missing from the spreadsheet are left out.
+    """
+    available = set(worksheet_titles(year))
+    present = [name for name in names if name in available]
+    missing = [name for name in names if name not in available]
+    if missing:
+        logger.warning("Worksheet(s) missing from %s spreadsheet: %s", year, ", ".join(missing))
+    if not present:
+        return {}
+    response = open_spreadsheet(year).values_batch_get([absolute_range_name(name) for name in present])
+    value_ranges = response.get("valueRanges", [])
+    return {name: values_to_frame(value_range.get("values", [])) for name, value_range in zip(present, value_ranges)}
+
+
+def reset_handles():
+    """Forget spreadsheet and worksheet handles so the next run sees renamed or added tabs; keeps the client."""
+    with _lock:
+        _spreadsheets.clear()
+        _worksheets.clear()
+        _titles.clear()
+
+
+def merge_cells(cells):
+    """
+    Merge {(row, col): value} into rectangles: adjacent columns in a row first, then runs
+    of consecutive rows that cover the same columns. Returns [(row, col, [[values]])].
+    """
+    cols_by_row = {}
+    for row, col in cells:
+        cols_by_row.setdefault(row, []).append(col)
+    row_runs = []
+    for row in sorted(cols_by_row):
+        cols = sorted(cols_by_row[row])
+        start = prev = cols[0]
+        for col in cols[1:] + [None]:
+            if col is not None and col == prev + 1:
+                prev = col
+                continue
+            row_runs.append((row, start, prev, [cells[(row, c)] for c in range(start, prev + 1)]))
+            if col is not None:
+                start = prev = col
+    rectangles = []
+    open_by_span = {}
+    for row, start, end, values in row_runs:
+        rect = open_by_span.get((start, end))
+        if rect is not None and rect["last_row"] == row - 1:
+            rect["values"].append(values)
+            rect["last_row"] = row
+            continue
+        rect = {"row": row, "col": start, "last_row": row, "values": [values]}
+        open_by_span[(start, end)] = rect
+        rectangles.append(rect)
+    return [(rect["row"], rect["col"], rect["values"]) for rect in rectangles]
+
+
+class SheetWriter:
+    """
+    Collects cell writes for every worksheet of one year's spreadsheet and sends them as
+    merged ranges in as few values.batchUpdate calls as SHEETS_WRITE_MAX_BYTES allows.
+    """
+
+    def __init__(self, year, max_bytes=None):
+        self.year = year
+        self.max_bytes = max_bytes or SHEETS_WRITE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._cells = {}
+
+    def add(self, worksheet, row, col, value):
+        with self._lock:
+            self._cells.setdefault(worksheet, {})[(row, col)] = value
+
+    def cell_count(self):
+        with self._lock:
+            return sum(len(cells) for cells in self._cells.values())
+
+    def ranges(self):
+        with self._lock:
+            pending = {worksheet: dict(cells) for worksheet, cells in self._cells.items()}
+        data = []
+        for worksheet, cells in pending.items():
+            for row, col, values in merge_cells(cells):
+                end = rowcol_to_a1(row + len(values) - 1, col + len(values[0]) - 1)
+                data.append({"range": absolute_range_name(worksheet, f"{rowcol_to_a1(row, col)}:{end}"), "values": values})
+        return data
+
+    def requests(self):
+        """Split the merged ranges into request bodies that each stay under max_bytes."""
+        bodies = []
+        chunk, size = [], 0
+        for entry in self.ranges():
+            entry_size = len(json.dumps(entry))
+            if chunk and size + entry_size > self.max_bytes:
+                bodies.append(chunk)
+                chunk, size = [], 0
+            chunk.append(entry)
+            size += entry_size
+        if chunk:
+            bodies.append(chunk)
+        return [{"valueInputOption": "USER_ENTERED", "data": data} for data in bodies]
+
+    def flush(self):
+        """Send every pending write; returns the number of batchUpdate calls made."""
+        bodies = self.requests()
+        if not bodies:
+            return 0
+        spreadsheet = open_spreadsheet(self.year)
+        for body in bodies:
+            spreadsheet.values_batch_update(body)
+        logger.info(
+            "Wrote %d cell(s) in %d range(s) to the %s spreadsheet with %d request(s)",
+            self.cell_count(), sum(len(body["data"]) for body in bodies), self.year, len(bodies),
+        )
+        with self._lock:
+            self._cells.clear()
+        return len(bodies)